@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class SdProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sd_projects'
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
+        from .instrumentation import install_permission_timing
+        from .passwords import preload_password_validators
+        install_permission_timing()
+        preload_password_validators()
@@ -0,0 +1,222 @@
+import asyncio
+from typing import Any, Callable
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models.query import get_prefetcher
+from django.http import Http404
+from rest_framework import exceptions, generics, response
+from .membership import aget_membership
+from .responses import response_cache
+from .routers import recent_writes, start_replica_reads
+from .serializers import get_prefetches
+from .versions import aget_project_version
+from .views import (
+    ConditionalGetMixin,
+    ReplicaReadMixin,
+    ValuesReadMixin,
+    ProjectsAPIView,
+    ProjectIndexedAPIView,
+    ProjectIssueAPIView,
+    ProjectIssueIndexedAPIView,
+    ProjectCommentsAPIView,
+    ProjectCommentsIndexedAPIView,
+)
+
+
+def is_prefetched(instance: Any, prefetch: Prefetch) -> bool:
+    try:
+        return get_prefetcher(instance, prefetch.prefetch_through, prefetch.prefetch_to)[3](instance)
+    except AttributeError:
+        # No prefetch cache yet
+        return False
+
+
+class AsyncReadAPIView(ReplicaReadMixin, ConditionalGetMixin, ValuesReadMixin, generics.GenericAPIView):
+    """
+    Async list and retrieve, mixed in front of a synchronous view of which it reuses the queryset, serializer,
+    permissions, filters and pagination.
+
+    The user, the membership checked by the permissions, the project version and the rows are read with the
+    async ORM, the synchronous permissions, serializers and renderers then only work on loaded objects.
+    Under ASGI the request thus holds no thread while waiting for the database or for the client.
+    """
+
+    http_method_names = ["get", "head", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            method = (request.method or "").lower()
+            handler = getattr(self, method, self.http_method_not_allowed) \
+                if method in self.http_method_names else self.http_method_not_allowed
+            result = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = await result
+        except Exception as exc:
+            result = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, result, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs) -> None:
+        """
+        Async `initial`, the membership of the project in the URL is loaded before checking the permissions.
+        """
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        await self.aperform_authentication(request)
+        if "project_id" in kwargs:
+            await aget_membership(request, kwargs["project_id"])
+        self.check_permissions(request)
+        self.check_throttles(request)
+        if self.reads_replicas(request) and not await recent_writes.ais_recent(request.user.pk):
+            self.replica_reads_token = start_replica_reads()
+
+    async def aperform_authentication(self, request) -> None:
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, "aauthenticate"):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def aget_version_key(self) -> Any:
+        row = await aget_project_version(self.kwargs["project_id"])
+        if row is None:
+            return None
+        version, updated_time = row
+        return str(version), updated_time
+
+    async def aconditional(self, handler: Callable, request, *args, **kwargs):
+        version_key = await self.aget_version_key()
+        validators = self.make_validators(version_key)
+        result = self.get_not_modified_response(request, validators)
+        if result is None:
+            self.response_cache_key = self.get_response_cache_key(version_key)
+            if self.response_cache_key is not None:
+                result = self.make_cached_response(await response_cache.aget(self.response_cache_key))
+        if result is None:
+            result = await handler(request, *args, **kwargs)
+        return self.add_validators(result, validators)
+
+    async def get(self, request, *args, **kwargs):
+        lookup_arg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_arg in kwargs:
+            return await self.aconditional(self.aretrieve, request, *args, **kwargs)
+        return await self.aconditional(self.alist, request, *args, **kwargs)
+
+    async def aprefetch(self, serializer, instances: list[Any]) -> None:
+        """
+        Run the prefetches of the serializer fields which are not loaded yet, e.g. by select_related.
+        """
+        if not instances:
+            return
+        prefetches = [prefetch for prefetch in get_prefetches(serializer) if not is_prefetched(instances[0], prefetch)]
+        if prefetches:
+            await sync_to_async(prefetch_related_objects)(instances, *prefetches)
+
+    async def alist(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is not None:
+            queryset = self.get_values_queryset(plan, many=True)
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, "apaginate_queryset"):
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+        else:
+            paginator = None
+            page = [obj async for obj in queryset.aiterator()]
+        if plan is not None:
+            data = plan.render_many(page)
+        else:
+            serializer = self.get_serializer(page, many=True)
+            await self.aprefetch(serializer, page)
+            data = serializer.data
+        if paginator is None:
+            return response.Response(data)
+        return paginator.get_paginated_response(data)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def aretrieve(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is not None:
+            queryset = self.get_values_queryset(plan, many=False)
+            try:
+                row = await queryset.aget(**self.get_values_lookup())
+            except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+                raise Http404
+            self.check_object_permissions(request, row)
+            return response.Response(plan.render(row))
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        await self.aprefetch(serializer, [instance])
+        return response.Response(serializer.data)
+
+
+class AsyncProjectsAPIView(AsyncReadAPIView, ProjectsAPIView):  # type: ignore
+
+    async def aget_version_key(self):
+        return self.make_version_key([row async for row in self.get_version_rows()])
+
+
+class AsyncProjectIndexedAPIView(AsyncReadAPIView, ProjectIndexedAPIView):  # type: ignore
+    pass
+
+
+class AsyncProjectIssueAPIView(AsyncReadAPIView, ProjectIssueAPIView):  # type: ignore
+    pass
+
+
+class AsyncProjectIssueIndexedAPIView(AsyncReadAPIView, ProjectIssueIndexedAPIView):  # type: ignore
+    pass
+
+
+class AsyncProjectCommentsAPIView(AsyncReadAPIView, ProjectCommentsAPIView):  # type: ignore
+    pass
+
+
+class AsyncProjectCommentsIndexedAPIView(AsyncReadAPIView, ProjectCommentsIndexedAPIView):  # type: ignore
+    pass
+
+
+def read_async(sync_view: Callable, async_view: Callable) -> Callable:
+    """
+    Route GET and HEAD to the async view and the other methods to the synchronous one, which Django runs in a
+    thread as it would do for any synchronous view under ASGI.
+    """
+    async def view(request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await async_view(request, *args, **kwargs)
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    # What DRF sets on its views, for the CSRF middleware and the schema generation
+    view.csrf_exempt = True  # type: ignore[attr-defined]
+    view.cls = sync_view.cls  # type: ignore[attr-defined]
+    view.initkwargs = sync_view.initkwargs  # type: ignore[attr-defined]
+    return view
@@ -0,0 +1,173 @@
+from typing import Any
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from .caching import TieredCache
+from .models import UserTokenVersion
+
+# Fields of the user copied into the tokens, in the order of User.from_db
+CLAIM_FIELDS = ("username", "first_name", "last_name", "is_active")
+TOKEN_VERSION_CLAIM = "token_version"
+
+# (is_active, token version) of a user, None when the user does not exist
+TokenUserEntry = tuple[bool, int] | None
+
+
+class TokenUserCache(TieredCache):
+    """
+    Cross-request cache of the active flag and of the token version of the users, keyed by user id,
+    configured by `SOFTDESK_TOKEN_USER_CACHE`.
+    This is the only state a token is checked against, the rest of the user is read from the claims.
+    Saving or deleting a user and revoking its tokens invalidate the entries.
+    """
+
+    SETTING = "SOFTDESK_TOKEN_USER_CACHE"
+    KEY_PREFIX = "sd_token_user"
+    DEFAULT_TTL = 60
+
+    def load(self, key: tuple[int]) -> TokenUserEntry:
+        row = User.objects.filter(pk=key[0]).values_list("is_active", "token_version__version").first()
+        return None if row is None else (row[0], row[1] or 0)
+
+    def get(self, user_id: int) -> TokenUserEntry:
+        return self.lookup((user_id,))
+
+    def invalidate(self, user_id: int) -> None:
+        self.invalidate_keys([(user_id,)])
+
+
+token_user_cache = TokenUserCache()
+
+
+@receiver(setting_changed)
+def _reconfigure_token_user_cache(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_TOKEN_USER_CACHE":
+        token_user_cache.configure()
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """
+    Reject every token issued to the user so far, the next login or refresh issues tokens of the new version.
+    """
+    versions = UserTokenVersion.objects.filter(user_id=user_id)
+    changes = {"version": F("version") + 1, "revoked_time": timezone.now()}
+    if not versions.update(**changes):
+        UserTokenVersion.objects.bulk_create([UserTokenVersion(user_id=user_id)], ignore_conflicts=True)
+        versions.update(**changes)
+    token_user_cache.invalidate(user_id)
+
+
+def set_user_claims(token: Token, user: User, version: int) -> None:
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[TOKEN_VERSION_CLAIM] = version
+
+
+def check_token_user(entry: TokenUserEntry, token: Token) -> None:
+    if entry is None:
+        raise exceptions.AuthenticationFailed(_("User not found"), code="user_not_found")
+    is_active, version = entry
+    if not is_active:
+        raise exceptions.AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if token.get(TOKEN_VERSION_CLAIM, 0) < version:
+        raise InvalidToken(_("Token has been revoked"))
+
+
+def get_claims_user(token: Token) -> User | None:
+    """
+    Build the user of a token from its claims, None if the token predates the claims.
+    The instance is built as if loaded from the database with only the claimed fields, reading any other field
+    loads it on access. A new instance is built for every request, as views may alter the user.
+    """
+    if any(field not in token for field in CLAIM_FIELDS):
+        return None
+    field_names = ("id", *CLAIM_FIELDS)
+    values = (token[api_settings.USER_ID_CLAIM], *(token[field] for field in CLAIM_FIELDS))
+    return User.from_db(User.objects.db, field_names, values)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication building the user from the claims of the token instead of loading it.
+
+    The database is only read on a miss of the token user cache, to check that the user is still active
+    and that its tokens have not been revoked. Tokens issued without the claims fall back to loading the user.
+    """
+
+    def get_user_id(self, validated_token: Token) -> int:
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def get_user(self, validated_token: Token) -> User:
+        user_id = self.get_user_id(validated_token)
+        user = get_claims_user(validated_token)
+        if user is None:
+            return super().get_user(validated_token)
+        check_token_user(token_user_cache.get(user_id), validated_token)
+        return user
+
+    async def aauthenticate(self, request) -> tuple[User, Token] | None:
+        """
+        Async `authenticate`, only a miss of the token user cache leaves the event loop.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        user_id = self.get_user_id(validated_token)
+        user = get_claims_user(validated_token)
+        if user is None:
+            return await sync_to_async(super().get_user)(validated_token), validated_token
+        check_token_user(await token_user_cache.alookup((user_id,)), validated_token)
+        return user, validated_token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+
+    @classmethod
+    def get_token(cls, user: User) -> Token:
+        token = super().get_token(user)
+        version = UserTokenVersion.objects.filter(user_id=user.pk).values_list("version", flat=True).first()
+        set_user_claims(token, user, version or 0)
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh the tokens with up to date claims, once the revocation and the active flag are checked
+    against the database.
+    """
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects \
+            .select_related("token_version") \
+            .only("id", *CLAIM_FIELDS, "token_version__version") \
+            .filter(pk=refresh.get(api_settings.USER_ID_CLAIM)) \
+            .first()
+        version = getattr(getattr(user, "token_version", None), "version", 0)
+        check_token_user(None if user is None else (user.is_active, version), refresh)
+        set_user_claims(refresh, user, version)  # type: ignore
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
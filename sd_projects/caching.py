@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from .routers import primary_reads
+
+_MISSING = object()
+
+
+class TieredCache:
+    """
+    Cross-request cache of small database facts, configured by the `SETTING` dictionary of the settings.
+
+    A process-level LRU is consulted first, then the optional shared Django cache backend named by
+    `BACKEND`, and the primary database last through `load`. Both tiers expire their entries after `TTL` seconds,
+    this bounds how long the LRU of another process may serve an entry invalidated here.
+    None is a valid value, so that negative lookups are cached as well.
+    """
+
+    SETTING = ""
+    KEY_PREFIX = ""
+    DEFAULT_MAX_SIZE = 10000
+    DEFAULT_TTL = 300
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.configure()
+
+    def configure(self) -> None:
+        config = getattr(settings, self.SETTING, {})
+        with self._lock:
+            self.max_size: int = config.get("MAX_SIZE", self.DEFAULT_MAX_SIZE)
+            self.ttl: float = config.get("TTL", self.DEFAULT_TTL)
+            self.backend_alias: str | None = config.get("BACKEND")
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.shared_hits = 0
+
+    @property
+    def backend(self):
+        return caches[self.backend_alias] if self.backend_alias else None
+
+    def make_key(self, key: tuple[Any, ...]) -> str:
+        return ":".join((self.KEY_PREFIX, *map(str, key)))
+
+    def load(self, key: tuple[Any, ...]) -> Any:
+        raise NotImplementedError
+
+    def _get_local(self, key: tuple[Any, ...], now: float) -> Any:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+        return _MISSING
+
+    def lookup(self, key: tuple[Any, ...]) -> Any:
+        now = time.monotonic()
+        entry = self._get_local(key, now)
+        if entry is not _MISSING:
+            return entry
+        backend = self.backend
+        if backend is not None:
+            entry = backend.get(self.make_key(key), _MISSING)
+        if entry is _MISSING:
+            # A replica lagging behind could cache an entry invalidated meanwhile
+            with primary_reads():
+                entry = self.load(key)
+            if backend is not None:
+                backend.set(self.make_key(key), entry, self.ttl)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.shared_hits += 1
+        self._store(key, entry, now)
+        return entry
+
+    def get(self, key: tuple[Any, ...], default: Any = None) -> Any:
+        """
+        Return the entry of a key from either tier, or `default` without loading it.
+        """
+        now = time.monotonic()
+        entry = self._get_local(key, now)
+        if entry is not _MISSING:
+            return entry
+        backend = self.backend
+        if backend is not None:
+            entry = backend.get(self.make_key(key), _MISSING)
+        if entry is _MISSING:
+            with self._lock:
+                self.misses += 1
+            return default
+        with self._lock:
+            self.shared_hits += 1
+        self._store(key, entry, now)
+        return entry
+
+    async def aget(self, key: tuple[Any, ...], default: Any = None) -> Any:
+        """
+        Async `get`, a hit of the process LRU is answered without leaving the event loop.
+        """
+        entry = self._get_local(key, time.monotonic())
+        if entry is not _MISSING:
+            return entry
+        return await sync_to_async(self.get)(key, default)
+
+    def set(self, key: tuple[Any, ...], entry: Any) -> None:
+        backend = self.backend
+        if backend is not None:
+            backend.set(self.make_key(key), entry, self.ttl)
+        self._store(key, entry, time.monotonic())
+
+    async def alookup(self, key: tuple[Any, ...]) -> Any:
+        """
+        Async `lookup`, a hit of the process LRU is answered without leaving the event loop.
+        """
+        entry = self._get_local(key, time.monotonic())
+        if entry is not _MISSING:
+            return entry
+        return await sync_to_async(self.lookup)(key)
+
+    def _store(self, key: tuple[Any, ...], entry: Any, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self.ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_keys(self, keys: list[tuple[Any, ...]], local_keys: list[Hashable] | None = None) -> None:
+        """
+        Drop the given keys from both tiers, `local_keys` are dropped from the process LRU only.
+        """
+        with self._lock:
+            for key in (*keys, *(local_keys or ())):
+                self._entries.pop(key, None)
+        backend = self.backend
+        if backend is not None and keys:
+            backend.delete_many([self.make_key(key) for key in keys])
+
+    def local_keys(self) -> list[Hashable]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,103 @@
+from typing import Any
+from django.db import models
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import filters, request as drf_request, serializers
+from .models import Issue
+
+
+class IssueFilterBackend(filters.BaseFilterBackend):
+    """
+    Filter the issues on query parameters, every filter is translated to SQL.
+
+    - `status`, `tag`, `priority`: one or many comma separated values
+    - `assigned`, `author`: one or many comma separated user ids, `assigned=null` for the unassigned issues
+    - `created_after`, `created_before`: ISO 8601 date or date time bounds of `created_time`
+    """
+
+    choice_params = {
+        "status": Issue.IssueStatus,
+        "tag": Issue.IssueTag,
+        "priority": Issue.IssuePriority,
+    }
+    user_params = ("assigned", "author")
+    range_params = {
+        "created_after": "created_time__gte",
+        "created_before": "created_time__lt",
+    }
+
+    def filter_queryset(self, request: drf_request.Request, queryset: models.QuerySet, view) -> models.QuerySet:
+        conditions: dict[str, Any] = {}
+        for param, choices in self.choice_params.items():
+            values = self.get_integers(request, param)
+            if values is not None:
+                invalid = [value for value in values if value not in choices.values]
+                if invalid:
+                    raise serializers.ValidationError({param: f"Invalid choices {invalid}"})
+                conditions[f"{param}__in"] = values
+        for param in self.user_params:
+            if request.query_params.get(param) == "null":
+                conditions[f"{param}__isnull"] = True
+                continue
+            values = self.get_integers(request, param)
+            if values is not None:
+                conditions[f"{param}_id__in"] = values
+        for param, lookup in self.range_params.items():
+            value = request.query_params.get(param)
+            if value:
+                conditions[lookup] = self.parse_time(param, value)
+        return queryset.filter(**conditions) if conditions else queryset
+
+    def get_integers(self, request: drf_request.Request, param: str) -> list[int] | None:
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return [int(item) for item in value.split(",")]
+        except ValueError:
+            raise serializers.ValidationError({param: "Expected one or many comma separated integers"})
+
+    def parse_time(self, param: str, value: str):
+        try:
+            parsed = parse_datetime(value) or parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise serializers.ValidationError({param: "Expected an ISO 8601 date or date time"})
+        return parsed
+
+    def get_schema_operation_parameters(self, view) -> list[dict[str, Any]]:
+        parameters = [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "description": f"Comma separated {param} values to keep",
+                "schema": {"type": "string"},
+            }
+            for param in (*self.choice_params, *self.user_params)
+        ]
+        parameters += [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "description": f"Keep the issues with {lookup.replace('__', ' ')} this date time",
+                "schema": {"type": "string", "format": "date-time"},
+            }
+            for param, lookup in self.range_params.items()
+        ]
+        return parameters
+
+
+class StrictOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter answering 400 to an ordering on a field outside of the `ordering_fields` of the view, instead
+    of silently falling back to the default ordering.
+    """
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        invalid = [term for term in fields if term not in valid]
+        if invalid:
+            raise serializers.ValidationError({self.ordering_param: f"Invalid fields {invalid}"})
+        return valid
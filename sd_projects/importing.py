@@ -0,0 +1,384 @@
+import csv
+import json
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Iterator, NamedTuple
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+from .membership import membership_cache
+from .models import Comment, Contributor, ImportCheckpoint, ImportedIssue, Issue, Project, User
+from .versions import bump_project_version
+from . import statistics
+
+
+class ImportRecord(NamedTuple):
+    type: str
+    data: dict[str, Any]
+    # Id in the input of the issue of a comment
+    issue: Any
+    # Number of the last input line of the record, and offset in bytes of its end
+    line: int
+    position: int
+
+
+class InvalidRecord(Exception):
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+    @classmethod
+    def from_error(cls, record: "ImportRecord", error: ValidationError) -> "InvalidRecord":
+        messages = error.message_dict if hasattr(error, "error_dict") else {"__all__": error.messages}
+        return cls(record.line, "; ".join(
+            " ".join(errors) if field == "__all__" else f"{field}: {' '.join(errors)}"
+            for field, errors in messages.items()
+        ))
+
+
+def read_lines(stream: BinaryIO, position: int) -> Iterator[tuple[bytes, int]]:
+    stream.seek(position)
+    for line in iter(stream.readline, b""):
+        position += len(line)
+        yield line, position
+
+
+def read_ndjson(stream: BinaryIO, position: int = 0, line: int = 0) -> Iterator[ImportRecord]:
+    """
+    Read the records of newline delimited JSON, one `{"type": ..., "data": {...}}` object per line as written by
+    the project export, or the fields of the record next to its type.
+    """
+    for raw, position in read_lines(stream, position):
+        line += 1
+        if not raw.strip():
+            continue
+        try:
+            value = json.loads(raw)
+            data = value.get("data", value)
+            yield ImportRecord(value["type"], data, value.get("issue", data.get("issue")), line, position)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            raise InvalidRecord(line, f"Not a JSON record ({error})")
+
+
+def read_csv(stream: BinaryIO, position: int = 0, line: int = 0) -> Iterator[ImportRecord]:
+    """
+    Read the records of CSV with a header, a `record` column of the record types, an `issue` column for the
+    comments, and a column per field. Empty cells are missing values.
+    """
+    header = stream.readline()
+    names = next(csv.reader([header.decode("utf-8-sig")]), [])
+    if "record" not in names:
+        raise InvalidRecord(1, "The CSV header has no record column")
+    if position == 0:
+        position, line = len(header), 1
+    end = position
+
+    def lines() -> Iterator[str]:
+        # csv reads as many lines as a row needs, quoted values may span several of them
+        nonlocal line, end
+        for raw, end in read_lines(stream, position):
+            line += 1
+            yield raw.decode()
+
+    for row in csv.reader(lines()):
+        if not row:
+            continue
+        if len(row) != len(names):
+            raise InvalidRecord(line, f"Expected {len(names)} values, got {len(row)}")
+        data = {name: value for name, value in zip(names, row) if value != ""}
+        yield ImportRecord(data.pop("record", ""), data, data.pop("issue", None), line, end)
+
+
+@contextmanager
+def keep_timestamps() -> Iterator[None]:
+    """
+    Insert the imported created_time and updated_time, which auto_now and auto_now_add would overwrite.
+    The fields are shared by the whole process, this is only meant for the import_project command.
+    """
+    fields = [
+        field
+        for model in (Issue, Comment)
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]  # type: ignore[attr-defined]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False  # type: ignore[attr-defined]
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add  # type: ignore[attr-defined]
+
+
+class UserMap:
+    """
+    Resolve the users referenced by the input: a username, an id or an object with an id as written by the
+    project export. A reference is first looked up in `mapping`, of the references to local usernames, then
+    a username is looked up as is, and the default user is used last.
+    """
+
+    def __init__(self, mapping: dict[str, str] | None = None, default_user_id: int | None = None) -> None:
+        self.mapping = mapping or {}
+        self.default_user_id = default_user_id
+        self.resolved: dict[str, int] = {}
+
+    def resolve(self, value: Any) -> int | None:
+        """
+        Return the id of the local user, None when there is no reference.
+        """
+        if isinstance(value, dict):
+            value = value.get("username", value.get("id"))
+        if value is None or value == "":
+            return None
+        reference = str(value)
+        if reference not in self.resolved:
+            username = self.mapping.get(reference, reference if isinstance(value, str) else None)
+            user_id = User.objects.filter(username=username).values_list("id", flat=True).first() \
+                if username is not None else None
+            if user_id is None:
+                user_id = self.default_user_id
+            if user_id is None:
+                raise ValidationError(f"Unknown user {reference}")
+            self.resolved[reference] = user_id
+        return self.resolved[reference]
+
+
+def validate(instance: models.Model, exclude: tuple[str, ...]) -> None:
+    """
+    Check the fields of an instance against the model, the foreign keys are resolved by the importer instead.
+    """
+    instance.clean_fields(exclude=exclude)
+    for field in ("created_time", "updated_time"):
+        if not hasattr(instance, field):
+            continue
+        value = getattr(instance, field)
+        if value is None:
+            setattr(instance, field, timezone.now())
+        elif settings.USE_TZ and timezone.is_naive(value):
+            setattr(instance, field, timezone.make_aware(value))
+        elif not settings.USE_TZ and timezone.is_aware(value):
+            setattr(instance, field, timezone.make_naive(value))
+
+
+class ProjectImporter:
+    """
+    Insert the records of an input into the project of a checkpoint, by chunks each written in a transaction
+    which also saves the checkpoint.
+    The rows are inserted with bulk_create, which sends no signal: the project version, the statistics and the
+    membership cache are updated here, once per chunk.
+    """
+
+    def __init__(self, checkpoint: ImportCheckpoint, users: UserMap, batch_size: int = 1000,
+                 add_contributors: bool = False, on_invalid: Callable[[InvalidRecord], None] | None = None) -> None:
+        self.checkpoint = checkpoint
+        self.users = users
+        self.batch_size = batch_size
+        self.add_contributors = add_contributors
+        # Invalid records are rejected through on_invalid when given, the import stops on the first one otherwise
+        self.on_invalid = on_invalid
+        self.rejected = 0
+        self.contributors: set[int] = set()
+        # Contributors of the chunk being imported
+        self.new_contributors: set[int] = set()
+        if checkpoint.project_id is not None:
+            self.load_contributors()
+
+    def load_contributors(self) -> None:
+        self.contributors = set(
+            Contributor.objects.filter(project_id=self.checkpoint.project_id).values_list("user_id", flat=True)
+        )
+
+    def reject(self, record: ImportRecord, error: ValidationError) -> None:
+        invalid = InvalidRecord.from_error(record, error)
+        if self.on_invalid is None:
+            raise invalid
+        self.rejected += 1
+        self.on_invalid(invalid)
+
+    def save_checkpoint(self, record: ImportRecord, row_count: int) -> None:
+        self.checkpoint.position = record.position
+        self.checkpoint.line = record.line
+        self.checkpoint.row_count += row_count
+        self.checkpoint.save()
+
+    def create_project(self, record: ImportRecord, title: str | None = None) -> Project:
+        """
+        Create the project of the first record of the input, owned by its author as done by the API.
+        """
+        if record.type != "project":
+            raise InvalidRecord(record.line, "The first record must be a project, unless importing into an existing one")
+        data = record.data
+        try:
+            project = Project(
+                title=title or data.get("title"),
+                description=data.get("description") or "",
+                type=data.get("type"),
+                author_id=self.users.resolve(data.get("author")),
+            )
+            project.full_clean(exclude=("author",))
+            if project.author_id is None:
+                raise ValidationError({"author": ["This field cannot be null."]})
+        except ValidationError as error:
+            raise InvalidRecord.from_error(record, error)
+        with transaction.atomic():
+            project.save()
+            Contributor.objects.create(
+                permission=Contributor.ContributorPermission.DELETE,
+                role=Contributor.ContributorRole.OWNER,
+                user_id=project.author_id,
+                project=project,
+            )
+            self.checkpoint.project = project
+            self.save_checkpoint(record, 2)
+        self.load_contributors()
+        return project
+
+    def get_member(self, record: ImportRecord, field: str, nullable: bool = False) -> int | None:
+        user_id = self.users.resolve(record.data.get(field))
+        if user_id is None:
+            if nullable:
+                return None
+            raise ValidationError({field: ["This field cannot be null."]})
+        if user_id not in self.contributors and user_id not in self.new_contributors and not self.add_contributors:
+            raise ValidationError({field: [f"User {user_id} is not a contributor of the project"]})
+        return user_id
+
+    def build_contributor(self, record: ImportRecord) -> Contributor:
+        data = record.data
+        user_id = self.users.resolve(data.get("user"))
+        if user_id is None:
+            raise ValidationError({"user": ["This field cannot be null."]})
+        if user_id in self.contributors or user_id in self.new_contributors:
+            raise ValidationError({"user": [f"User {user_id} is already a contributor of the project"]})
+        contributor = Contributor(
+            permission=data.get("permission"),
+            role=data.get("role", Contributor.ContributorRole.CONTRIBUTOR),
+            user_id=user_id,
+            project_id=self.checkpoint.project_id,
+        )
+        validate(contributor, ("user", "project"))
+        return contributor
+
+    def build_issue(self, record: ImportRecord) -> Issue:
+        data = record.data
+        issue = Issue(
+            title=data.get("title"),
+            description=data.get("description"),
+            status=data.get("status"),
+            tag=data.get("tag"),
+            priority=data.get("priority"),
+            created_time=data.get("created_time"),
+            updated_time=data.get("updated_time"),
+            project_id=self.checkpoint.project_id,
+            author_id=self.get_member(record, "author"),
+            assigned_id=self.get_member(record, "assigned", nullable=True),
+        )
+        validate(issue, ("project", "author", "assigned"))
+        return issue
+
+    def build_comment(self, record: ImportRecord) -> Comment:
+        if record.issue is None or record.issue == "":
+            raise ValidationError({"issue": ["This field cannot be null."]})
+        comment = Comment(
+            description=record.data.get("description"),
+            created_time=record.data.get("created_time"),
+            updated_time=record.data.get("updated_time"),
+            author_id=self.get_member(record, "author"),
+        )
+        validate(comment, ("author", "issue"))
+        return comment
+
+    def import_chunk(self, records: list[ImportRecord]) -> int:
+        """
+        Insert a chunk of records, then save the checkpoint after its last record. Return the number of rows.
+        """
+        contributors: list[Contributor] = []
+        issues: list[tuple[ImportRecord, Issue]] = []
+        comments: list[tuple[ImportRecord, Comment]] = []
+        self.new_contributors = set()
+        for record in records:
+            try:
+                if record.type == "contributor":
+                    contributor = self.build_contributor(record)
+                    self.new_contributors.add(contributor.user_id)
+                    contributors.append(contributor)
+                elif record.type == "issue":
+                    issues.append((record, self.build_issue(record)))
+                elif record.type == "comment":
+                    comments.append((record, self.build_comment(record)))
+                elif record.type != "project":
+                    # The project record is ignored when importing into an existing project
+                    raise ValidationError(f"Unknown record type {record.type!r}")
+            except ValidationError as error:
+                self.reject(record, error)
+
+        if self.add_contributors:
+            referenced = {user_id for _, row in (*issues, *comments) for user_id in (row.author_id, getattr(row, "assigned_id", None))}
+            contributors.extend(
+                Contributor(
+                    permission=Contributor.ContributorPermission.READ,
+                    role=Contributor.ContributorRole.CONTRIBUTOR,
+                    user_id=user_id,
+                    project_id=self.checkpoint.project_id,
+                )
+                for user_id in referenced - self.contributors - self.new_contributors - {None}
+            )
+
+        project_id: int = self.checkpoint.project_id  # type: ignore[assignment]
+        with transaction.atomic(), keep_timestamps():
+            Contributor.objects.bulk_create(contributors, batch_size=self.batch_size)
+            created_issues = Issue.objects.bulk_create([issue for _, issue in issues], batch_size=self.batch_size)
+            ImportedIssue.objects.bulk_create(
+                [
+                    ImportedIssue(checkpoint=self.checkpoint, source_id=str(record.data["id"]), issue_id=issue.pk)
+                    for record, issue in issues
+                    if record.data.get("id") not in (None, "")
+                ],
+                batch_size=self.batch_size,
+            )
+            statistics.record_created_issues(project_id, created_issues)
+            created_comments = self.insert_comments(comments)
+            bump_project_version(project_id)
+            row_count = len(contributors) + len(created_issues) + len(created_comments)
+            self.save_checkpoint(records[-1], row_count)
+        user_ids = [contributor.user_id for contributor in contributors]
+        if user_ids:
+            membership_cache.invalidate_project(project_id, user_ids)
+            self.contributors.update(user_ids)
+        return row_count
+
+    def insert_comments(self, comments: list[tuple[ImportRecord, Comment]]) -> list[Comment]:
+        """
+        Attach the comments to the imported issues, found in one query with their statistics bucket.
+        """
+        if not comments:
+            return []
+        sources = {str(record.issue) for record, _ in comments}
+        parents = {
+            source_id: (issue_id, bucket)
+            for source_id, issue_id, *bucket in ImportedIssue.objects
+            .filter(checkpoint=self.checkpoint, source_id__in=sources)
+            .values_list("source_id", "issue_id", "issue__status", "issue__tag", "issue__priority")
+        }
+        valid: list[Comment] = []
+        deltas: Counter[statistics.Bucket] = Counter()
+        for record, comment in comments:
+            parent = parents.get(str(record.issue))
+            if parent is None:
+                self.reject(record, ValidationError({"issue": [f"Unknown issue {record.issue}"]}))
+                continue
+            comment.issue_id, bucket = parent[0], tuple(parent[1])
+            deltas[bucket] += 1  # type: ignore[index]
+            valid.append(comment)
+        created = Comment.objects.bulk_create(valid, batch_size=self.batch_size)
+        statistics.apply_deltas(self.checkpoint.project_id, {bucket: (0, count) for bucket, count in deltas.items()})  # type: ignore[arg-type]
+        return created
+
+    def finish(self) -> None:
+        with transaction.atomic():
+            ImportedIssue.objects.filter(checkpoint=self.checkpoint).delete()
+            self.checkpoint.finished_time = timezone.now()
+            self.checkpoint.save()
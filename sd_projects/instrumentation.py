@@ -0,0 +1,258 @@
+import bisect
+import functools
+import random
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Measures of the current request when it is sampled
+_current: ContextVar["RequestMetrics | None"] = ContextVar("sd_request_metrics", default=None)
+
+PHASES = ("db", "serializer", "permissions")
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Values of the method label, any other method is recorded as "other" so that clients cannot add label values
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"))
+
+
+class RequestMetrics:
+    """
+    Number of SQL queries of a sampled request and time spent in each of the PHASES, the queries run while
+    serializing counting in both the `db` and the `serializer` phases.
+    """
+
+    __slots__ = ("queries", "durations", "active")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.active: set[str] = set()
+
+    def get_server_timing(self, total: float) -> str:
+        return ", ".join([
+            f'db;dur={self.durations["db"] * 1000:.2f};desc="{self.queries} queries"',
+            f'serializer;dur={self.durations["serializer"] * 1000:.2f}',
+            f'permissions;dur={self.durations["permissions"] * 1000:.2f}',
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+
+class measure:
+    """
+    Add the time spent in the block to a phase of the current request when it is sampled, a block nested in
+    another of the same phase is counted once.
+    """
+
+    __slots__ = ("phase", "metrics", "start")
+
+    def __init__(self, phase: str) -> None:
+        self.phase = phase
+
+    def __enter__(self) -> None:
+        metrics = _current.get()
+        if metrics is not None and self.phase in metrics.active:
+            metrics = None
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.active.add(self.phase)
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.durations[self.phase] += time.perf_counter() - self.start
+            metrics.active.discard(self.phase)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper of every database connection, counting the queries of the sampled requests.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.durations["db"] += time.perf_counter() - start
+
+
+def install_query_recorder(connection) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def _install_query_recorder(*, connection, **kwargs) -> None:
+    install_query_recorder(connection)
+
+
+def measured(phase: str, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with measure(phase):
+            return method(*args, **kwargs)
+    wrapper.measured_phase = phase  # type: ignore[attr-defined]
+    return wrapper
+
+
+def install_permission_timing() -> None:
+    """
+    Count the permission checks of every API view as permission time of the sampled requests, including the
+    third-party views. Installed once the application is ready, so that no view can leave them out.
+    """
+    from rest_framework.views import APIView
+    for name in ("check_permissions", "check_object_permissions"):
+        method = getattr(APIView, name)
+        if getattr(method, "measured_phase", None) is None:
+            setattr(APIView, name, measured("permissions", method))
+
+
+class Histogram:
+    """
+    Prometheus histogram of observations by label values, the buckets being upper bounds.
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        # Label values -> (count of each bucket then of +Inf, sum)
+        self.values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def export(self, label_names: tuple[str, ...]) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.values.items()):
+            selector = format_labels(label_names, labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{selector},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{selector}}} {total[0]}")
+            lines.append(f"{self.name}_count{{{selector}}} {cumulative}")
+        return lines
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return ",".join(
+        f'{name}="{escape_label(value)}"' for name, value in zip(names, values)
+    )
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetricsRegistry:
+    """
+    Request metrics of this process, configured by `SOFTDESK_METRICS`: the number of requests and their latency
+    by endpoint, and for a `SAMPLE_RATE` share of them the number of SQL queries and the time spent in the
+    database, the serializers and the permissions. The sampled requests are sent back their measures in a
+    `Server-Timing` header when `SERVER_TIMING` is True.
+    """
+
+    SETTING = "SOFTDESK_METRICS"
+    LABELS = ("endpoint", "method")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.configure()
+
+    def configure(self) -> None:
+        config = getattr(settings, self.SETTING, {})
+        with self._lock:
+            self.sample_rate: float = config.get("SAMPLE_RATE", 1.0)
+            self.server_timing: bool = config.get("SERVER_TIMING", False)
+            self.requests: dict[tuple[str, ...], int] = {}
+            self.latency = Histogram(
+                "softdesk_request_duration_seconds", "Latency of the requests.", DURATION_BUCKETS,
+            )
+            self.queries = Histogram(
+                "softdesk_request_db_queries", "SQL queries of the sampled requests.", QUERY_BUCKETS,
+            )
+            self.phases = {
+                phase: Histogram(
+                    f"softdesk_request_{phase}_duration_seconds",
+                    f"Time spent in the {phase} phase of the sampled requests.",
+                    DURATION_BUCKETS,
+                )
+                for phase in PHASES
+            }
+
+    def start(self) -> tuple[RequestMetrics | None, Token | None]:
+        """
+        Sample the request or not, and start measuring it when it is.
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return None, None
+        # Connections opened before this module was loaded, the new ones are set up by `connection_created`
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        metrics = RequestMetrics()
+        return metrics, _current.set(metrics)
+
+    def stop(self, token: Token | None) -> None:
+        if token is not None:
+            _current.reset(token)
+
+    def record(self, endpoint: str, method: str, status_code: int, total: float, metrics: RequestMetrics | None) -> None:
+        if method not in METHODS:
+            method = "other"
+        labels = (endpoint, method)
+        with self._lock:
+            key = (endpoint, method, str(status_code))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.observe(labels, total)
+            if metrics is not None:
+                self.queries.observe(labels, metrics.queries)
+                for phase, duration in metrics.durations.items():
+                    self.phases[phase].observe(labels, duration)
+
+    def export(self) -> str:
+        """
+        Return the metrics in the Prometheus text format.
+        """
+        with self._lock:
+            lines = ["# HELP softdesk_requests_total Requests served.", "# TYPE softdesk_requests_total counter"]
+            for labels, count in sorted(self.requests.items()):
+                lines.append(f"softdesk_requests_total{{{format_labels((*self.LABELS, 'status'), labels)}}} {count}")
+            for histogram in (self.latency, self.queries, *self.phases.values()):
+                lines += histogram.export(self.LABELS)
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetricsRegistry()
+
+
+@receiver(setting_changed)
+def _reconfigure_request_metrics(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_METRICS":
+        request_metrics.configure()
+
+
+def get_endpoint(request) -> str:
+    """
+    Return the name of the view resolved for a request, its class for the API views.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    view_class = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    return view_class.__name__ if view_class is not None else match.view_name
@@ -0,0 +1,198 @@
+import asyncio
+import io
+import statistics
+import threading
+import time
+import types
+from typing import Callable
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandParser
+from django.test.utils import override_settings
+from django.urls import include, path
+from sd_projects.authentication import ClaimsTokenObtainPairSerializer
+from sd_projects.models import Comment, Contributor, Issue, Project, User
+from sd_projects.streaming import ASGIHandler
+from sd_projects.urls import get_urls
+
+BENCH_PREFIX = "bench-asgi"
+
+
+def make_urlconf(async_views: bool) -> types.ModuleType:
+    urlconf = types.ModuleType(f"{BENCH_PREFIX}-{'async' if async_views else 'sync'}-urls")
+    urlconf.urlpatterns = [path("", include(get_urls(async_views)))]  # type: ignore[attr-defined]
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the read endpoints served by the synchronous views through WSGI and by the async "
+        "views through ASGI, with as many slow concurrent clients"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--clients", type=int, default=100, help="Number of concurrent clients")
+        parser.add_argument("--requests", type=int, default=20, help="Number of requests of each client")
+        parser.add_argument("--threads", type=int, default=8, help="Number of WSGI worker threads")
+        parser.add_argument("--client-delay", type=float, default=0.05,
+                            help="Seconds taken by a client to read a response, during which a WSGI worker is held")
+        parser.add_argument("--issues", type=int, default=200, help="Number of issues to seed")
+
+    def handle(self, *args, **options) -> None:
+        urls, token = self.seed(options["issues"])
+        headers = {"authorization": f"Bearer {token}"}
+        results = {
+            "WSGI (sync views)": self.run_wsgi(urls, headers, options),
+            "ASGI (async views)": self.run_asgi(urls, headers, options),
+        }
+        for label, (elapsed, latencies, errors) in results.items():
+            latencies.sort()
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(
+                f"  {len(latencies)} requests in {elapsed:.2f} s: {len(latencies) / elapsed:.1f} req/s, "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms, {errors} errors"
+            )
+
+    def seed(self, issue_count: int) -> tuple[list[str], str]:
+        user = User.objects.filter(username=BENCH_PREFIX).first()
+        if user is None:
+            user = User.objects.create_user(BENCH_PREFIX, first_name="Bench", last_name="ASGI")
+            project = Project.objects.create(title=BENCH_PREFIX, type=Project.ProjectType.BACKEND, author=user)
+            Contributor.objects.create(
+                user=user,
+                project=project,
+                role=Contributor.ContributorRole.OWNER,
+                permission=Contributor.ContributorPermission.DELETE,
+            )
+            for index in range(issue_count):
+                issue = Issue.objects.create(
+                    title=f"Benchmark issue {index}",
+                    description="Seeded by bench_asgi",
+                    status=Issue.IssueStatus.TODO,
+                    tag=Issue.IssueTag.TASK,
+                    priority=Issue.IssuePriority.LOW,
+                    project=project,
+                    author=user,
+                )
+            for _ in range(20):
+                Comment.objects.create(description="Benchmark comment", author=user, issue=issue)
+        project = Project.objects.get(title=BENCH_PREFIX)
+        issue = Issue.objects.filter(project=project).order_by("-id").first()
+        comment = Comment.objects.filter(issue=issue).first()
+        urls = [
+            "/projects/",
+            f"/projects/{project.pk}/",
+            f"/projects/{project.pk}/issues/",
+            f"/projects/{project.pk}/issues/{issue.pk}/",  # type: ignore[union-attr]
+            f"/projects/{project.pk}/issues/{issue.pk}/comments/",  # type: ignore[union-attr]
+            f"/projects/{project.pk}/issues/{issue.pk}/comments/{comment.pk}/",  # type: ignore[union-attr]
+        ]
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token  # type: ignore[attr-defined]
+        return urls, str(token)
+
+    def run_clients(self, client: Callable[[int], tuple[list[float], int]], clients: int) -> tuple[float, list[float], int]:
+        latencies: list[float] = []
+        errors = 0
+        lock = threading.Lock()
+
+        def run(index: int) -> None:
+            nonlocal errors
+            client_latencies, client_errors = client(index)
+            with lock:
+                latencies.extend(client_latencies)
+                errors += client_errors
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start, latencies, errors
+
+    def run_wsgi(self, urls: list[str], headers: dict[str, str], options) -> tuple[float, list[float], int]:
+        application = WSGIHandler()
+        # The worker threads of a WSGI server, each one is held until its client read the whole response
+        workers = threading.BoundedSemaphore(options["threads"])
+
+        def client(index: int) -> tuple[list[float], int]:
+            latencies, errors = [], 0
+            for number in range(options["requests"]):
+                environ = {
+                    "REQUEST_METHOD": "GET",
+                    "PATH_INFO": urls[(index + number) % len(urls)],
+                    "QUERY_STRING": "",
+                    "SCRIPT_NAME": "",
+                    "SERVER_NAME": "localhost",
+                    "SERVER_PORT": "80",
+                    "SERVER_PROTOCOL": "HTTP/1.1",
+                    "wsgi.url_scheme": "http",
+                    "wsgi.input": io.BytesIO(),
+                    "wsgi.errors": io.StringIO(),
+                    **{f"HTTP_{name.upper()}": value for name, value in headers.items()},
+                    "HTTP_HOST": "localhost",
+                }
+                statuses = []
+                start = time.perf_counter()
+                with workers:
+                    body = application(environ, lambda status, response_headers: statuses.append(status))
+                    for _ in body:
+                        time.sleep(options["client_delay"])
+                    getattr(body, "close", lambda: None)()
+                latencies.append(time.perf_counter() - start)
+                errors += not statuses[0].startswith("200")
+            return latencies, errors
+
+        with override_settings(ROOT_URLCONF=make_urlconf(async_views=False)):
+            return self.run_clients(client, options["clients"])
+
+    def run_asgi(self, urls: list[str], headers: dict[str, str], options) -> tuple[float, list[float], int]:
+        application = ASGIHandler()
+        raw_headers = [(b"host", b"localhost"), *((name.encode(), value.encode()) for name, value in headers.items())]
+        latencies: list[float] = []
+        errors = 0
+
+        async def request(url: str) -> None:
+            nonlocal errors
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": url,
+                "raw_path": url.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": raw_headers,
+                "client": ("127.0.0.1", 0),
+                "server": ("localhost", 80),
+            }
+
+            async def receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                nonlocal errors
+                if message["type"] == "http.response.start":
+                    errors += message["status"] != 200
+                elif message["type"] == "http.response.body":
+                    # The slow client only holds this coroutine
+                    await asyncio.sleep(options["client_delay"])
+
+            start = time.perf_counter()
+            await application(scope, receive, send)
+            latencies.append(time.perf_counter() - start)
+
+        async def client(index: int) -> None:
+            for number in range(options["requests"]):
+                await request(urls[(index + number) % len(urls)])
+
+        async def main() -> float:
+            start = time.perf_counter()
+            await asyncio.gather(*(client(index) for index in range(options["clients"])))
+            return time.perf_counter() - start
+
+        with override_settings(ROOT_URLCONF=make_urlconf(async_views=True)):
+            elapsed = asyncio.run(main())
+        return elapsed, latencies, errors
@@ -0,0 +1,181 @@
+import copy
+import io
+import statistics
+import threading
+import time
+from unittest import mock
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+from sd_projects.authentication import ClaimsTokenObtainPairSerializer
+from sd_projects.models import Contributor, Issue, Project, User
+from sd_projects.pooling import close_pool, pool_stats
+
+BENCH_PREFIX = "bench-connections"
+
+# Pooled backend of each supported Django backend
+POOLED_ENGINES = {
+    "django.db.backends.postgresql": "sd_projects.pooling.postgresql",
+    "sd_projects.sqlite": "sd_projects.pooling.sqlite3",
+}
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def increment(self) -> None:
+        with self.lock:
+            self.value += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of the read endpoints when each request opens a database connection, with persistent "
+        "connections, and with a connection pool, over the configured database"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--threads", type=int, default=8, help="Number of WSGI worker threads")
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests of each thread")
+        parser.add_argument("--pool-size", type=int,
+                            help="Maximum number of connections of the pool, the number of threads by default")
+        parser.add_argument("--connect-delay", type=float, default=0.0,
+                            help="Milliseconds added to the opening of each connection, to simulate a network database")
+        parser.add_argument("--issues", type=int, default=50, help="Number of issues to seed")
+
+    def handle(self, *args, **options) -> None:
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        engine = settings_dict["ENGINE"]
+        base_engine = next((base for base, pooled in POOLED_ENGINES.items() if engine in (base, pooled)), None)
+        if base_engine is None:
+            raise CommandError(f"No pooled backend for {engine}")
+        urls, token = self.seed(options["issues"])
+        options_without_pool = {key: value for key, value in settings_dict["OPTIONS"].items() if key != "POOL"}
+        pool = {"MAX_SIZE": options["pool_size"] or options["threads"], "TIMEOUT": 30}
+        modes = {
+            "New connection per request": {"ENGINE": base_engine, "CONN_MAX_AGE": 0, "OPTIONS": options_without_pool},
+            "Persistent connections": {"ENGINE": base_engine, "CONN_MAX_AGE": 600, "OPTIONS": options_without_pool},
+            "Connection pool": {
+                "ENGINE": POOLED_ENGINES[base_engine],
+                "CONN_MAX_AGE": 0,
+                "OPTIONS": {**options_without_pool, "POOL": pool},
+            },
+        }
+        original = copy.deepcopy(settings_dict)
+        # Every connection of the backend is opened through this method, pooled or not
+        wrapper_class = import_string(f"{base_engine}.base.DatabaseWrapper")
+        get_new_connection = wrapper_class.get_new_connection
+        opened = Counter()
+
+        def slow_get_new_connection(wrapper, conn_params):
+            time.sleep(options["connect_delay"] / 1000)
+            opened.increment()
+            return get_new_connection(wrapper, conn_params)
+
+        try:
+            with mock.patch.object(wrapper_class, "get_new_connection", slow_get_new_connection):
+                for label, mode in modes.items():
+                    # The worker threads create their own database wrapper from these settings
+                    settings_dict.update(copy.deepcopy(mode))
+                    opened.value = 0
+                    latencies, errors, elapsed = self.run_requests(urls, token, options)
+                    latencies.sort()
+                    self.stdout.write(self.style.MIGRATE_HEADING(label))
+                    self.stdout.write(
+                        f"  {len(latencies)} requests in {elapsed:.2f} s: {len(latencies) / elapsed:.1f} req/s, "
+                        f"p50 {statistics.median(latencies) * 1000:.2f} ms, "
+                        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms, "
+                        f"{opened.value} connections opened, {errors} errors"
+                    )
+                    if "POOL" in mode["OPTIONS"]:
+                        pool = pool_stats()[DEFAULT_DB_ALIAS]
+                        self.stdout.write(
+                            f"  pool: {pool['opened']} opened, {pool['waits']} waits of "
+                            f"{pool['wait_time'] * 1000:.0f} ms in total, {pool['timeouts']} timeouts"
+                        )
+                        close_pool(DEFAULT_DB_ALIAS)
+        finally:
+            settings_dict.clear()
+            settings_dict.update(original)
+
+    def seed(self, issue_count: int) -> tuple[list[str], str]:
+        user = User.objects.filter(username=BENCH_PREFIX).first()
+        if user is None:
+            user = User.objects.create_user(BENCH_PREFIX, first_name="Bench", last_name="Connections")
+            project = Project.objects.create(title=BENCH_PREFIX, type=Project.ProjectType.BACKEND, author=user)
+            Contributor.objects.create(
+                user=user,
+                project=project,
+                role=Contributor.ContributorRole.OWNER,
+                permission=Contributor.ContributorPermission.DELETE,
+            )
+            Issue.objects.bulk_create(
+                Issue(
+                    title=f"Benchmark issue {index}",
+                    description="Seeded by bench_connections",
+                    status=Issue.IssueStatus.TODO,
+                    tag=Issue.IssueTag.TASK,
+                    priority=Issue.IssuePriority.LOW,
+                    project=project,
+                    author=user,
+                )
+                for index in range(issue_count)
+            )
+        project = Project.objects.get(title=BENCH_PREFIX)
+        issue = Issue.objects.filter(project=project).order_by("-id").first()
+        urls = [
+            "/projects/",
+            f"/projects/{project.pk}/",
+            f"/projects/{project.pk}/issues/",
+            f"/projects/{project.pk}/issues/{issue.pk}/",  # type: ignore[union-attr]
+        ]
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token  # type: ignore[attr-defined]
+        return urls, str(token)
+
+    def run_requests(self, urls: list[str], token: str, options) -> tuple[list[float], int, float]:
+        application = WSGIHandler()
+        latencies: list[float] = []
+        errors = 0
+        lock = threading.Lock()
+
+        def worker(index: int) -> None:
+            nonlocal errors
+            worker_latencies, worker_errors = [], 0
+            for number in range(options["requests"]):
+                environ = {
+                    "REQUEST_METHOD": "GET",
+                    "PATH_INFO": urls[(index + number) % len(urls)],
+                    "QUERY_STRING": "",
+                    "SCRIPT_NAME": "",
+                    "SERVER_NAME": "localhost",
+                    "SERVER_PORT": "80",
+                    "SERVER_PROTOCOL": "HTTP/1.1",
+                    "wsgi.url_scheme": "http",
+                    "wsgi.input": io.BytesIO(),
+                    "wsgi.errors": io.StringIO(),
+                    "HTTP_AUTHORIZATION": f"Bearer {token}",
+                    "HTTP_HOST": "localhost",
+                }
+                statuses = []
+                start = time.perf_counter()
+                body = application(environ, lambda status, response_headers: statuses.append(status))
+                b"".join(body)
+                # Sends request_finished, which closes or gives back the connection
+                getattr(body, "close", lambda: None)()
+                worker_latencies.append(time.perf_counter() - start)
+                worker_errors += not statuses[0].startswith("200")
+            connections.close_all()
+            with lock:
+                latencies.extend(worker_latencies)
+                errors += worker_errors
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(options["threads"])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors, time.perf_counter() - start
@@ -0,0 +1,133 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, models, transaction
+from sd_projects.models import Comment, Contributor, Issue, Project, User
+from sd_projects.views import ProjectCommentsAPIMixin, ProjectIssueAPIMixin
+
+BENCH_PREFIX = "bench-indexes"
+
+INDEXES = [
+    "issue_project_created_idx",
+    "issue_project_status_idx",
+    "comment_issue_created_idx",
+    "contributor_membership_idx",
+]
+
+
+class Command(BaseCommand):
+    help = "Compare the EXPLAIN plans and timings of the nested resources queries without and with the composite indexes"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--issues", type=int, default=1_000_000, help="Number of issues to seed")
+        parser.add_argument("--projects", type=int, default=200, help="Number of projects the issues are spread over")
+        parser.add_argument("--comments", type=int, default=200_000, help="Number of comments to seed")
+        parser.add_argument("--repeat", type=int, default=20, help="Number of runs of each query")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options) -> None:
+        self.seed(options["issues"], options["projects"], options["comments"], options["batch_size"])
+        queries = self.get_queries()
+
+        # DDL is transactional on SQLite and PostgreSQL, the indexes are only dropped for the first pass
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for index in INDEXES:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index)}")
+            before = self.measure(queries, options["repeat"])
+            transaction.set_rollback(True)
+        after = self.measure(queries, options["repeat"])
+
+        for name in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for label, results in (("without indexes", before), ("with indexes", after)):
+                plan, timing = results[name]
+                self.stdout.write(f"  {label}: median {timing * 1000:.3f} ms")
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+    def get_queries(self) -> dict[str, models.QuerySet]:
+        project = Project.objects.filter(title__startswith=BENCH_PREFIX).order_by("?").first()
+        issues = ProjectIssueAPIMixin.queryset.filter(project=project).order_by("created_time", "id")
+        middle = issues.values_list("created_time", "id")[issues.count() // 2]
+        issue = Issue.objects.filter(project=project, comments__isnull=False).first() \
+            or Issue.objects.filter(comments__isnull=False).first()
+        contributor = Contributor.objects.filter(project=project).first()
+        return {
+            "Issues first page": issues[:50],
+            "Issues deep page": issues.filter(
+                models.Q(created_time__gt=middle[0]) | models.Q(created_time=middle[0], id__gt=middle[1])
+            )[:50],
+            "Issues by status and priority": issues.filter(
+                status=Issue.IssueStatus.PENDING,
+                priority=Issue.IssuePriority.HIGH,
+            )[:50],
+            "Comments first page": ProjectCommentsAPIMixin.queryset.filter(issue=issue).order_by("created_time", "id")[:50],
+            "Contributor membership": Contributor.objects.filter(
+                project_id=contributor.project_id,
+                user_id=contributor.user_id,
+            ).values_list("id", "role", "permission"),
+        }
+
+    def measure(self, queries: dict[str, models.QuerySet], repeat: int) -> dict[str, tuple[str, float]]:
+        results = {}
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - start)
+            results[name] = (queryset.explain(), statistics.median(timings))
+        return results
+
+    def seed(self, issue_count: int, project_count: int, comment_count: int, batch_size: int) -> None:
+        existing = Issue.objects.filter(project__title__startswith=BENCH_PREFIX).count()
+        if existing >= issue_count:
+            return
+        self.stdout.write(f"Seeding {issue_count - existing} issues and {comment_count} comments")
+        users = User.objects.bulk_create(
+            User(username=f"{BENCH_PREFIX}-{existing}-{index}", first_name="Bench", last_name=str(index))
+            for index in range(project_count)
+        )
+        projects = Project.objects.bulk_create(
+            Project(title=f"{BENCH_PREFIX}-{existing}-{index}", type=Project.ProjectType.BACKEND, author=users[index])
+            for index in range(project_count)
+        )
+        Contributor.objects.bulk_create(
+            Contributor(
+                user=user,
+                project=project,
+                role=Contributor.ContributorRole.OWNER if user == project.author else Contributor.ContributorRole.CONTRIBUTOR,
+                permission=Contributor.ContributorPermission.DELETE,
+            )
+            for project in projects
+            for user in {project.author, *random.sample(users, min(len(users), 20))}
+        )
+
+        remaining = issue_count - existing
+        while remaining > 0:
+            count = min(batch_size, remaining)
+            Issue.objects.bulk_create(
+                Issue(
+                    title="Benchmark issue",
+                    description="Seeded by bench_indexes",
+                    status=random.choice(Issue.IssueStatus.values),
+                    tag=random.choice(Issue.IssueTag.values),
+                    priority=random.choice(Issue.IssuePriority.values),
+                    project=random.choice(projects),
+                    author=random.choice(users),
+                )
+                for _ in range(count)
+            )
+            remaining -= count
+
+        issue_ids = list(Issue.objects.filter(project__in=projects).values_list("id", flat=True)[:10_000])
+        remaining = comment_count
+        while remaining > 0:
+            count = min(batch_size, remaining)
+            Comment.objects.bulk_create(
+                Comment(description="Benchmark comment", author=random.choice(users), issue_id=random.choice(issue_ids))
+                for _ in range(count)
+            )
+            remaining -= count
@@ -0,0 +1,80 @@
+import datetime
+import io
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandParser
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from sd_projects.parsers import ORJSONParser
+from sd_projects.renderers import ORJSONRenderer, orjson
+from sd_projects.serializers import IssueValuesSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the encoding time and memory allocated by DRF's JSON renderer and by the orjson one, and their "
+        "decoding time, over pages of issues as rendered by the API"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--issues", type=int, default=10000, help="Number of issues of the payload")
+        parser.add_argument("--repeat", type=int, default=5, help="Number of runs of each measure, the best is kept")
+
+    def handle(self, *args, **options) -> None:
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed, ORJSONRenderer falls back to the standard library"))
+        payload = {"next": None, "previous": None, "results": self.make_issues(options["issues"])}
+        codecs = {
+            "JSONRenderer": (JSONRenderer(), JSONParser()),
+            "ORJSONRenderer": (ORJSONRenderer(), ORJSONParser()),
+        }
+        expected = JSONRenderer().render(payload)
+        for label, (renderer, parser) in codecs.items():
+            content = renderer.render(payload)
+            encode_time = self.best_time(lambda: renderer.render(payload), options["repeat"])
+            decode_time = self.best_time(lambda: parser.parse(io.BytesIO(content)), options["repeat"])
+            tracemalloc.start()
+            renderer.render(payload)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label} ({options['issues']} issues)"))
+            self.stdout.write(
+                f"  encode {encode_time * 1000:.1f} ms, decode {decode_time * 1000:.1f} ms, "
+                f"{peak / 1024:,.0f} KiB allocated at peak, {len(content):,} bytes"
+                f"{'' if content == expected else ', differs from JSONRenderer'}"
+            )
+
+    def make_issues(self, count: int) -> list[dict]:
+        """
+        Render issues as the API does, half of them assigned, from rows built in memory.
+        """
+        plan = IssueValuesSerializer.get_fields_plan(IssueValuesSerializer.field_names)
+        created = datetime.datetime(2023, 3, 1, 12, 30, 15, 123456)
+        rows = []
+        for index in range(count):
+            values = {
+                "id": index + 1,
+                "author__id": 1,
+                "author__first_name": "Bench",
+                "author__last_name": "Author",
+                "assigned__id": index % 50 + 2 if index % 2 else None,
+                "assigned__first_name": "Assigned",
+                "assigned__last_name": f"User {index % 50}",
+                "title": f"Issue {index}",
+                "description": "Rendered by bench_json, with some accents: éèà",
+                "created_time": created + datetime.timedelta(seconds=index),
+                "updated_time": created + datetime.timedelta(seconds=index, milliseconds=250),
+                "status": index % 3,
+                "tag": index % 3,
+                "priority": index % 3,
+            }
+            rows.append(tuple(values[column] for column in plan.columns))  # type: ignore[union-attr]
+        return plan.render_many(rows)  # type: ignore[union-attr]
+
+    def best_time(self, measure, repeat: int) -> float:
+        times = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            measure()
+            times.append(time.perf_counter() - start)
+        return min(times)
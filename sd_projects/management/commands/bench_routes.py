@@ -0,0 +1,369 @@
+import json
+import re
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Callable, NamedTuple
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections
+from django.db.models import Count, Sum
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from sd_projects.authentication import ClaimsTokenObtainPairSerializer
+from sd_projects.models import Comment, Contributor, Issue, Project, ProjectStatistics, User
+from sd_projects.seeding import WORDS
+from sd_projects.urls import get_urls
+
+BENCH_PREFIX = "bench-routes"
+
+# Number of queries of a request, from the Server-Timing header of the instrumentation middleware
+SERVER_TIMING_QUERIES = re.compile(r'(?:^|,\s*)db;[^,]*desc="(\d+) queries"')
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Pattern of sd_projects/urls.py served by the requests
+    route: str
+    method: str
+    path: str
+    body: Callable[[], Any] | None = None
+
+
+class Sample(NamedTuple):
+    latency: float
+    status: int
+    queries: int | None
+
+
+def parse_queries(server_timing: str | None) -> int | None:
+    match = SERVER_TIMING_QUERIES.search(server_timing or "")
+    return int(match[1]) if match else None
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        "p50": round(p50 * 1000, 3),
+        "p95": round(p95 * 1000, 3),
+        "p99": round(p99 * 1000, 3),
+        "max": round(max(latencies) * 1000, 3),
+    }
+
+
+class ClientTarget:
+    """
+    Send the requests through Django's test client, in this process, with a client per thread.
+    """
+
+    def __init__(self, token: str) -> None:
+        self.name = "client"
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.local = threading.local()
+
+    def send(self, method: str, path: str, body: Any) -> Sample:
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = Client(SERVER_NAME="localhost")
+        data = json.dumps(body) if body is not None else ""
+        start = time.perf_counter()
+        response = client.generic(method, path, data, content_type="application/json", **self.headers)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        latency = time.perf_counter() - start
+        response.close()
+        return Sample(latency, response.status_code, parse_queries(response.headers.get("Server-Timing")))
+
+
+class ServerTarget:
+    """
+    Send the requests over HTTP to a running server, which must use the database of this command.
+    """
+
+    def __init__(self, url: str, token: str, timeout: float) -> None:
+        self.name = url
+        self.url = url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        self.timeout = timeout
+
+    def send(self, method: str, path: str, body: Any) -> Sample:
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, headers=self.headers, method=method)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                status, server_timing = response.status, response.headers.get("Server-Timing")
+        except urllib.error.HTTPError as error:
+            error.read()
+            status, server_timing = error.code, error.headers.get("Server-Timing")
+        except (urllib.error.URLError, OSError):
+            status, server_timing = 0, None
+        return Sample(time.perf_counter() - start, status, parse_queries(server_timing))
+
+
+class Command(BaseCommand):
+    help = (
+        "Send requests to every route of the API at increasing concurrency levels, through the test client or a "
+        "running server, and report their latency percentiles, throughput and query counts as JSON"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--concurrency", default="1,8,32",
+                            help="Comma separated numbers of concurrent clients, each level being run in turn")
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests of each route and level")
+        parser.add_argument("--routes", help="Regular expression selecting the scenarios by name, e.g. '^(?!export)'")
+        parser.add_argument("--project", type=int, help="Id of the benchmarked project, the one with the most issues by default")
+        parser.add_argument("--server", help="Base URL of a running server, the test client is used otherwise")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout in seconds of the requests to the server")
+        parser.add_argument("--output", help="Path of the JSON report, written to the standard output by default")
+        parser.add_argument("--baseline", help="Path of a previous JSON report to compare the results with")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Relative increase of the p95 latency over the baseline reported as a regression")
+
+    def handle(self, *args, **options) -> None:
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError(f"Invalid concurrency levels {options['concurrency']!r}")
+        # The progress goes along the report only when the report is written to a file
+        self.log = self.stdout.write if options["output"] else (lambda message: None)
+
+        project = self.get_project(options["project"])
+        token = self.get_user(project)
+        scenarios = self.get_scenarios(project)
+        self.check_routes(scenarios)
+        if options["routes"]:
+            pattern = re.compile(options["routes"])
+            scenarios = [scenario for scenario in scenarios if pattern.search(scenario.name)]
+        if options["server"]:
+            target: ClientTarget | ServerTarget = ServerTarget(options["server"], token, options["timeout"])
+        else:
+            target = ClientTarget(token)
+
+        results = []
+        metrics = {**getattr(settings, "SOFTDESK_METRICS", {}), "SAMPLE_RATE": 1.0, "SERVER_TIMING": True}
+        with override_settings(SOFTDESK_METRICS=metrics):
+            for level in levels:
+                for scenario in scenarios:
+                    result = self.run(target, scenario, level, options["requests"])
+                    self.log(
+                        f"{scenario.name} x{level}: {result['throughput']} req/s, p50 {result['latency_ms']['p50']} ms, "
+                        f"p95 {result['latency_ms']['p95']} ms, p99 {result['latency_ms']['p99']} ms, "
+                        f"{result['errors']} errors"
+                    )
+                    results.append(result)
+
+        report = {
+            "commit": self.get_commit(),
+            "created": timezone.now().isoformat(),
+            "target": target.name,
+            "database": connection.vendor,
+            "project": project.pk,
+            "rows": {
+                "users": User.objects.count(),
+                "projects": Project.objects.count(),
+                "issues": Issue.objects.count(),
+                "comments": Comment.objects.count(),
+            },
+            "results": results,
+        }
+        content = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(content + "\n")
+        else:
+            self.stdout.write(content)
+
+        if options["baseline"]:
+            regressions = self.compare(results, options["baseline"], options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+
+    def get_project(self, project_id: int | None) -> Project:
+        if project_id is not None:
+            project = Project.objects.filter(pk=project_id).first()
+        else:
+            largest = ProjectStatistics.objects \
+                .values("project_id") \
+                .annotate(issues=Sum("issue_count")) \
+                .order_by("-issues") \
+                .first()
+            project = Project.objects.filter(pk=largest["project_id"]).first() if largest else None
+        if project is None:
+            raise CommandError("No project to benchmark, seed some with `python manage.py seed_data`")
+        return project
+
+    def get_user(self, project: Project) -> str:
+        """
+        Return the access token of the staff user sending the requests, an owner of the benchmarked project.
+        """
+        user = User.objects.filter(username=BENCH_PREFIX).first() \
+            or User.objects.create_user(BENCH_PREFIX, first_name="Bench", last_name="Routes", is_staff=True)
+        Contributor.objects.get_or_create(
+            user=user,
+            project=project,
+            defaults={"role": Contributor.ContributorRole.OWNER, "permission": Contributor.ContributorPermission.DELETE},
+        )
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token  # type: ignore[attr-defined]
+        # Outlives the run, however long
+        token.set_exp(lifetime=timedelta(days=1))
+        return str(token)
+
+    def get_scenarios(self, project: Project) -> list[Scenario]:
+        """
+        Return the requests of each route of sd_projects/urls.py, on the issue of the project with the most comments.
+        """
+        top = Comment.objects \
+            .filter(issue__project=project) \
+            .values("issue_id") \
+            .annotate(comments=Count("id")) \
+            .order_by("-comments") \
+            .first()
+        comment = Comment.objects.filter(issue_id=top["issue_id"]).order_by("id").first() if top else None
+        if comment is None:
+            raise CommandError(f"The project {project.pk} has no comment to benchmark")
+        contributor = Contributor.objects.filter(project=project).order_by("id").first()
+        issue_ids = list(Issue.objects.filter(project=project).order_by("id").values_list("id", flat=True)[:10])
+        comment_ids = list(Comment.objects.filter(issue_id=comment.issue_id).order_by("id").values_list("id", flat=True)[:10])
+        priorities = Issue.IssuePriority.values
+
+        def register() -> dict[str, str]:
+            password = uuid.uuid4().hex
+            return {
+                "username": f"{BENCH_PREFIX}-{uuid.uuid4().hex[:16]}",
+                "password": password,
+                "password2": password,
+                "first_name": "Bench",
+                "last_name": "Routes",
+            }
+
+        def update_issues() -> list[dict[str, int]]:
+            return [{"id": pk, "priority": priorities[(pk + time.monotonic_ns()) % len(priorities)]} for pk in issue_ids]
+
+        def update_comments() -> list[dict[str, Any]]:
+            return [{"id": pk, "description": f"Updated by {BENCH_PREFIX} at {time.time()}"} for pk in comment_ids]
+
+        projects = "projects/<int:project_id>"
+        issues = f"{projects}/issues"
+        comments = f"{issues}/<int:issue_id>/comments"
+        project_path = f"/projects/{project.pk}"
+        issue_path = f"{project_path}/issues/{comment.issue_id}"
+        return [
+            Scenario("register", "register/", "POST", "/register/", register),
+            Scenario("status pools", "status/pools/", "GET", "/status/pools/"),
+            Scenario("status caches", "status/caches/", "GET", "/status/caches/"),
+            Scenario("status metrics", "status/metrics/", "GET", "/status/metrics/"),
+            Scenario("projects", "projects/", "GET", "/projects/"),
+            Scenario("project", f"{projects}/", "GET", f"{project_path}/"),
+            Scenario("project embedded", f"{projects}/", "GET", f"{project_path}/?embed=statistics,role"),
+            Scenario("statistics", f"{projects}/stats/", "GET", f"{project_path}/stats/"),
+            Scenario("export", f"{projects}/export/", "GET", f"{project_path}/export/"),
+            Scenario("search", f"{projects}/search/", "GET", f"{project_path}/search/?q={WORDS[20]}+{WORDS[12]}"),
+            Scenario("contributors", f"{projects}/users/", "GET", f"{project_path}/users/"),
+            Scenario("contributor", f"{projects}/users/<int:user_id>/", "GET", f"{project_path}/users/{contributor.pk}/"),  # type: ignore[union-attr]
+            Scenario("issues", f"{issues}/", "GET", f"{project_path}/issues/"),
+            Scenario("issues filtered", f"{issues}/", "GET", f"{project_path}/issues/?status=0,1&ordering=-priority"),
+            Scenario("issues sparse", f"{issues}/", "GET", f"{project_path}/issues/?fields=id,title,status"),
+            Scenario("issues bulk update", f"{issues}/bulk/", "PATCH", f"{project_path}/issues/bulk/", update_issues),
+            Scenario("issue", f"{issues}/<int:issue_id>/", "GET", f"{issue_path}/"),
+            Scenario("comments", f"{comments}/", "GET", f"{issue_path}/comments/"),
+            Scenario("comments bulk update", f"{comments}/bulk/", "PATCH", f"{issue_path}/comments/bulk/", update_comments),
+            Scenario("comment", f"{comments}/<int:comment_id>/", "GET", f"{issue_path}/comments/{comment.pk}/"),
+        ]
+
+    def check_routes(self, scenarios: list[Scenario]) -> None:
+        missing = {str(pattern.pattern) for pattern in get_urls(False)} - {scenario.route for scenario in scenarios}
+        if missing:
+            raise CommandError(f"No scenario for the routes {', '.join(sorted(missing))}")
+
+    def run(self, target: ClientTarget | ServerTarget, scenario: Scenario, concurrency: int, requests: int) -> dict[str, Any]:
+        samples: list[Sample] = []
+        lock = threading.Lock()
+        remaining = iter(range(requests))
+
+        def client() -> None:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                sample = target.send(scenario.method, scenario.path, scenario.body() if scenario.body else None)
+                with lock:
+                    samples.append(sample)
+
+        def worker() -> None:
+            try:
+                client()
+            finally:
+                connections.close_all()
+
+        # Not recorded: fills the caches emptied by the writes of the previous scenarios
+        target.send(scenario.method, scenario.path, scenario.body() if scenario.body else None)
+        start = time.perf_counter()
+        if concurrency == 1:
+            client()
+        else:
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - start
+
+        queries = [sample.queries for sample in samples if sample.queries is not None]
+        return {
+            "name": scenario.name,
+            "route": scenario.route,
+            "method": scenario.method,
+            "concurrency": concurrency,
+            "requests": len(samples),
+            "errors": sum(not 200 <= sample.status < 400 for sample in samples),
+            "statuses": dict(sorted(Counter(str(sample.status) for sample in samples).items())),
+            "throughput": round(len(samples) / elapsed, 1),
+            "latency_ms": summarize_latencies([sample.latency for sample in samples]),
+            "queries": {"mean": round(statistics.fmean(queries), 2), "max": max(queries)} if queries else None,
+        }
+
+    def compare(self, results: list[dict[str, Any]], path: str, tolerance: float) -> list[str]:
+        """
+        Log the changes since a previous report, and return those of the results of which the p95 latency grew by
+        more than `tolerance` or which ran more queries.
+        """
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        previous = {(result["name"], result["concurrency"]): result for result in baseline["results"]}
+        self.log(f"Compared with {baseline.get('commit') or path}")
+        regressions = []
+        for result in results:
+            before = previous.get((result["name"], result["concurrency"]))
+            if before is None:
+                continue
+            p95, before_p95 = result["latency_ms"]["p95"], before["latency_ms"]["p95"]
+            queries, before_queries = (result["queries"] or {}).get("max"), (before["queries"] or {}).get("max")
+            line = (
+                f"{result['name']} x{result['concurrency']}: p95 {before_p95} -> {p95} ms, "
+                f"{before['throughput']} -> {result['throughput']} req/s, max queries {before_queries} -> {queries}"
+            )
+            self.log(f"  {line}")
+            if p95 > before_p95 * (1 + tolerance) or (None not in (queries, before_queries) and queries > before_queries):
+                regressions.append(line)
+        return regressions
+
+    def get_commit(self) -> str | None:
+        try:
+            result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True)
+        except OSError:
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
@@ -0,0 +1,107 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from rest_framework.test import APIClient
+from sd_projects.models import Comment, Contributor, Issue, Project, User
+
+BENCH_PREFIX = "bench-search"
+
+
+def make_vocabulary(size: int) -> list[str]:
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 9))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = "Measure the latency of the search endpoint over issues and comments of Zipf distributed words"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--documents", type=int, default=1_000_000, help="Number of issues and comments to seed")
+        parser.add_argument("--projects", type=int, default=10, help="Number of projects the documents are spread over")
+        parser.add_argument("--words", type=int, default=20_000, help="Size of the vocabulary")
+        parser.add_argument("--repeat", type=int, default=50, help="Number of runs of each query")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options) -> None:
+        vocabulary = make_vocabulary(options["words"])
+        user = self.seed(vocabulary, options)
+        project = Project.objects.filter(title__startswith=BENCH_PREFIX).order_by("id").first()
+        client = APIClient()
+        client.force_authenticate(user)
+        url = f"/projects/{project.pk}/search/"  # type: ignore[union-attr]
+        queries = {
+            "Common word": vocabulary[0],
+            "Frequent word": vocabulary[20],
+            "Mid-frequency word": vocabulary[500],
+            "Rare word": vocabulary[-1],
+            "Two frequent words": f"{vocabulary[1]} {vocabulary[2]}",
+            "Common and rare words": f"{vocabulary[0]} {vocabulary[5000]}",
+            "Prefix": f"{vocabulary[100][:3]}*",
+        }
+        for name, query in queries.items():
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                response = client.get(url, {"q": query})
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            self.stdout.write(
+                f"{name} ({query!r}, {len(response.data['results'])} results on the first page): "  # type: ignore[attr-defined]
+                f"median {statistics.median(timings) * 1000:.1f} ms, "
+                f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:.1f} ms"
+            )
+
+    def seed(self, vocabulary: list[str], options) -> User:
+        user = User.objects.filter(username=BENCH_PREFIX).first()
+        if user is not None:
+            return user
+        user = User.objects.create_user(BENCH_PREFIX, first_name="Bench", last_name="Search")
+        rng = random.Random(1)
+        # Zipf's law: the frequency of a word is inversely proportional to its rank
+        weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+        projects = []
+        for index in range(options["projects"]):
+            project = Project.objects.create(title=f"{BENCH_PREFIX}-{index}", type=Project.ProjectType.BACKEND, author=user)
+            Contributor.objects.create(
+                user=user,
+                project=project,
+                role=Contributor.ContributorRole.OWNER,
+                permission=Contributor.ContributorPermission.DELETE,
+            )
+            projects.append(project)
+
+        def text(words: int, length: int) -> str:
+            return " ".join(rng.choices(vocabulary, weights, k=words))[:length]
+
+        issue_count = options["documents"] // 2
+        start = time.perf_counter()
+        for offset in range(0, issue_count, options["batch_size"]):
+            with transaction.atomic():
+                Issue.objects.bulk_create(
+                    Issue(
+                        title=text(4, 50),
+                        description=text(20, 320),
+                        status=Issue.IssueStatus.TODO,
+                        tag=Issue.IssueTag.BUG,
+                        priority=Issue.IssuePriority.LOW,
+                        project=projects[(offset + index) % len(projects)],
+                        author=user,
+                    )
+                    for index in range(min(options["batch_size"], issue_count - offset))
+                )
+        issue_ids = list(Issue.objects.filter(author=user).values_list("id", flat=True))
+        comment_count = options["documents"] - issue_count
+        for offset in range(0, comment_count, options["batch_size"]):
+            with transaction.atomic():
+                Comment.objects.bulk_create(
+                    Comment(description=text(15, 320), author=user, issue_id=rng.choice(issue_ids))
+                    for _ in range(min(options["batch_size"], comment_count - offset))
+                )
+        self.stdout.write(f"Seeded {options['documents']} documents in {time.perf_counter() - start:.0f} s")
+        return user
@@ -0,0 +1,115 @@
+import time
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework.renderers import JSONRenderer
+from sd_projects.models import Comment, Contributor, Issue, Project, User
+from sd_projects.serializers import (
+    CommentSerializer,
+    CommentValuesSerializer,
+    ContributorSerializer,
+    ContributorValuesSerializer,
+    IssueSerializer,
+    IssueValuesSerializer,
+)
+from sd_projects.views import ProjectCommentsAPIMixin, ProjectContributorAPIMixin, ProjectIssueAPIMixin
+
+BENCH_PREFIX = "bench-serializers"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the rows rendered per second by the model serializers and by the values serializers, with and "
+        "without the query, over the configured database"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=1000, help="Number of issues, comments and contributors to seed")
+        parser.add_argument("--repeat", type=int, default=5, help="Number of runs of each measure, the best is kept")
+
+    def handle(self, *args, **options) -> None:
+        project, issue = self.seed(options["rows"])
+        resources = {
+            "Issues": (
+                ProjectIssueAPIMixin.queryset.filter(project=project).order_by("created_time", "id"),
+                IssueSerializer,
+                IssueValuesSerializer,
+            ),
+            "Comments": (
+                ProjectCommentsAPIMixin.queryset.filter(issue=issue).order_by("created_time", "id"),
+                CommentSerializer,
+                CommentValuesSerializer,
+            ),
+            "Contributors": (
+                ProjectContributorAPIMixin.queryset.filter(project=project).order_by("id"),
+                ContributorSerializer,
+                ContributorValuesSerializer,
+            ),
+        }
+        renderer = JSONRenderer()
+        for label, (queryset, serializer_class, values_serializer_class) in resources.items():
+            plan = values_serializer_class.get_fields_plan(values_serializer_class.field_names)
+            if plan is None:
+                raise CommandError(f"{values_serializer_class.__name__} cannot render every field")
+            values_queryset = queryset.values_list(*plan.columns)
+            instances, rows = list(queryset), list(values_queryset)
+            expected = renderer.render(serializer_class(instances, many=True).data)
+            if renderer.render(plan.render_many(rows)) != expected:
+                raise CommandError(f"{label}: the values serializer renders another JSON")
+            measures = {
+                "serializer": lambda: serializer_class(instances, many=True).data,
+                "values": lambda: plan.render_many(rows),  # type: ignore[union-attr]
+                "serializer and query": lambda: serializer_class(queryset.all(), many=True).data,
+                "values and query": lambda: plan.render_many(values_queryset.all()),  # type: ignore[union-attr]
+            }
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label} ({len(rows)} rows, {len(expected)} bytes)"))
+            for name, measure in measures.items():
+                elapsed = self.best_time(measure, options["repeat"])
+                self.stdout.write(f"  {name}: {len(rows) / elapsed:,.0f} rows/s, {elapsed * 1000:.1f} ms")
+
+    def best_time(self, measure, repeat: int) -> float:
+        times = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            measure()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def seed(self, row_count: int) -> tuple[Project, Issue]:
+        project = Project.objects.filter(title=BENCH_PREFIX).first()
+        if project is None:
+            owner = User.objects.create_user(BENCH_PREFIX, first_name="Bench", last_name="Serializers")
+            project = Project.objects.create(title=BENCH_PREFIX, type=Project.ProjectType.BACKEND, author=owner)
+            Contributor.objects.create(
+                user=owner,
+                project=project,
+                role=Contributor.ContributorRole.OWNER,
+                permission=Contributor.ContributorPermission.DELETE,
+            )
+        owner = project.author
+        issue = Issue.objects.filter(project=project).order_by("id").first()
+        users = User.objects.bulk_create(
+            User(username=f"{BENCH_PREFIX}-{project.pk}-{index}", first_name="User", last_name=str(index))
+            for index in range(Contributor.objects.filter(project=project).count() - 1, row_count)
+        )
+        Contributor.objects.bulk_create(
+            Contributor(user=user, project=project, permission=Contributor.ContributorPermission.WRITE)
+            for user in users
+        )
+        Issue.objects.bulk_create(
+            Issue(
+                title=f"Benchmark issue {index}",
+                description="Seeded by bench_serializers",
+                status=index % 3,
+                tag=Issue.IssueTag.TASK,
+                priority=index % 3,
+                project=project,
+                author=owner,
+                assigned=owner if index % 2 else None,
+            )
+            for index in range(Issue.objects.filter(project=project).count(), row_count)
+        )
+        issue = issue or Issue.objects.filter(project=project).order_by("id").first()
+        Comment.objects.bulk_create(
+            Comment(description=f"Benchmark comment {index}", author=owner, issue=issue)
+            for index in range(Comment.objects.filter(issue=issue).count(), row_count)
+        )
+        return project, issue  # type: ignore[return-value]
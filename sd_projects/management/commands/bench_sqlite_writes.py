@@ -0,0 +1,144 @@
+import copy
+import os
+import statistics
+import tempfile
+import threading
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from sd_projects.models import Contributor, Issue, Project, User
+
+BENCH_PREFIX = "bench-sqlite-writes"
+
+PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -20000,
+    "mmap_size": 268435456,
+    "busy_timeout": 5000,
+}
+
+MODES = {
+    "Default SQLite": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {}},
+    "WAL and pragmas": {"ENGINE": "sd_projects.sqlite", "OPTIONS": {"PRAGMAS": PRAGMAS}},
+    "WAL, pragmas and serialized writes": {
+        "ENGINE": "sd_projects.sqlite",
+        "OPTIONS": {"PRAGMAS": PRAGMAS, "SERIALIZE_WRITES": True},
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the issue creations per second, their latency and error rate, with many writer threads and a few "
+        "reader threads, on a new SQLite database for each configuration of the backend"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--writers", type=int, default=16, help="Number of writer threads")
+        parser.add_argument("--writes", type=int, default=50, help="Number of issues created by each writer")
+        parser.add_argument("--readers", type=int, default=4, help="Number of threads listing the issues meanwhile")
+
+    def handle(self, *args, **options) -> None:
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        original = copy.deepcopy(settings_dict)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for index, (label, mode) in enumerate(MODES.items()):
+                    self.use_database(settings_dict, {
+                        **copy.deepcopy(original),
+                        **copy.deepcopy(mode),
+                        "NAME": os.path.join(directory, f"{index}.sqlite3"),
+                    })
+                    call_command("migrate", verbosity=0)
+                    project = self.seed()
+                    latencies, errors, reads, elapsed = self.run_threads(project, options)
+                    total = options["writers"] * options["writes"]
+                    latencies.sort()
+                    self.stdout.write(self.style.MIGRATE_HEADING(label))
+                    self.stdout.write(
+                        f"  {len(latencies)} issues created in {elapsed:.2f} s: {len(latencies) / elapsed:.1f} writes/s, "
+                        f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms, "
+                        f"{errors} errors ({errors / total:.1%}), {reads / elapsed:.1f} reads/s"
+                    )
+        finally:
+            self.use_database(settings_dict, original)
+
+    def use_database(self, settings_dict: dict, database: dict) -> None:
+        connections.close_all()
+        settings_dict.clear()
+        settings_dict.update(database)
+        # The wrapper of this thread is created again, with the backend of the settings
+        del connections[DEFAULT_DB_ALIAS]
+
+    def seed(self) -> Project:
+        user = User.objects.create_user(BENCH_PREFIX, first_name="Bench", last_name="SQLite")
+        project = Project.objects.create(title=BENCH_PREFIX, type=Project.ProjectType.BACKEND, author=user)
+        Contributor.objects.create(
+            user=user,
+            project=project,
+            role=Contributor.ContributorRole.OWNER,
+            permission=Contributor.ContributorPermission.DELETE,
+        )
+        return project
+
+    def run_threads(self, project: Project, options) -> tuple[list[float], int, int, float]:
+        latencies: list[float] = []
+        errors = reads = 0
+        lock = threading.Lock()
+        writing = threading.Event()
+
+        def writer(index: int) -> None:
+            nonlocal errors
+            writer_latencies, writer_errors = [], 0
+            for number in range(options["writes"]):
+                start = time.perf_counter()
+                try:
+                    # The creation reads the project version and statistics before updating them
+                    with transaction.atomic():
+                        Issue.objects.create(
+                            title=f"Issue {index}-{number}",
+                            description="Created by bench_sqlite_writes",
+                            status=Issue.IssueStatus.TODO,
+                            tag=Issue.IssueTag.BUG,
+                            priority=Issue.IssuePriority.LOW,
+                            project=project,
+                            author=project.author,
+                        )
+                except OperationalError:
+                    writer_errors += 1
+                else:
+                    writer_latencies.append(time.perf_counter() - start)
+            connections.close_all()
+            with lock:
+                latencies.extend(writer_latencies)
+                errors += writer_errors
+
+        def reader() -> None:
+            nonlocal reads
+            count = 0
+            while writing.is_set():
+                try:
+                    list(Issue.objects.filter(project=project).order_by("-id")[:20])
+                    count += 1
+                except OperationalError:
+                    pass
+            connections.close_all()
+            with lock:
+                reads += count
+
+        writers = [threading.Thread(target=writer, args=(index,)) for index in range(options["writers"])]
+        readers = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        writing.set()
+        start = time.perf_counter()
+        for thread in [*readers, *writers]:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        writing.clear()
+        for thread in readers:
+            thread.join()
+        return latencies, errors, reads, elapsed
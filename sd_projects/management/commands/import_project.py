@@ -0,0 +1,92 @@
+import itertools
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from sd_projects.importing import InvalidRecord, ProjectImporter, UserMap, read_csv, read_ndjson
+from sd_projects.models import ImportCheckpoint, Project, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a project, its contributors, issues and comments from NDJSON, as written by the project export, "
+        "or from CSV. The input is streamed and inserted by chunks, an interrupted import resumes after the last "
+        "imported chunk when run again"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("input", help="Path of the NDJSON or CSV input")
+        parser.add_argument("--format", choices=("ndjson", "csv"), help="Format of the input, from its extension by default")
+        parser.add_argument("--name", help="Name of the checkpoint of the import, the absolute path of the input by default")
+        parser.add_argument("--project", type=int, help="Id of an existing project to import into, instead of creating the project of the input")
+        parser.add_argument("--title", help="Title of the created project, instead of the one of the input")
+        parser.add_argument("--users", help="Path of a JSON object mapping the user references of the input to local usernames")
+        parser.add_argument("--default-user", help="Username of the user replacing the unknown users of the input")
+        parser.add_argument("--add-contributors", action="store_true",
+                            help="Add the authors and assignees who are not contributors of the project, with the read permission")
+        parser.add_argument("--skip-invalid", action="store_true", help="Report and skip the invalid records instead of stopping")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Number of records inserted by transaction")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows inserted by query")
+
+    def handle(self, *args, **options) -> None:
+        path = options["input"]
+        input_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        checkpoint, created = ImportCheckpoint.objects.get_or_create(source=options["name"] or os.path.abspath(path))
+        if checkpoint.finished_time is not None:
+            raise CommandError(f"{checkpoint.source} was already imported into the project {checkpoint.project_id}")
+        if options["project"] is not None and checkpoint.project_id is None:
+            if not Project.objects.filter(pk=options["project"]).exists():
+                raise CommandError(f"Unknown project {options['project']}")
+            checkpoint.project_id = options["project"]
+            checkpoint.save()
+        if not created:
+            self.stdout.write(f"Resuming {checkpoint.source} after line {checkpoint.line}")
+
+        importer = ProjectImporter(
+            checkpoint,
+            self.get_users(options),
+            batch_size=options["batch_size"],
+            add_contributors=options["add_contributors"],
+            on_invalid=self.report if options["skip_invalid"] else None,
+        )
+        read = read_csv if input_format == "csv" else read_ndjson
+        start, row_count = time.perf_counter(), 0
+        with open(path, "rb") as stream:
+            records = read(stream, checkpoint.position, checkpoint.line)
+            try:
+                if checkpoint.project_id is None:
+                    first = next(records, None)
+                    if first is None:
+                        raise CommandError("The input is empty")
+                    project = importer.create_project(first, options["title"])
+                    self.stdout.write(f"Created the project {project.pk} {project.title!r}")
+                while chunk := list(itertools.islice(records, options["chunk_size"])):
+                    row_count += importer.import_chunk(chunk)
+                    elapsed = time.perf_counter() - start
+                    self.stdout.write(
+                        f"Line {checkpoint.line}: {checkpoint.row_count} rows, {row_count / elapsed:.0f} rows/s"
+                    )
+            except InvalidRecord as error:
+                raise CommandError(
+                    f"{error} Fix the input and run the command again to resume after line {checkpoint.line}"
+                )
+        importer.finish()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {checkpoint.row_count} rows into the project {checkpoint.project_id} "
+            f"in {time.perf_counter() - start:.1f} s, {importer.rejected} invalid records skipped"
+        ))
+
+    def get_users(self, options) -> UserMap:
+        mapping = {}
+        if options["users"]:
+            with open(options["users"]) as users:
+                mapping = {str(reference): username for reference, username in json.load(users).items()}
+        default_user_id = None
+        if options["default_user"]:
+            default_user_id = User.objects.filter(username=options["default_user"]).values_list("id", flat=True).first()
+            if default_user_id is None:
+                raise CommandError(f"Unknown user {options['default_user']}")
+        return UserMap(mapping, default_user_id)
+
+    def report(self, error: InvalidRecord) -> None:
+        self.stderr.write(f"Skipped {error}")
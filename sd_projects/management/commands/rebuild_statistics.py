@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandParser
+from sd_projects.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized issues and comments counters of the projects"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("projects", nargs="*", type=int, help="Ids of the projects to rebuild, every project by default")
+
+    def handle(self, *args, **options) -> None:
+        count = rebuild_statistics(options["projects"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} statistics buckets"))
@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from sd_projects.seeding import DataSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert synthetic users, projects, contributors, issues and comments, spread with Zipf distributions so "
+        "that a few projects, users and issues concentrate most of the rows. Each run adds to the seeded rows"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=10_000, help="Number of users to seed")
+        parser.add_argument("--projects", type=int, default=1_000, help="Number of projects to seed")
+        parser.add_argument("--issues", type=int, default=200_000, help="Number of issues to seed")
+        parser.add_argument("--comments", type=int, default=1_000_000, help="Number of comments to seed")
+        parser.add_argument("--max-contributors", type=int, default=50, help="Largest number of contributors of a project")
+        parser.add_argument("--skew", type=float, default=1.1, help="Exponent of the Zipf distributions, 0 for uniform ones")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator, for reproducible data")
+        parser.add_argument("--prefix", default="seed", help="Prefix of the usernames and project titles")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Number of rows inserted by query")
+
+    def handle(self, *args, **options) -> None:
+        if options["users"] < 1 or options["projects"] < 1:
+            raise CommandError("At least one user and one project are needed")
+        seeder = DataSeeder(
+            options["prefix"],
+            skew=options["skew"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            max_contributors=options["max_contributors"],
+            progress=lambda message: self.stdout.write(f"  {message}") if options["verbosity"] > 1 else None,
+        )
+        start = time.perf_counter()
+        counts = seeder.seed(options["users"], options["projects"], options["issues"], options["comments"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {', '.join(f'{count} {name}' for name, count in counts.items())} "
+            f"in {time.perf_counter() - start:.1f} s"
+        ))
@@ -0,0 +1,105 @@
+from typing import Any
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest
+from rest_framework import request as drf_request
+from .caching import TieredCache
+from .models import Contributor
+
+MEMBERSHIP_ATTRIBUTE = "sd_memberships"
+
+# (contributor id, role, permission) of a member, None when the user is not a contributor of the project
+MembershipEntry = tuple[int, int, int] | None
+
+
+class MembershipCache(TieredCache):
+    """
+    Cross-request cache of the contributors role and permission, keyed by (user_id, project_id),
+    configured by `SOFTDESK_MEMBERSHIP_CACHE`.
+    Writes of Contributor and Project invalidate the entries through signals.
+    """
+
+    SETTING = "SOFTDESK_MEMBERSHIP_CACHE"
+    KEY_PREFIX = "sd_membership"
+
+    def load(self, key: tuple[int, int]) -> MembershipEntry:
+        user_id, project_id = key
+        return Contributor.objects \
+            .filter(project_id=project_id, user_id=user_id) \
+            .values_list("id", "role", "permission") \
+            .first()
+
+    def get(self, user_id: int, project_id: int) -> MembershipEntry:
+        return self.lookup((user_id, project_id))
+
+    def invalidate(self, user_id: int, project_id: int) -> None:
+        self.invalidate_keys([(user_id, project_id)])
+
+    def invalidate_project(self, project_id: int, user_ids: list[int]) -> None:
+        self.invalidate_keys(
+            [(user_id, project_id) for user_id in user_ids],
+            local_keys=[key for key in self.local_keys() if key[1] == project_id],
+        )
+
+
+membership_cache = MembershipCache()
+
+
+@receiver(setting_changed)
+def _reconfigure_membership_cache(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_MEMBERSHIP_CACHE":
+        membership_cache.configure()
+
+
+def _get_store(request: drf_request.Request | HttpRequest) -> dict[int, Contributor | None]:
+    # Stored on the underlying HttpRequest so that middlewares and the DRF request share the same copy.
+    http_request = getattr(request, "_request", request)
+    store = getattr(http_request, MEMBERSHIP_ATTRIBUTE, None)
+    if store is None:
+        store = {}
+        setattr(http_request, MEMBERSHIP_ATTRIBUTE, store)
+    return store
+
+
+def _build_membership(user_id: int, project_id: int, entry: MembershipEntry) -> Contributor | None:
+    if entry is None:
+        return None
+    contributor_id, role, permission = entry
+    return Contributor(id=contributor_id, role=role, permission=permission, user_id=user_id, project_id=project_id)
+
+
+def get_membership(request: drf_request.Request | HttpRequest, project_id: Any) -> Contributor | None:
+    """
+    Return the Contributor row of the current user for the given project, or None if the user is not a contributor.
+    The row is resolved at most once per request through the membership cache, every permission, view or validator
+    reads the same copy. Only the id, role, permission, user_id and project_id of the returned row are loaded.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    project_id = int(project_id)
+    store = _get_store(request)
+    if project_id not in store:
+        store[project_id] = _build_membership(user.pk, project_id, membership_cache.get(user.pk, project_id))
+    return store[project_id]
+
+
+async def aget_membership(request: drf_request.Request | HttpRequest, project_id: Any) -> Contributor | None:
+    """
+    Async `get_membership`, once awaited the synchronous permission checks of the request read the stored copy
+    without querying the database.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    project_id = int(project_id)
+    store = _get_store(request)
+    if project_id not in store:
+        entry = await membership_cache.alookup((user.pk, project_id))
+        store[project_id] = _build_membership(user.pk, project_id, entry)
+    return store[project_id]
+
+
+def is_project_owner(request: drf_request.Request | HttpRequest, project_id: Any) -> bool:
+    contributor = get_membership(request, project_id)
+    return contributor is not None and contributor.role == Contributor.ContributorRole.OWNER
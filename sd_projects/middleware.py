@@ -0,0 +1,76 @@
+import asyncio
+import time
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework import permissions
+from .instrumentation import get_endpoint, request_metrics
+from .routers import recent_writes
+
+
+def _get_writer_id(request):
+    """
+    Return the id of the user who sent a write request, the user being set on the request by the authentication
+    of the API view.
+    """
+    user = getattr(request, "user", None)
+    if (request.method or "").upper() in permissions.SAFE_METHODS or user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+@sync_and_async_middleware
+def read_your_writes_middleware(get_response):
+    """
+    Remember the users who sent a write, so that their next reads go to the primary, see `RecentWrites`.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def async_middleware(request):
+            response = await get_response(request)
+            writer_id = _get_writer_id(request)
+            if writer_id is not None:
+                await recent_writes.arecord(writer_id)
+            return response
+        return async_middleware
+
+    def middleware(request):
+        response = get_response(request)
+        writer_id = _get_writer_id(request)
+        if writer_id is not None:
+            recent_writes.record(writer_id)
+        return response
+    return middleware
+
+
+def _finish_request(request, response, metrics, start: float):
+    total = time.perf_counter() - start
+    request_metrics.record(get_endpoint(request), request.method or "", response.status_code, total, metrics)
+    if metrics is not None and request_metrics.server_timing:
+        response["Server-Timing"] = metrics.get_server_timing(total)
+    return response
+
+
+@sync_and_async_middleware
+def instrumentation_middleware(get_response):
+    """
+    Record the latency of every request by endpoint, and the SQL queries and the time spent in the serializers
+    and the permissions of the sampled requests, see `RequestMetricsRegistry`.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def async_middleware(request):
+            start = time.perf_counter()
+            metrics, token = request_metrics.start()
+            try:
+                response = await get_response(request)
+            finally:
+                request_metrics.stop(token)
+            return _finish_request(request, response, metrics, start)
+        return async_middleware
+
+    def middleware(request):
+        start = time.perf_counter()
+        metrics, token = request_metrics.start()
+        try:
+            response = get_response(request)
+        finally:
+            request_metrics.stop(token)
+        return _finish_request(request, response, metrics, start)
+    return middleware
@@ -0,0 +1,46 @@
+# Generated by Django 4.1.7 on 2026-10-16 23:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def create_project_versions(apps, schema_editor):
+    Project = apps.get_model('sd_projects', 'Project')
+    ProjectVersion = apps.get_model('sd_projects', 'ProjectVersion')
+    ProjectVersion.objects.bulk_create(
+        ProjectVersion(project_id=project_id) for project_id in Project.objects.values_list('id', flat=True).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sd_projects', '0007_nested_resources_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectVersion',
+            fields=[
+                ('project', models.OneToOneField(help_text='Versioned project', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='version', serialize=False, to='sd_projects.project')),
+                ('version', models.PositiveBigIntegerField(default=0, help_text='Number of writes to the project and its resources')),
+                ('updated_time', models.DateTimeField(default=django.utils.timezone.now, help_text='Date and time of the last write to the project and its resources')),
+            ],
+            options={
+                'verbose_name': 'project version',
+                'verbose_name_plural': 'project versions',
+            },
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, help_text='Date and time of the last modification of the commentary'),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, help_text='Date and time of the last modification of the issue'),
+        ),
+        migrations.RunPython(create_project_versions, migrations.RunPython.noop),
+    ]
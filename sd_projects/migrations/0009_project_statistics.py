@@ -0,0 +1,45 @@
+# Generated by Django 4.1.7 on 2026-10-16 23:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def compute_project_statistics(apps, schema_editor):
+    Issue = apps.get_model('sd_projects', 'Issue')
+    ProjectStatistics = apps.get_model('sd_projects', 'ProjectStatistics')
+    rows = Issue.objects \
+        .order_by() \
+        .values('project_id', 'status', 'tag', 'priority') \
+        .annotate(issue_count=models.Count('id', distinct=True), comment_count=models.Count('comments'))
+    ProjectStatistics.objects.bulk_create(ProjectStatistics(**row) for row in rows.iterator())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sd_projects', '0008_project_version_updated_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'todo'), (1, 'pending'), (2, 'finished')], help_text='Status of the counted issues')),
+                ('tag', models.PositiveSmallIntegerField(choices=[(0, 'bug'), (1, 'improvement'), (2, 'task')], help_text='Tag of the counted issues')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(0, 'low'), (1, 'average'), (2, 'high')], help_text='Priority of the counted issues')),
+                ('issue_count', models.IntegerField(default=0, help_text='Number of issues in the bucket')),
+                ('comment_count', models.IntegerField(default=0, help_text='Number of comments of the issues in the bucket')),
+                ('project', models.ForeignKey(help_text='Project of which the issues are counted', on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='sd_projects.project')),
+            ],
+            options={
+                'verbose_name': 'project statistics',
+                'verbose_name_plural': 'project statistics',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projectstatistics',
+            constraint=models.UniqueConstraint(models.F('project'), models.F('status'), models.F('tag'), models.F('priority'), name='unique_project_statistics_bucket'),
+        ),
+        migrations.RunPython(compute_project_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.7 on 2026-10-16 23:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('sd_projects', '0009_project_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTokenVersion',
+            fields=[
+                ('user', models.OneToOneField(help_text='User of the tokens', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='token_version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveIntegerField(default=0, help_text='Version of the valid tokens of the user')),
+                ('revoked_time', models.DateTimeField(blank=True, help_text='Date and time of the last revocation', null=True)),
+            ],
+            options={
+                'verbose_name': 'user token version',
+                'verbose_name_plural': 'user token versions',
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.1.7 on 2026-10-17 00:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sd_projects', '0010_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='Name of the imported input, its absolute path by default', max_length=255, unique=True)),
+                ('position', models.PositiveBigIntegerField(default=0, help_text='Offset in bytes of the first input line not imported yet')),
+                ('line', models.PositiveBigIntegerField(default=0, help_text='Number of input lines imported')),
+                ('row_count', models.PositiveBigIntegerField(default=0, help_text='Number of rows inserted')),
+                ('updated_time', models.DateTimeField(auto_now=True, help_text='Date and time of the last imported chunk')),
+                ('finished_time', models.DateTimeField(blank=True, help_text='Date and time of the end of the import', null=True)),
+                ('project', models.ForeignKey(help_text='Project receiving the imported rows', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='import_checkpoints', to='sd_projects.project')),
+            ],
+            options={
+                'verbose_name': 'import checkpoint',
+                'verbose_name_plural': 'import checkpoints',
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportedIssue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_id', models.CharField(help_text='Id of the issue in the input', max_length=64)),
+                ('checkpoint', models.ForeignKey(help_text='Import which inserted the issue', on_delete=django.db.models.deletion.CASCADE, related_name='issues', to='sd_projects.importcheckpoint')),
+                ('issue', models.ForeignKey(help_text='Inserted issue', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sd_projects.issue')),
+            ],
+            options={
+                'verbose_name': 'imported issue',
+                'verbose_name_plural': 'imported issues',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedissue',
+            constraint=models.UniqueConstraint(models.F('checkpoint'), models.F('source_id'), name='unique_imported_issue'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+from django.db import migrations
+
+# Full-text index of the issues and comments, for the SQLite search backend. The rowid of an issue is twice its
+# id, the one of a comment twice its id plus one. The table stores its own copy of the text, so that a row can
+# be deleted by rowid alone, whether its issue still exists or not.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE sd_projects_search USING fts5(
+        project, title, body, tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO sd_projects_search(sd_projects_search, rank) VALUES ('rank', 'bm25(0.0, 10.0, 1.0)')",
+    """
+    INSERT INTO sd_projects_search(rowid, project, title, body)
+    SELECT id * 2, 'p' || project_id, title, description FROM sd_projects_issue
+    """,
+    """
+    INSERT INTO sd_projects_search(rowid, project, title, body)
+    SELECT comment.id * 2 + 1, 'p' || issue.project_id, '', comment.description
+    FROM sd_projects_comment comment JOIN sd_projects_issue issue ON issue.id = comment.issue_id
+    """,
+    """
+    CREATE TRIGGER sd_projects_search_issue_insert AFTER INSERT ON sd_projects_issue BEGIN
+        INSERT INTO sd_projects_search(rowid, project, title, body)
+        VALUES (new.id * 2, 'p' || new.project_id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER sd_projects_search_issue_update AFTER UPDATE OF title, description, project_id ON sd_projects_issue
+    WHEN old.title IS NOT new.title OR old.description IS NOT new.description OR old.project_id IS NOT new.project_id
+    BEGIN
+        UPDATE sd_projects_search SET project = 'p' || new.project_id, title = new.title, body = new.description
+        WHERE rowid = new.id * 2;
+        UPDATE sd_projects_search SET project = 'p' || new.project_id
+        WHERE old.project_id IS NOT new.project_id
+        AND rowid IN (SELECT id * 2 + 1 FROM sd_projects_comment WHERE issue_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER sd_projects_search_issue_delete AFTER DELETE ON sd_projects_issue BEGIN
+        DELETE FROM sd_projects_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER sd_projects_search_comment_insert AFTER INSERT ON sd_projects_comment BEGIN
+        INSERT INTO sd_projects_search(rowid, project, title, body)
+        VALUES (new.id * 2 + 1, (SELECT 'p' || project_id FROM sd_projects_issue WHERE id = new.issue_id), '', new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER sd_projects_search_comment_update AFTER UPDATE OF description, issue_id ON sd_projects_comment
+    WHEN old.description IS NOT new.description OR old.issue_id IS NOT new.issue_id
+    BEGIN
+        UPDATE sd_projects_search
+        SET project = (SELECT 'p' || project_id FROM sd_projects_issue WHERE id = new.issue_id), body = new.description
+        WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER sd_projects_search_comment_delete AFTER DELETE ON sd_projects_comment BEGIN
+        DELETE FROM sd_projects_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+DROP_SQL = [
+    *(
+        f"DROP TRIGGER IF EXISTS sd_projects_search_{model}_{event}"
+        for model in ("issue", "comment")
+        for event in ("insert", "update", "delete")
+    ),
+    "DROP TABLE IF EXISTS sd_projects_search",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            # The other databases are searched by the LIKE backend
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sd_projects', '0011_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_SQL), run(DROP_SQL)),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -29,6 +30,21 @@ Type of the project
         verbose_name_plural = _("projects")
 
 
+class ProjectVersion(models.Model):
+    """
+    Counter bumped on every write to a project or to its contributors, issues and comments.
+    Kept apart from Project so that saving a Project instance never writes back a stale counter.
+    """
+
+    project = models.OneToOneField(Project, primary_key=True, related_name='version', on_delete=models.CASCADE, help_text="Versioned project")
+    version = models.PositiveBigIntegerField(default=0, help_text="Number of writes to the project and its resources")
+    updated_time = models.DateTimeField(default=timezone.now, help_text="Date and time of the last write to the project and its resources")
+
+    class Meta:
+        verbose_name = _("project version")
+        verbose_name_plural = _("project versions")
+
+
 class Contributor(models.Model):
 
     class ContributorPermission(models.IntegerChoices):
@@ -59,6 +75,10 @@ Role of the contributor for the project
         verbose_name = _("contributor")
         verbose_name_plural = _("contributors")
         constraints = [models.constraints.UniqueConstraint('user', 'project', name='unique_user_project')]
+        indexes = [
+            # Covers the membership lookup (id, role, permission) without reading the table
+            models.Index(fields=['user', 'project', 'role', 'permission'], name='contributor_membership_idx'),
+        ]
 
 
 class Issue(models.Model):
@@ -80,6 +100,7 @@ class Issue(models.Model):
     title = models.CharField(max_length=50, help_text="Title of the issue")
     description = models.CharField(max_length=320, help_text="Short description of the issue")
     created_time = models.DateTimeField(auto_now_add=True, help_text="Date and time of creation of the issue")
+    updated_time = models.DateTimeField(auto_now=True, help_text="Date and time of the last modification of the issue")
 
     status = models.PositiveSmallIntegerField(choices=IssueStatus.choices, help_text="""
 Status of the issue
@@ -104,18 +125,104 @@ Priority of the issue
     assigned = models.ForeignKey(User, related_name='assigned_issues', on_delete=models.SET_NULL, null=True, help_text="Contributor assigned to solving the issue", default=None)
     author = models.ForeignKey(User, related_name='created_issues', on_delete=models.CASCADE, help_text="Author of the issue")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the loaded values so that the statistics can tell which bucket an updated issue leaves
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     class Meta:
         verbose_name = _("issue")
         verbose_name_plural = _("issues")
+        indexes = [
+            models.Index(fields=['project', 'created_time', 'id'], name='issue_project_created_idx'),
+            models.Index(fields=['project', 'status', 'priority'], name='issue_project_status_idx'),
+        ]
 
 
 class Comment(models.Model):
 
     description = models.CharField(max_length=320, help_text="Short commentary content")
     created_time = models.DateTimeField(auto_now_add=True, help_text="Date and time of creation of the commentary")
+    updated_time = models.DateTimeField(auto_now=True, help_text="Date and time of the last modification of the commentary")
     author = models.ForeignKey(User, related_name='comments', on_delete=models.CASCADE, help_text="Author of the commentary")
     issue = models.ForeignKey(Issue, related_name='comments', on_delete=models.CASCADE, help_text="Issue to which this commentary is mapped")
 
     class Meta:
         verbose_name = _("comment")
         verbose_name_plural = _("comments")
+        indexes = [
+            models.Index(fields=['issue', 'created_time', 'id'], name='comment_issue_created_idx'),
+        ]
+
+
+class ProjectStatistics(models.Model):
+    """
+    Denormalized counters of the issues of a project and of their comments, one row per (status, tag, priority) bucket.
+    Kept up to date by signals on Issue and Comment, the management command rebuild_statistics recomputes them.
+    """
+
+    project = models.ForeignKey(Project, related_name='statistics', on_delete=models.CASCADE, help_text="Project of which the issues are counted")
+    status = models.PositiveSmallIntegerField(choices=Issue.IssueStatus.choices, help_text="Status of the counted issues")
+    tag = models.PositiveSmallIntegerField(choices=Issue.IssueTag.choices, help_text="Tag of the counted issues")
+    priority = models.PositiveSmallIntegerField(choices=Issue.IssuePriority.choices, help_text="Priority of the counted issues")
+    issue_count = models.IntegerField(default=0, help_text="Number of issues in the bucket")
+    comment_count = models.IntegerField(default=0, help_text="Number of comments of the issues in the bucket")
+
+    class Meta:
+        verbose_name = _("project statistics")
+        verbose_name_plural = _("project statistics")
+        constraints = [
+            models.constraints.UniqueConstraint('project', 'status', 'tag', 'priority', name='unique_project_statistics_bucket'),
+        ]
+
+
+class UserTokenVersion(models.Model):
+    """
+    Revocation list of the JSON web tokens, the tokens of a user issued with a lower version are rejected.
+    A user without a row is at version 0.
+    """
+
+    user = models.OneToOneField(User, primary_key=True, related_name='token_version', on_delete=models.CASCADE, help_text="User of the tokens")
+    version = models.PositiveIntegerField(default=0, help_text="Version of the valid tokens of the user")
+    revoked_time = models.DateTimeField(null=True, blank=True, help_text="Date and time of the last revocation")
+
+    class Meta:
+        verbose_name = _("user token version")
+        verbose_name_plural = _("user token versions")
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of an import_project run, saved in the transaction of each imported chunk so that an interrupted
+    import resumes right after the last committed one.
+    """
+
+    source = models.CharField(max_length=255, unique=True, help_text="Name of the imported input, its absolute path by default")
+    project = models.ForeignKey(Project, related_name='import_checkpoints', on_delete=models.CASCADE, null=True, help_text="Project receiving the imported rows")
+    position = models.PositiveBigIntegerField(default=0, help_text="Offset in bytes of the first input line not imported yet")
+    line = models.PositiveBigIntegerField(default=0, help_text="Number of input lines imported")
+    row_count = models.PositiveBigIntegerField(default=0, help_text="Number of rows inserted")
+    updated_time = models.DateTimeField(auto_now=True, help_text="Date and time of the last imported chunk")
+    finished_time = models.DateTimeField(null=True, blank=True, help_text="Date and time of the end of the import")
+
+    class Meta:
+        verbose_name = _("import checkpoint")
+        verbose_name_plural = _("import checkpoints")
+
+
+class ImportedIssue(models.Model):
+    """
+    Issue inserted by an import, by its id in the input, so that the comments find the issue they belong to.
+    Dropped once the import is finished.
+    """
+
+    checkpoint = models.ForeignKey(ImportCheckpoint, related_name='issues', on_delete=models.CASCADE, help_text="Import which inserted the issue")
+    source_id = models.CharField(max_length=64, help_text="Id of the issue in the input")
+    issue = models.ForeignKey(Issue, related_name='+', on_delete=models.CASCADE, help_text="Inserted issue")
+
+    class Meta:
+        verbose_name = _("imported issue")
+        verbose_name_plural = _("imported issues")
+        constraints = [models.constraints.UniqueConstraint('checkpoint', 'source_id', name='unique_imported_issue')]
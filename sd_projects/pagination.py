@@ -0,0 +1,240 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from rest_framework import filters, pagination, request as drf_request, response
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(pagination.BasePagination):
+    """
+    Keyset (seek) pagination over a unique ordering.
+
+    The cursor carries the ordering values of the last row of a page, the next page is then fetched with
+    a `WHERE (a, b) > (x, y)` condition, so deep pages cost as much as the first one, unlike OFFSET.
+    The primary key is appended to the ordering so that no row is skipped nor repeated, and the ordered
+    fields must not be nullable.
+    """
+
+    ordering: tuple[str, ...] = ("id",)
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    page_size_query_param = "page_size"
+    page_size_query_description = _("Number of results to return per page.")
+    invalid_cursor_message = _("Invalid cursor")
+
+    @property
+    def page_size(self) -> int:
+        return getattr(settings, "SOFTDESK_PAGE_SIZE", 50)
+
+    @property
+    def max_page_size(self) -> int:
+        return getattr(settings, "SOFTDESK_MAX_PAGE_SIZE", 500)
+
+    def get_page_queryset(self, queryset: models.QuerySet, request: drf_request.Request, view=None) -> models.QuerySet:
+        """
+        Return the queryset of the requested page, with one more row telling whether a following page exists.
+        """
+        self.start_page(request, self.get_ordering(request, queryset, view), queryset.model)
+        queryset = queryset.order_by(*(
+            self.flip(field) if self.reverse else field for field in self.current_ordering
+        ))
+        if self.position is not None:
+            queryset = queryset.filter(self.get_seek_filter(self.position, self.reverse))
+        return queryset[:self.page_size_value + 1]
+
+    def start_page(self, request: drf_request.Request, ordering: tuple[str, ...],
+                   model: type[models.Model] | None = None) -> None:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size_value = self.get_page_size(request)
+        self.current_ordering = ordering
+        self.position, self.reverse = self.decode_cursor(request, model)
+
+    def set_page(self, results: list[Any]) -> list[Any]:
+        has_following = len(results) > self.page_size_value
+        self.page = results[:self.page_size_value]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_following
+        else:
+            self.has_next, self.has_previous = has_following, self.position is not None
+        return self.page
+
+    def paginate_queryset(self, queryset: models.QuerySet, request: drf_request.Request, view=None) -> list[Any] | None:
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset: models.QuerySet, request: drf_request.Request, view=None) -> list[Any] | None:
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in queryset.aiterator()])
+
+    def get_ordering(self, request: drf_request.Request, queryset: models.QuerySet, view=None) -> tuple[str, ...]:
+        """
+        Use the ordering requested through an OrderingFilter of the view if any, then `ordering`.
+        The primary key always ends the ordering so that it is unique.
+        """
+        ordering: tuple[str, ...] = self.ordering
+        for filter_cls in getattr(view, "filter_backends", []):
+            if issubclass(filter_cls, filters.OrderingFilter):
+                requested = filter_cls().get_ordering(request, queryset, view)
+                if requested:
+                    ordering = tuple(requested)
+                break
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering += ("-id",) if ordering and ordering[-1].startswith("-") else ("id",)
+        return ordering
+
+    @staticmethod
+    def flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def get_page_size(self, request: drf_request.Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_seek_filter(self, position: tuple[Any, ...], reverse: bool) -> models.Q:
+        """
+        Expand the row value comparison `(f1, f2, ...) > (v1, v2, ...)` into an index friendly condition,
+        the comparison of each field follows its direction.
+        """
+        seek = models.Q()
+        for index in reversed(range(len(self.current_ordering))):
+            field = self.current_ordering[index]
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            condition = models.Q(**{f"{name}__{lookup}": position[index]})
+            if len(seek):
+                condition |= models.Q(**{name: position[index]}) & seek
+            seek = condition
+        return seek
+
+    def decode_cursor(self, request: drf_request.Request,
+                      model: type[models.Model] | None = None) -> tuple[tuple[Any, ...] | None, bool]:
+        """
+        Return the position and the direction of the requested cursor. The position holds a value for each field of
+        the ordering, converted by the field of `model` when given, and none of them is null.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")).decode("ascii"))
+            values = payload["p"]
+            if not isinstance(values, list) or tuple(payload["o"]) != self.current_ordering:
+                raise ValueError("Cursor does not match the ordering")
+            if len(values) != len(self.current_ordering):
+                raise ValueError("Cursor does not match the ordering")
+            if model is not None:
+                values = [self.to_python(model, field, value) for field, value in zip(self.current_ordering, values)]
+            if any(value is None for value in values):
+                raise ValueError("Cursor holds a null value")
+            return tuple(values), bool(payload.get("r", False))
+        except (TypeError, ValueError, KeyError, UnicodeError, AttributeError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def to_python(model: type[models.Model], field: str, value: Any) -> Any:
+        name = field.lstrip("-")
+        model_field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        return model_field.to_python(value)
+
+    def encode_cursor(self, obj: models.Model, reverse: bool) -> str:
+        values = []
+        for field in self.current_ordering:
+            value = getattr(obj, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = json.dumps({"p": values, "o": self.current_ordering, "r": reverse}, separators=(",", ":"))
+        encoded = urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data) -> response.Response:
+        return response.Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.page_size_query_description),
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class CreatedTimeCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination in creation order, used by issues and comments.
+    """
+    ordering = ("created_time", "id")
+
+
+class IdCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination in insertion order, used by projects and contributors.
+    """
+    ordering = ("id",)
+
+
+class SearchCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination of the ranked search hits, the cursor carries the rank and the key of the last hit.
+    """
+    ordering = ("rank", "key")
+
+    def paginate_search(self, search: Callable[[tuple[Any, ...] | None, bool, int], list[Any]],
+                        request: drf_request.Request, view=None) -> list[Any]:
+        """
+        Return the hits of the requested page, `search` being called with the cursor position, its direction
+        and the number of hits to return.
+        """
+        self.start_page(request, self.ordering)
+        if self.position is not None and not (
+            len(self.position) == 2 and all(isinstance(value, (int, float)) for value in self.position)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return self.set_page(search(self.position, self.reverse, self.page_size_value + 1))
@@ -0,0 +1,23 @@
+import codecs
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from .renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson when it is installed, and any other body with the standard
+    library. Like the strict JSON of DRF, orjson rejects NaN and the infinities.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
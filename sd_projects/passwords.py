@@ -0,0 +1,123 @@
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+from django.conf import settings
+from django.contrib.auth import hashers, password_validation
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import exceptions
+
+T = TypeVar("T")
+
+
+def get_hashing_config(name: str) -> dict[str, Any]:
+    return getattr(settings, "SOFTDESK_PASSWORD_HASHING", {}).get(name, {})
+
+
+class TunedScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    Scrypt hasher with the cost parameters of `SOFTDESK_PASSWORD_HASHING["SCRYPT"]`.
+    Hashes made with other parameters are upgraded on the next login of their user.
+    """
+
+    @property
+    def work_factor(self) -> int:  # type: ignore[override]
+        return get_hashing_config("SCRYPT").get("WORK_FACTOR", 2 ** 14)
+
+    @property
+    def block_size(self) -> int:  # type: ignore[override]
+        return get_hashing_config("SCRYPT").get("BLOCK_SIZE", 8)
+
+    @property
+    def parallelism(self) -> int:  # type: ignore[override]
+        return get_hashing_config("SCRYPT").get("PARALLELISM", 1)
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id hasher with the cost parameters of `SOFTDESK_PASSWORD_HASHING["ARGON2"]`, requires argon2-cffi.
+    """
+
+    @property
+    def time_cost(self) -> int:  # type: ignore[override]
+        return get_hashing_config("ARGON2").get("TIME_COST", 2)
+
+    @property
+    def memory_cost(self) -> int:  # type: ignore[override]
+        return get_hashing_config("ARGON2").get("MEMORY_COST", 19456)
+
+    @property
+    def parallelism(self) -> int:  # type: ignore[override]
+        return get_hashing_config("ARGON2").get("PARALLELISM", 1)
+
+
+@functools.lru_cache(maxsize=None)
+def load_password_list(path: Path) -> frozenset[str]:
+    validator = password_validation.CommonPasswordValidator(path)
+    return frozenset(validator.passwords)
+
+
+class CachedCommonPasswordValidator(password_validation.CommonPasswordValidator):
+    """
+    CommonPasswordValidator reading its password list once per process, whatever the number of instances.
+    """
+
+    def __init__(self, password_list_path=password_validation.CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH):
+        if password_list_path is password_validation.CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH:
+            password_list_path = self.DEFAULT_PASSWORD_LIST_PATH
+        self.passwords = load_password_list(Path(password_list_path))
+
+
+def preload_password_validators() -> None:
+    """
+    Instantiate the validators of AUTH_PASSWORD_VALIDATORS, so that the first registration does not pay for
+    loading the common passwords list.
+    """
+    password_validation.get_default_password_validators()
+
+
+class HashingPool:
+    """
+    Bounded pool of threads hashing the passwords, configured by `SOFTDESK_PASSWORD_HASHING`.
+
+    With a `POOL_SIZE` of 0 the passwords are hashed by the calling thread. Otherwise at most `POOL_SIZE`
+    passwords are hashed at once, `POOL_QUEUE` more wait for a thread and the others are throttled after
+    waiting `POOL_TIMEOUT` seconds, so that a burst of registrations leaves CPU time to the other endpoints.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.configure()
+
+    def configure(self) -> None:
+        config = getattr(settings, "SOFTDESK_PASSWORD_HASHING", {})
+        size = config.get("POOL_SIZE", 0)
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(size, thread_name_prefix="sd-hashing") if size else None
+            self._slots = threading.BoundedSemaphore(size + config.get("POOL_QUEUE", size)) if size else None
+            self.timeout: float = config.get("POOL_TIMEOUT", 5)
+
+    def run(self, func: Callable[..., T], *args: Any) -> T:
+        executor, slots = self._executor, self._slots
+        if executor is None or slots is None:
+            return func(*args)
+        if not slots.acquire(timeout=self.timeout):
+            raise exceptions.Throttled(wait=self.timeout, detail="Too many passwords are being hashed, retry later.")
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            slots.release()
+
+
+hashing_pool = HashingPool()
+
+
+@receiver(setting_changed)
+def _reconfigure_hashing_pool(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_PASSWORD_HASHING":
+        hashing_pool.configure()
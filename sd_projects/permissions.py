@@ -1,5 +1,7 @@
 from typing import Any
+from django.conf import settings
 from .models import (Contributor, Issue, Comment, User)
+from .membership import (get_membership, is_project_owner)
 from rest_framework import (views, permissions, request)
 
 
@@ -10,13 +12,7 @@ class IsContributor(permissions.BasePermission):
 
     def has_permission(self, request: request.Request, view: views.APIView) -> bool:
         if "project_id" in view.kwargs:
-            try:
-                _ = Contributor.objects.get(
-                    project_id=view.kwargs["project_id"],
-                    user=request.user  # type: ignore
-                )
-            except Contributor.DoesNotExist:
-                return False
+            return get_membership(request, view.kwargs["project_id"]) is not None
         return True
 
 
@@ -28,14 +24,7 @@ class IsProjectOwnerEdit(permissions.BasePermission):
     def has_object_permission(self, request: request.Request, view: views.APIView, _: Any) -> bool:
         if "project_id" in view.kwargs:
             if (request.method or "").upper() in ["PATCH", "PUT", "DELETE"]:
-                try:
-                    contributor = Contributor.objects.get(
-                        project_id=view.kwargs["project_id"],
-                        user=request.user  # type: ignore
-                    )
-                except Contributor.DoesNotExist:
-                    return False
-                return contributor.role == Contributor.ContributorRole.OWNER
+                return is_project_owner(request, view.kwargs["project_id"])
         return True
 
 
@@ -48,14 +37,7 @@ class IsProjectOwnerCreate(permissions.BasePermission):
     def has_permission(self, request: request.Request, view: views.APIView) -> bool:
         if "project_id" in view.kwargs:
             if (request.method or "").upper() == "POST":
-                try:
-                    contributor = Contributor.objects.get(
-                        project_id=view.kwargs["project_id"],
-                        user=request.user  # type: ignore
-                    )
-                except Contributor.DoesNotExist:
-                    return False
-                return contributor.role == Contributor.ContributorRole.OWNER
+                return is_project_owner(request, view.kwargs["project_id"])
         return True
 
 
@@ -68,18 +50,10 @@ class IsProjectOwnerOrSelf(permissions.BasePermission):
     def has_object_permission(self, request: request.Request, view: views.APIView, obj: Contributor | User) -> bool:
         if request.method in ["PUT", "PATCH", "DELETE"]:
             if "project_id" in view.kwargs:
-                if isinstance(obj, Contributor):
-                    obj = obj.user
-                if obj == request.user and request.method == "DELETE":
+                user_id = obj.user_id if isinstance(obj, Contributor) else obj.pk
+                if user_id == request.user.pk and request.method == "DELETE":
                     return True
-                try:
-                    contributor = Contributor.objects.get(
-                        project_id=view.kwargs["project_id"],
-                        user=request.user  # type: ignore
-                    )
-                except Contributor.DoesNotExist:
-                    return False
-                return contributor.role == Contributor.ContributorRole.OWNER
+                return is_project_owner(request, view.kwargs["project_id"])
         return True
 
 
@@ -90,14 +64,21 @@ class IsProjectOwnerOrAuthor(permissions.BasePermission):
 
     def has_object_permission(self, request: request.Request, view: views.APIView, obj: Issue | Comment) -> bool:
         if request.method in ["PUT", "PATCH", "DELETE"]:
-            if obj.author == request.user:
+            if obj.author_id == request.user.pk:
                 return True
-            try:
-                contributor = Contributor.objects.get(
-                    project_id=view.kwargs["project_id"],
-                    user=obj.author  # type: ignore
-                )
-            except Contributor.DoesNotExist:
-                return False
-            return contributor.role == Contributor.ContributorRole.OWNER
+            return is_project_owner(request, view.kwargs["project_id"])
         return True
+
+
+class IsMetricsScraper(permissions.BasePermission):
+    """
+    This permit the staff users, and the clients of which the address is listed by `SOFTDESK_METRICS['ALLOWED_IPS']`
+    such as a Prometheus server, to read the metrics. The address is the one of the connection, which is the one
+    of the reverse proxy for every request it forwards: a proxy must never be listed.
+    """
+
+    def has_permission(self, request: request.Request, view: views.APIView) -> bool:
+        if request.user and request.user.is_staff:
+            return True
+        allowed_ips = getattr(settings, "SOFTDESK_METRICS", {}).get("ALLOWED_IPS", [])
+        return request.META.get("REMOTE_ADDR") in allowed_ips
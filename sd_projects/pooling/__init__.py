@@ -0,0 +1,304 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+from django.db import OperationalError
+from django.utils.module_loading import import_string
+
+DEFAULT_POOL_CLASS = "sd_projects.pooling.ConnectionPool"
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    At most `max_size` connections are open at once, a thread asking for one more waits up to `timeout` seconds
+    for another one to be released. Idle connections are closed after `max_idle` seconds, and any connection
+    after `max_lifetime` seconds, while `min_size` of them are kept open. A connection idle for more than
+    `check_idle` seconds is checked with `check` before being handed out again, `reset` prepares a released
+    connection for its next user and tells whether it can be kept.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        check: Callable[[Any], bool] | None = None,
+        reset: Callable[[Any], bool] | None = None,
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        check_idle: float = 30.0,
+    ) -> None:
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+        # Pools inherited by a forked worker are not used, their connections belong to the parent process
+        self.pid = os.getpid()
+        self._condition = threading.Condition()
+        # (connection, creation time, release time), the most recently released last
+        self._idle: deque[tuple[Any, float, float]] = deque()
+        self._created: dict[int, float] = {}
+        self.size = 0
+        self.waiting = 0
+        self.requests = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.opened = 0
+        self.closed = 0
+
+    def _discard(self, connection: Any) -> None:
+        with self._condition:
+            self._created.pop(id(connection), None)
+            self.size -= 1
+            self.closed += 1
+            self._condition.notify()
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _open(self) -> Any:
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._condition:
+                self.size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created[id(connection)] = time.monotonic()
+            self.opened += 1
+        return connection
+
+    def acquire(self) -> Any:
+        """
+        Hand out an idle connection, the most recently released first, or open a new one while below `max_size`.
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        with self._condition:
+            self.requests += 1
+            waited = False
+            while True:
+                now = time.monotonic()
+                if self._idle:
+                    connection, created, released = self._idle.pop()
+                    if now - created > self.max_lifetime or now - released > self.max_idle:
+                        self._condition.release()
+                        try:
+                            self._discard(connection)
+                        finally:
+                            self._condition.acquire()
+                        continue
+                    break
+                if self.size < self.max_size:
+                    self.size += 1
+                    connection = None
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    self.timeouts += 1
+                    self.wait_time += now - start
+                    raise PoolTimeout(f"No database connection available after {self.timeout} seconds")
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                self.waiting += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.wait_time += time.monotonic() - start
+        if connection is None:
+            return self._open()
+        if self.check is not None and now - released > self.check_idle and not self.check(connection):
+            self._discard(connection)
+            return self.acquire()
+        return connection
+
+    def release(self, connection: Any, discard: bool = False) -> None:
+        """
+        Give a connection back, it is closed instead when discarded, expired, or refused by `reset`.
+        """
+        now = time.monotonic()
+        created = self._created.get(id(connection))
+        if created is None:
+            # Opened by a pool since replaced, e.g. in the parent of a forked worker
+            connection.close()
+            return
+        if discard or now - created > self.max_lifetime:
+            self._discard(connection)
+            return
+        try:
+            usable = self.reset is None or self.reset(connection)
+        except Exception:
+            usable = False
+        if not usable:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, created, now))
+            self._condition.notify()
+
+    def prune(self) -> None:
+        """
+        Close the idle connections past `max_idle` or `max_lifetime`, keeping `min_size` connections open.
+        """
+        now = time.monotonic()
+        expired = []
+        with self._condition:
+            kept: deque[tuple[Any, float, float]] = deque()
+            for entry in self._idle:
+                connection, created, released = entry
+                if self.size - len(expired) > self.min_size and (
+                    now - created > self.max_lifetime or now - released > self.max_idle
+                ):
+                    expired.append(connection)
+                else:
+                    kept.append(entry)
+            self._idle = kept
+        for connection in expired:
+            self._discard(connection)
+
+    def close(self) -> None:
+        with self._condition:
+            idle, self._idle = self._idle, deque()
+        for connection, _, _ in idle:
+            self._discard(connection)
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": self.size - len(self._idle),
+                "max_size": self.max_size,
+                "utilization": (self.size - len(self._idle)) / self.max_size if self.max_size else 0.0,
+                "waiting": self.waiting,
+                "requests": self.requests,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_time": self.wait_time,
+                "opened": self.opened,
+                "closed": self.closed,
+            }
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, config: dict[str, Any], connect: Callable[[], Any],
+             check: Callable[[Any], bool] | None = None, reset: Callable[[Any], bool] | None = None) -> ConnectionPool:
+    """
+    Return the pool of the connections of a database alias in this process, created on first use from the
+    `POOL` entry of its OPTIONS.
+    """
+    pool = _pools.get(alias)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None or pool.pid != os.getpid():
+            pool_class = import_string(config.get("CLASS", DEFAULT_POOL_CLASS))
+            pool = pool_class(
+                connect,
+                check=check,
+                reset=reset,
+                **{option.lower(): value for option, value in config.items() if option != "CLASS"},
+            )
+            _pools[alias] = pool
+        return pool
+
+
+def close_pool(alias: str) -> None:
+    """
+    Close the idle connections of the pool of a database alias and forget it, the next connection creates a new one.
+    """
+    with _pools_lock:
+        pool = _pools.pop(alias, None)
+    if pool is not None:
+        pool.close()
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """
+    Return the utilization of the connection pools of this process, by database alias.
+    """
+    return {alias: pool.stats() for alias, pool in list(_pools.items()) if pool.pid == os.getpid()}
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Take the connections of a database wrapper from the ConnectionPool configured by the `POOL` entry of its
+    OPTIONS, and give them back when Django closes them, e.g. at the end of each request with a CONN_MAX_AGE
+    of 0. Without a `POOL` entry the wrapper connects as usual.
+    """
+
+    connection_pool: ConnectionPool | None = None
+
+    def get_connection_params(self) -> dict[str, Any]:
+        params = super().get_connection_params()  # type: ignore[misc]
+        params.pop("POOL", None)
+        return params
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> Any:
+        config = self.settings_dict["OPTIONS"].get("POOL")  # type: ignore[attr-defined]
+        if not config:
+            self.connection_pool = None
+            return super().get_new_connection(conn_params)  # type: ignore[misc]
+        connect = super().get_new_connection  # type: ignore[misc]
+        self.connection_pool = get_pool(
+            self.alias,  # type: ignore[attr-defined]
+            config,
+            lambda: connect(conn_params),
+            check=self.check_pooled_connection,
+            reset=self.reset_pooled_connection,
+        )
+        connection = self.connection_pool.acquire()
+        self.prepare_pooled_connection(connection)
+        return connection
+
+    def check_pooled_connection(self, connection: Any) -> bool:
+        """
+        Tell whether an idle connection still works.
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def reset_pooled_connection(self, connection: Any) -> bool:
+        """
+        Roll back what a released connection left pending, return False when it cannot be reused.
+        """
+        connection.rollback()
+        return True
+
+    def prepare_pooled_connection(self, connection: Any) -> None:
+        pass
+
+    def _close(self) -> None:
+        pool = self.connection_pool
+        if pool is None or self.connection is None:  # type: ignore[attr-defined]
+            return super()._close()  # type: ignore[misc]
+        self.connection_pool = None
+        with self.wrap_database_errors:  # type: ignore[attr-defined]
+            # Closed within an atomic block, the connection is still referenced until the block exits
+            pool.release(self.connection, discard=self.in_atomic_block)  # type: ignore[attr-defined]
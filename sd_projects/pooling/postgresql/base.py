@@ -0,0 +1,24 @@
+from typing import Any
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+from .. import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    PostgreSQL backend taking its connections from a pool, see PooledDatabaseWrapperMixin.
+    """
+
+    def reset_pooled_connection(self, connection: Any) -> bool:
+        if connection.closed:
+            return False
+        status = connection.get_transaction_status()
+        if status in (extensions.TRANSACTION_STATUS_INTRANS, extensions.TRANSACTION_STATUS_INERROR):
+            connection.rollback()
+            return True
+        # A query still running or a lost connection
+        return status == extensions.TRANSACTION_STATUS_IDLE
+
+    def prepare_pooled_connection(self, connection: Any) -> None:
+        # Set by the wrapper opening the connection, which may be the one of another thread
+        self.isolation_level = self.settings_dict["OPTIONS"].get("isolation_level", connection.isolation_level)
@@ -0,0 +1,15 @@
+from typing import Any
+from sd_projects.sqlite import base
+from .. import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    Tuned SQLite backend taking its connections from a pool, see PooledDatabaseWrapperMixin. Opening a SQLite
+    database is cheap, this backend mostly lets the pool be tried and benchmarked without a PostgreSQL server.
+    """
+
+    def reset_pooled_connection(self, connection: Any) -> bool:
+        if connection.in_transaction:
+            connection.rollback()
+        return True
@@ -0,0 +1,61 @@
+from typing import Any
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Converts what orjson does not natively, e.g. lazy translations and Decimal, the way DRF's encoder does
+_encoder = encoders.JSONEncoder()
+
+# Dates and times are passed to the encoder so that they are rendered as DRF renders them
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Encode data to compact UTF-8 JSON, with orjson when installed, as the JSONRenderer of DRF would.
+    """
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. an integer above 64 bits, which the standard library encodes
+            pass
+        else:
+            # Escaped by DRF, as they end a line in JavaScript
+            if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+                content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+            return content
+    return renderers.JSONRenderer().render(data)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed, and with the standard library otherwise or when an
+    indentation is requested. The lazy translations, Decimal and dates and times are rendered as DRF renders them.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or "", renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """
+    Render the text of the Prometheus exposition format, and the detail of the errors.
+    """
+
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and "detail" in data:
+            data = data["detail"]
+        return str(data).encode(self.charset)
@@ -0,0 +1,43 @@
+from typing import Any
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from .caching import TieredCache
+
+
+class ResponseCache(TieredCache):
+    """
+    Cross-request cache of the rendered issue and comment lists and details, configured by
+    `SOFTDESK_RESPONSE_CACHE`, as (content type, body) entries.
+    The keys hold the version of the project, bumped by any write to its contributors, issues or comments, so that
+    a write leaves the previous entries of the project behind instead of deleting them. Only the bytes are shared,
+    the permissions are still checked for each request.
+    """
+
+    SETTING = "SOFTDESK_RESPONSE_CACHE"
+    KEY_PREFIX = "sd_response"
+    DEFAULT_MAX_SIZE = 1000
+    DEFAULT_TTL = 300
+
+    def configure(self) -> None:
+        super().configure()
+        with self._lock:
+            self.bytes_saved = 0
+
+    def record_hit(self, entry: tuple[str, bytes]) -> None:
+        with self._lock:
+            self.bytes_saved += len(entry[1])
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["bytes_saved"] = self.bytes_saved
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+@receiver(setting_changed)
+def _reconfigure_response_cache(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_RESPONSE_CACHE":
+        response_cache.configure()
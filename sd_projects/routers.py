@@ -0,0 +1,143 @@
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS
+from django.dispatch import receiver
+
+# Whether the reads of the current request or task go to the replicas
+_replica_reads: ContextVar[bool] = ContextVar("sd_replica_reads", default=False)
+
+
+def get_replicas() -> list[str]:
+    return getattr(settings, "SOFTDESK_DB_REPLICAS", [])
+
+
+def start_replica_reads() -> Token:
+    """
+    Route the following reads to the replicas, until `stop_replica_reads` is given the returned token.
+    """
+    return _replica_reads.set(True)
+
+
+def stop_replica_reads(token: Token) -> None:
+    _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """
+    Route the reads of the block to the primary, e.g. to load what is cached across requests.
+    """
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send the reads made between `start_replica_reads` and `stop_replica_reads` to one of the replicas of
+    `SOFTDESK_DB_REPLICAS` picked at random, and every other query to the primary `default` database.
+    The replicas are kept up to date outside of Django, they accept the migrations so that a copy of the primary
+    can stand in for one.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        replicas = get_replicas()
+        if replicas and _replica_reads.get():
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class RecentWrites:
+    """
+    Users who sent a write within the last `WINDOW` seconds of `SOFTDESK_READ_YOUR_WRITES`, of which the reads
+    stay on the primary so that they see their own writes despite the replication lag.
+    The writes are remembered by this process, and by the Django cache backend named by `BACKEND` when the worker
+    processes share one.
+    """
+
+    SETTING = "SOFTDESK_READ_YOUR_WRITES"
+    KEY_PREFIX = "sd_recent_write"
+    DEFAULT_WINDOW = 5
+    MAX_SIZE = 10000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._writes: dict[Any, float] = {}
+        self.configure()
+
+    def configure(self) -> None:
+        config = getattr(settings, self.SETTING, {})
+        with self._lock:
+            self.window: float = config.get("WINDOW", self.DEFAULT_WINDOW)
+            self.backend_alias: str | None = config.get("BACKEND")
+            self._writes.clear()
+
+    @property
+    def backend(self):
+        return caches[self.backend_alias] if self.backend_alias else None
+
+    def make_key(self, user_id: Any) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}"
+
+    def _record_local(self, user_id: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._writes) >= self.MAX_SIZE:
+                self._writes = {user: expiry for user, expiry in self._writes.items() if expiry > now}
+            self._writes[user_id] = now + self.window
+
+    def _is_recent_local(self, user_id: Any) -> bool:
+        with self._lock:
+            return self._writes.get(user_id, 0.0) > time.monotonic()
+
+    def record(self, user_id: Any) -> None:
+        self._record_local(user_id)
+        backend = self.backend
+        if backend is not None:
+            backend.set(self.make_key(user_id), True, math.ceil(self.window))
+
+    async def arecord(self, user_id: Any) -> None:
+        self._record_local(user_id)
+        backend = self.backend
+        if backend is not None:
+            await backend.aset(self.make_key(user_id), True, math.ceil(self.window))
+
+    def is_recent(self, user_id: Any) -> bool:
+        if self._is_recent_local(user_id):
+            return True
+        backend = self.backend
+        return backend is not None and backend.get(self.make_key(user_id), False)
+
+    async def ais_recent(self, user_id: Any) -> bool:
+        if self._is_recent_local(user_id):
+            return True
+        backend = self.backend
+        return backend is not None and await backend.aget(self.make_key(user_id), False)
+
+
+recent_writes = RecentWrites()
+
+
+@receiver(setting_changed)
+def _reconfigure_recent_writes(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_READ_YOUR_WRITES":
+        recent_writes.configure()
@@ -0,0 +1,230 @@
+import re
+from functools import lru_cache
+from typing import Any, NamedTuple
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections, models
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from .caching import TieredCache
+from .models import Comment, Issue
+
+SEARCH_TABLE = "sd_projects_search"
+MAX_TERMS = 16
+# Below this number of documents every term is ranked
+STOP_MIN_DOCUMENTS = 1000
+
+_TERM_PATTERN = re.compile(r"(\w+)(\*?)")
+
+
+class SearchTerm(NamedTuple):
+    text: str
+    # Match the words starting with the term
+    prefix: bool
+
+
+class SearchHit(NamedTuple):
+    """
+    Issue or comment matching a search. The key of an issue is twice its id, the one of a comment twice its id
+    plus one, so that both share a single unique ordering.
+    """
+
+    rank: float
+    key: int
+
+    @property
+    def kind(self) -> str:
+        return "comment" if self.key % 2 else "issue"
+
+    @property
+    def id(self) -> int:
+        return self.key // 2
+
+
+def parse_query(query: str) -> list[SearchTerm]:
+    """
+    Split a query into its keywords, a keyword ending with `*` matches the words it starts.
+    """
+    return [SearchTerm(text.lower(), bool(star)) for text, star in _TERM_PATTERN.findall(query)][:MAX_TERMS]
+
+
+class SearchBackend:
+    """
+    Search the issues and comments of a project matching every term.
+    The hits are returned in (rank, key) order, the best first, following `position` or preceding it when `reverse`.
+    """
+
+    def search(self, project_id: int, terms: list[SearchTerm], position: tuple[Any, ...] | None,
+               reverse: bool, limit: int) -> list[SearchHit]:
+        raise NotImplementedError
+
+
+class TermFrequencyCache(TieredCache):
+    """
+    Cross-request cache of the number of documents of the search index containing a term, keyed by
+    (text, prefix), and of the total number of documents under the key (), configured by
+    `SOFTDESK_SEARCH_TERM_CACHE`. The counts only decide which terms are ranked, they may be a little stale.
+    """
+
+    SETTING = "SOFTDESK_SEARCH_TERM_CACHE"
+    KEY_PREFIX = "sd_search_term"
+    DEFAULT_TTL = 3600
+
+    def load(self, key: tuple[Any, ...]) -> int:
+        if not key:
+            return Issue.objects.count() + Comment.objects.count()
+        term = SearchTerm(*key)
+        with connections[Issue.objects.db].cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+                [f"{{title body}} : {get_phrase(term)}"],
+            )
+            return cursor.fetchone()[0]
+
+
+term_frequency_cache = TermFrequencyCache()
+
+
+@receiver(setting_changed)
+def _reconfigure_term_frequency_cache(*, setting: str, **kwargs) -> None:
+    if setting == "SOFTDESK_SEARCH_TERM_CACHE":
+        term_frequency_cache.configure()
+
+
+def get_phrase(term: SearchTerm) -> str:
+    # The terms only hold word characters, they can be quoted as is
+    return f'"{term.text}"{"*" if term.prefix else ""}'
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Full-text search through the FTS5 table `sd_projects_search`, kept in sync with the issues and comments by
+    triggers so that bulk_create, update() and raw writes are indexed as well, see the migration 0012.
+    The project is an indexed column, its posting list is intersected with the ones of the terms, and the hits
+    are ranked by bm25, a term found in the title of an issue weighing ten times one found in a description.
+    The most frequent terms are left out of the ranking when other terms are given, otherwise the hits are listed
+    from the most recent instead of being ranked. The hits contain every term either way.
+    """
+
+    def get_match(self, project_id: int | None, terms: list[SearchTerm]) -> str:
+        match = f"{{title body}} : ({' '.join(map(get_phrase, terms))})"
+        return match if project_id is None else f"project : p{int(project_id)} AND {match}"
+
+    def get_ranked_terms(self, terms: list[SearchTerm]) -> list[SearchTerm]:
+        """
+        Leave out the terms found in more than `SOFTDESK_SEARCH_STOP_RATIO` of the documents. They barely change
+        the ranking, while bm25 reads the whole posting list of each term to weigh it.
+        The terms left out must still be matched by the hits, see `search`.
+        """
+        documents = term_frequency_cache.lookup(())
+        if documents < STOP_MIN_DOCUMENTS:
+            return terms
+        limit = documents * getattr(settings, "SOFTDESK_SEARCH_STOP_RATIO", 0.2)
+        return [term for term in terms if term_frequency_cache.lookup(tuple(term)) <= limit]
+
+    def search(self, project_id, terms, position, reverse, limit):
+        ranked_terms = self.get_ranked_terms(terms)
+        if ranked_terms:
+            frequent_terms = [term for term in terms if term not in ranked_terms]
+            sql = f"SELECT ranked.rank, ranked.rowid FROM {SEARCH_TABLE} ranked"
+            params: list[Any] = []
+            if frequent_terms:
+                # The frequent terms are matched by a second, unranked, reference to the table, which only looks up
+                # the rowids of the ranked hits in their posting lists. CROSS JOIN keeps the ranked one outer.
+                sql += f" CROSS JOIN {SEARCH_TABLE} frequent ON frequent.rowid = ranked.rowid" \
+                       f" AND frequent.{SEARCH_TABLE} MATCH %s"
+                params.append(self.get_match(None, frequent_terms))
+            sql += f" WHERE ranked.{SEARCH_TABLE} MATCH %s"
+            params.append(self.get_match(project_id, ranked_terms))
+            if position is not None:
+                operator = "<" if reverse else ">"
+                sql += f" AND (ranked.rank {operator} %s OR (ranked.rank = %s AND ranked.rowid {operator} %s))"
+                params += [position[0], position[0], position[1]]
+            direction = " DESC" if reverse else ""
+            sql += f" ORDER BY ranked.rank{direction}, ranked.rowid{direction} LIMIT %s"
+        else:
+            # Only frequent terms, the hits are listed from the most recent with a rank of -rowid
+            sql = f"SELECT -rowid, rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+            params = [self.get_match(project_id, terms)]
+            if position is not None:
+                sql += f" AND rowid {'>' if reverse else '<'} %s"
+                params.append(position[1])
+            sql += f" ORDER BY rowid{'' if reverse else ' DESC'} LIMIT %s"
+        with connections[Issue.objects.db].cursor() as cursor:
+            cursor.execute(sql, [*params, limit])
+            return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    Unindexed search for the databases without a full-text index of the issues and comments, every term must be
+    contained in the title or the description. The hits are not ranked, they all have a rank of 0.
+    """
+
+    def filter(self, fields: tuple[str, ...], terms: list[SearchTerm]) -> models.Q:
+        condition = models.Q()
+        for term in terms:
+            term_condition = models.Q()
+            for field in fields:
+                term_condition |= models.Q(**{f"{field}__icontains": term.text})
+            condition &= term_condition
+        return condition
+
+    def search(self, project_id, terms, position, reverse, limit):
+        issues = Issue.objects \
+            .filter(self.filter(("title", "description"), terms), project_id=project_id) \
+            .annotate(key=models.F("id") * 2)
+        comments = Comment.objects \
+            .filter(self.filter(("description",), terms), issue__project_id=project_id) \
+            .annotate(key=models.F("id") * 2 + 1)
+        if position is not None:
+            lookup = "key__lt" if reverse else "key__gt"
+            issues = issues.filter(**{lookup: position[1]})
+            comments = comments.filter(**{lookup: position[1]})
+        keys = issues.values_list("key").union(comments.values_list("key"), all=True) \
+            .order_by("-key" if reverse else "key")[:limit]
+        return [SearchHit(0.0, key) for key, in keys]
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> SearchBackend:
+    """
+    Return the backend named by `SOFTDESK_SEARCH_BACKEND`, by default the FTS5 one on SQLite and the LIKE one
+    on the other databases.
+    """
+    path = getattr(settings, "SOFTDESK_SEARCH_BACKEND", None)
+    if path is None:
+        vendor = connections[Issue.objects.db].vendor
+        path = f"{__name__}.{'SQLiteSearchBackend' if vendor == 'sqlite' else 'LikeSearchBackend'}"
+    return import_string(path)()
+
+
+@receiver(setting_changed)
+def _reset_search_backend(*, setting: str, **kwargs) -> None:
+    if setting in ("SOFTDESK_SEARCH_BACKEND", "DATABASES"):
+        get_search_backend.cache_clear()
+
+
+def load_results(hits: list[SearchHit]) -> list[dict[str, Any]]:
+    """
+    Load the issues and comments of the hits, in the order of the hits.
+    Rows deleted since the search are left out.
+    """
+    rows: dict[tuple[str, int], dict[str, Any]] = {}
+    issue_ids = [hit.id for hit in hits if hit.kind == "issue"]
+    comment_ids = [hit.id for hit in hits if hit.kind == "comment"]
+    if issue_ids:
+        for issue_id, title, description in Issue.objects \
+                .filter(id__in=issue_ids) \
+                .values_list("id", "title", "description"):
+            rows["issue", issue_id] = {"issue": issue_id, "title": title, "description": description}
+    if comment_ids:
+        for comment_id, issue_id, title, description in Comment.objects \
+                .filter(id__in=comment_ids) \
+                .values_list("id", "issue_id", "issue__title", "description"):
+            rows["comment", comment_id] = {"issue": issue_id, "title": title, "description": description}
+    return [
+        {"type": hit.kind, "id": hit.id, **rows[hit.kind, hit.id], "rank": hit.rank}
+        for hit in hits
+        if (hit.kind, hit.id) in rows
+    ]
@@ -0,0 +1,177 @@
+import itertools
+import random
+from typing import Callable, Iterator, TypeVar
+from django.db import transaction
+from .models import Comment, Contributor, Issue, Project, ProjectVersion, User
+from .statistics import rebuild_statistics
+
+T = TypeVar("T")
+
+# Words of the seeded titles, descriptions and comments, the first ones being the most frequent
+WORDS = [
+    "the", "to", "of", "and", "a", "in", "is", "on", "for", "with", "when", "not", "error", "page", "user", "fix",
+    "login", "button", "api", "update", "list", "project", "issue", "crash", "form", "test", "data", "server",
+    "display", "add", "remove", "support", "slow", "mobile", "layout", "search", "filter", "export", "import",
+    "comment", "token", "session", "cache", "database", "query", "timeout", "upload", "download", "image",
+    "notification", "email", "password", "settings", "profile", "dashboard", "chart", "report", "translation",
+    "android", "ios", "backend", "frontend", "endpoint", "migration", "permission", "admin", "refactor",
+    "documentation", "release", "build", "deploy", "version", "regression", "keyboard", "scroll", "dark", "theme",
+    "accessibility", "pagination", "sorting", "encoding", "unicode", "offline", "sync", "retry", "memory", "leak",
+]
+FIRST_NAMES = ["Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Giulia", "Hugo", "Inès", "Jules", "Kenji", "Léa",
+               "Manon", "Nathan", "Olga", "Paul", "Quentin", "Rose", "Sami", "Théo", "Uma", "Victor", "Wei", "Yasmine"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Petit", "Durand", "Leroy", "Moreau", "Simon",
+              "Laurent", "Lefebvre", "Michel", "Garcia", "Nguyen", "Müller", "Rossi", "Kowalski", "Haddad", "Tanaka"]
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    """
+    Cumulative weights of `count` ranks following Zipf's law, the rank r being drawn in proportion to 1 / r^exponent.
+    """
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def batched(items: Iterator[T], size: int) -> Iterator[list[T]]:
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+
+class DataSeeder:
+    """
+    Insert synthetic users, projects, contributors, issues and comments with the skewed distributions of a real
+    tracker: a few projects hold most of the issues, a few users write most of them, and a few issues get most of
+    the comments. The rows are bulk inserted, then the versions and statistics of the projects are written as the
+    signals would have.
+    """
+
+    def __init__(self, prefix: str, skew: float = 1.1, seed: int | None = None, batch_size: int = 10_000,
+                 max_contributors: int = 50, progress: Callable[[str], None] | None = None) -> None:
+        self.prefix = prefix
+        self.skew = skew
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.max_contributors = max_contributors
+        self.progress = progress or (lambda message: None)
+        self.words = zipf_weights(len(WORDS), 1.0)
+
+    def text(self, words: int, length: int) -> str:
+        return " ".join(self.rng.choices(WORDS, cum_weights=self.words, k=words)).capitalize()[:length]
+
+    def seed(self, users: int, projects: int, issues: int, comments: int) -> dict[str, int]:
+        user_ids = self.seed_users(users)
+        members = self.seed_projects(projects, user_ids)
+        issue_count, comment_count = self.seed_issues(issues, comments, members)
+        rebuild_statistics(members)
+        return {"users": len(user_ids), "projects": len(members), "issues": issue_count, "comments": comment_count}
+
+    def seed_users(self, count: int) -> list[int]:
+        offset = User.objects.filter(username__startswith=f"{self.prefix}-user-").count()
+        user_ids = []
+        for batch in batched(iter(range(offset, offset + count)), self.batch_size):
+            user_ids += [user.pk for user in User.objects.bulk_create(
+                User(
+                    username=f"{self.prefix}-user-{index}",
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    password="!",
+                )
+                for index in batch
+            )]
+        self.progress(f"Seeded {count} users")
+        return user_ids
+
+    def seed_projects(self, count: int, user_ids: list[int]) -> dict[int, list[int]]:
+        """
+        Insert the projects and their contributors, the members of each project ordered from the most active.
+        The users contributing to many projects are the same that write the most.
+        """
+        offset = Project.objects.filter(title__startswith=f"{self.prefix} project ").count()
+        activity = zipf_weights(len(user_ids), self.skew)
+        members: dict[int, list[int]] = {}
+        for batch in batched(iter(range(offset, offset + count)), self.batch_size):
+            authors = self.rng.choices(user_ids, cum_weights=activity, k=len(batch))
+            projects = Project.objects.bulk_create(
+                Project(
+                    title=f"{self.prefix} project {index}",
+                    description=self.text(self.rng.randint(4, 20), 255),
+                    type=self.rng.choices(Project.ProjectType.values, weights=(45, 30, 10, 15))[0],
+                    author_id=author_id,
+                )
+                for index, author_id in zip(batch, authors)
+            )
+            ProjectVersion.objects.bulk_create(ProjectVersion(project=project) for project in projects)
+            contributors = []
+            for project in projects:
+                size = min(len(user_ids), self.max_contributors, 1 + int(self.rng.paretovariate(1.2)))
+                team = list(dict.fromkeys([
+                    project.author_id, *self.rng.choices(user_ids, cum_weights=activity, k=size * 2),
+                ]))[:max(size, 1)]
+                members[project.pk] = team
+                contributors += [
+                    Contributor(
+                        user_id=user_id,
+                        project=project,
+                        role=Contributor.ContributorRole.OWNER if user_id == project.author_id else Contributor.ContributorRole.CONTRIBUTOR,
+                        permission=Contributor.ContributorPermission.DELETE if user_id == project.author_id else
+                        self.rng.choices(Contributor.ContributorPermission.values, weights=(20, 60, 20))[0],
+                    )
+                    for user_id in team
+                ]
+            Contributor.objects.bulk_create(contributors, batch_size=self.batch_size)
+        self.progress(f"Seeded {count} projects")
+        return members
+
+    def seed_issues(self, issue_count: int, comment_count: int, members: dict[int, list[int]]) -> tuple[int, int]:
+        """
+        Insert the issues, spread over the projects by Zipf's law, and the comments of each batch of issues,
+        spread over its issues by Zipf's law. Authors and assignees are contributors of the project.
+        """
+        project_ids = list(members)
+        self.rng.shuffle(project_ids)
+        project_weights = zipf_weights(len(project_ids), self.skew)
+        team_weights = {size: zipf_weights(size, self.skew) for size in range(1, self.max_contributors + 1)}
+        created_issues = created_comments = 0
+        while created_issues < issue_count:
+            batch = self.rng.choices(project_ids, cum_weights=project_weights, k=min(self.batch_size, issue_count - created_issues))
+            with transaction.atomic():
+                issues = Issue.objects.bulk_create(
+                    Issue(
+                        title=self.text(self.rng.randint(2, 7), 50),
+                        description=self.text(self.rng.randint(5, 50), 320),
+                        status=self.rng.choices(Issue.IssueStatus.values, weights=(30, 20, 50))[0],
+                        tag=self.rng.choices(Issue.IssueTag.values, weights=(45, 20, 35))[0],
+                        priority=self.rng.choices(Issue.IssuePriority.values, weights=(50, 35, 15))[0],
+                        project_id=project_id,
+                        author_id=self.pick_member(members[project_id], team_weights),
+                        assigned_id=self.pick_member(members[project_id], team_weights) if self.rng.random() < 0.6 else None,
+                    )
+                    for project_id in batch
+                )
+                created_issues += len(issues)
+                # The share of the comments of this batch, so that the last one gets the remainder
+                count = comment_count * created_issues // max(issue_count, 1) - created_comments
+                created_comments += self.seed_comments(issues, count, members, team_weights)
+            self.progress(f"Seeded {created_issues} issues and {created_comments} comments")
+        return created_issues, created_comments
+
+    def seed_comments(self, issues: list[Issue], count: int, members: dict[int, list[int]],
+                      team_weights: dict[int, list[float]]) -> int:
+        if not issues or count <= 0:
+            return 0
+        issues = self.rng.sample(issues, len(issues))
+        weights = zipf_weights(len(issues), self.skew)
+        comments = Comment.objects.bulk_create(
+            (
+                Comment(
+                    description=self.text(self.rng.randint(3, 40), 320),
+                    author_id=self.pick_member(members[issue.project_id], team_weights),
+                    issue_id=issue.pk,
+                )
+                for issue in self.rng.choices(issues, cum_weights=weights, k=count)
+            ),
+            batch_size=self.batch_size,
+        )
+        return len(comments)
+
+    def pick_member(self, team: list[int], team_weights: dict[int, list[float]]) -> int:
+        return self.rng.choices(team, cum_weights=team_weights[len(team)])[0]
@@ -1,10 +1,27 @@
 from collections import OrderedDict
+from typing import Any, Callable, ClassVar, NamedTuple
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models as db_models
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import (serializers, validators as drf_validators)
 from . import models
 from rest_framework.generics import get_object_or_404
-from sd_projects import validators
+from sd_projects import statistics, validators
+from .instrumentation import measure
+from .passwords import hashing_pool
+
+
+class MeasuredDataMixin:
+    """
+    Count the rendering of `data` as serializer time of the sampled requests.
+    """
+
+    @property
+    def data(self):
+        with measure("serializer"):
+            return super().data  # type: ignore[misc]
 
 
 class NoUpdateMixin(serializers.ModelSerializer):
@@ -21,6 +38,31 @@ class NoUpdateMixin(serializers.ModelSerializer):
         return kwargs
 
 
+class SparseFieldsMixin(serializers.ModelSerializer):
+    """
+    Render only the fields listed by the `fields` query parameter of GET requests, e.g. `?fields=id,title,status`.
+    Unknown names are ignored.
+    """
+
+    sparse_fields_query_param = "fields"
+
+    @classmethod
+    def get_sparse_fields(cls, request) -> set[str] | None:
+        if request is None or (request.method or "").upper() != "GET":
+            return None
+        value = request.query_params.get(cls.sparse_fields_query_param)
+        if not value:
+            return None
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fields = self.get_sparse_fields(self.context.get("request"))
+        if sparse_fields is None:
+            return fields
+        return OrderedDict((name, field) for name, field in fields.items() if name in sparse_fields)
+
+
 class FullPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
 
     def __init__(self, /, *args, serializer: serializers.BaseSerializer, **kwargs):
@@ -41,13 +83,85 @@ class FullPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
         ])
 
     def to_internal_value(self, data):
-        value = super().to_internal_value(data)
-        return value
+        # Objects resolved beforehand for a whole batch of items, see BulkModelAPIView
+        related_objects = self.context.get("related_objects", {}).get(self.field_name)
+        if related_objects is None:
+            return super().to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            return related_objects[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+    def use_pk_only_optimization(self):
+        # The full related object is rendered, so let the parent hand it over directly
+        # (from select_related or from a batch prefetch) instead of a bare primary key.
+        return False
+
+    def get_prefetch(self) -> Prefetch | None:
+        """
+        Prefetch resolving this field for a whole list of instances with a single query.
+        """
+        if self.source == "*" or self.queryset is None:
+            return None
+        return Prefetch("__".join(self.source_attrs), queryset=self.get_queryset())
 
     def to_representation(self, value):
-        data = super().to_representation(value)
-        obj = get_object_or_404(self.get_queryset(), pk=data)
-        return self.serializer().to_representation(obj)
+        if not isinstance(value, db_models.Model):
+            data = super().to_representation(value)
+            value = get_object_or_404(self.get_queryset(), pk=data)
+        return self.serializer().to_representation(value)
+
+
+class BatchListSerializer(MeasuredDataMixin, serializers.ListSerializer):
+    """
+    List serializer resolving every field of its child exposing a `get_prefetch` method, such as
+    FullPrimaryKeyRelatedField, and every nested serializer of a related object, such as the author of an issue,
+    in one query per field instead of one query per row.
+    Objects already loaded through select_related are reused as is.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, db_models.manager.BaseManager) else data
+        items = list(iterable)
+        if items and isinstance(items[0], db_models.Model):
+            prefetches = get_prefetches(self)
+            if prefetches:
+                prefetch_related_objects(items, *prefetches)
+        return [self.child.to_representation(item) for item in items]
+
+
+def get_prefetches(serializer: serializers.BaseSerializer) -> list[Prefetch]:
+    """
+    Return the prefetches of the fields of a serializer, or of the child of a list serializer.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    if not isinstance(serializer, serializers.Serializer):
+        return []
+    return [
+        prefetch for prefetch in (
+            get_field_prefetch(serializer, field)
+            for field in serializer.fields.values()
+            if not field.write_only
+        ) if prefetch is not None
+    ]
+
+
+def get_field_prefetch(serializer: serializers.Serializer, field: serializers.Field) -> Prefetch | None:
+    if hasattr(field, "get_prefetch"):
+        return field.get_prefetch()
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if not isinstance(field, serializers.ModelSerializer) or model is None or len(field.source_attrs) != 1:
+        return None
+    try:
+        relation = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+    return Prefetch(field.source) if relation.many_to_one or relation.one_to_one else None
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -58,7 +172,7 @@ class UserSerializer(serializers.ModelSerializer):
         depth = 1
 
 
-class ContributorSerializer(NoUpdateMixin, serializers.ModelSerializer):
+class ContributorSerializer(MeasuredDataMixin, NoUpdateMixin, serializers.ModelSerializer):
     user = FullPrimaryKeyRelatedField(serializer=UserSerializer, queryset=User.objects.all())
 
     class Meta:
@@ -66,6 +180,7 @@ class ContributorSerializer(NoUpdateMixin, serializers.ModelSerializer):
         depth = 1
         exclude = ["project"]
         create_only_fields = ['user']
+        list_serializer_class = BatchListSerializer
         extra_kwargs = {
             'role': {'read_only': True}
         }
@@ -82,7 +197,7 @@ class ContributorSerializer(NoUpdateMixin, serializers.ModelSerializer):
         return value
 
 
-class CommentSerializer(NoUpdateMixin, serializers.ModelSerializer):
+class CommentSerializer(MeasuredDataMixin, NoUpdateMixin, serializers.ModelSerializer):
 
     author = UserSerializer(read_only=True, default=serializers.CurrentUserDefault())
 
@@ -91,9 +206,10 @@ class CommentSerializer(NoUpdateMixin, serializers.ModelSerializer):
         exclude = ['issue']
         depth = 1
         create_only_fields = ['author']
+        list_serializer_class = BatchListSerializer
 
 
-class IssueSerializer(NoUpdateMixin, serializers.ModelSerializer):
+class IssueSerializer(MeasuredDataMixin, SparseFieldsMixin, NoUpdateMixin, serializers.ModelSerializer):
 
     author = UserSerializer(read_only=True, default=serializers.CurrentUserDefault())
     assigned = FullPrimaryKeyRelatedField(required=False, serializer=UserSerializer, queryset=User.objects.all())
@@ -106,25 +222,102 @@ class IssueSerializer(NoUpdateMixin, serializers.ModelSerializer):
         exclude = ['project']
         depth = 1
         create_only_fields = ['author']
+        list_serializer_class = BatchListSerializer
         validators = [
             validators.UserIsCollaborator(user_field='assigned', project_slug='project_id', nullable_user=True)
         ]
 
 
-class ProjectSerializer(NoUpdateMixin, serializers.ModelSerializer):
+class ProjectStatisticsSerializer(MeasuredDataMixin, serializers.Serializer):
+    """
+    Render the statistics buckets of a project as totals by status, tag and priority.
+    """
+
+    issues = serializers.IntegerField(help_text="Number of issues of the project")
+    comments = serializers.IntegerField(help_text="Number of comments on the issues of the project")
+    status = serializers.DictField(child=serializers.IntegerField(), help_text="Number of issues by status")
+    tag = serializers.DictField(child=serializers.IntegerField(), help_text="Number of issues by tag")
+    priority = serializers.DictField(child=serializers.IntegerField(), help_text="Number of issues by priority")
+    status_by_priority = serializers.DictField(
+        child=serializers.DictField(child=serializers.IntegerField()),
+        help_text="Number of issues by status for each priority",
+    )
+
+    def to_representation(self, instance):
+        return super().to_representation(statistics.summarize(instance))
+
+
+class SearchResultSerializer(MeasuredDataMixin, serializers.Serializer):
+    """
+    Render an issue or a comment found by a search, with the issue it belongs to.
+    """
+
+    type = serializers.ChoiceField(choices=["issue", "comment"], help_text="Type of the found resource")
+    id = serializers.IntegerField(help_text="Id of the issue or of the comment")
+    issue = serializers.IntegerField(help_text="Id of the issue, or of the issue of the comment")
+    title = serializers.CharField(help_text="Title of the issue")
+    description = serializers.CharField(help_text="Description of the issue or of the comment")
+    rank = serializers.FloatField(help_text="Relevance of the result, the lower the better")
+
+    class Meta:
+        list_serializer_class = BatchListSerializer
+
+
+class ProjectStatisticsField(serializers.Field):
+    """
+    Embed the statistics of the project, prefetched for a whole list of projects by BatchListSerializer.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_prefetch(self) -> Prefetch:
+        return Prefetch("statistics")
+
+    def to_representation(self, value: models.Project):
+        return ProjectStatisticsSerializer(value.statistics.all()).data
+
+
+class ProjectSerializer(MeasuredDataMixin, NoUpdateMixin, serializers.ModelSerializer):
 
     author = UserSerializer(read_only=True, default=serializers.CurrentUserDefault())
     # contributors = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
     # issues = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
+    embed_query_param = "embed"
+
     class Meta:
         model = models.Project
         fields = "__all__"
         depth = 1
         create_only_fields = ['author']
+        list_serializer_class = BatchListSerializer
+
+    @classmethod
+    def get_embeds(cls, request) -> list[str]:
+        """
+        Return the names of the fields embedded by the `embed` query parameter, in rendering order.
+        """
+        embed = request.query_params.get(cls.embed_query_param, "").split(",") if request is not None else []
+        return [name for name in ("role", "statistics") if name in embed]
+
+    @staticmethod
+    def make_embedded_field(name: str) -> serializers.Field:
+        if name == "role":
+            # Annotated by the projects views with the role of the current user
+            return serializers.ChoiceField(choices=models.Contributor.ContributorRole.choices, read_only=True)
+        return ProjectStatisticsField()
 
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.get_embeds(self.context.get("request")):
+            fields[name] = self.make_embedded_field(name)
+        return fields
 
-class UserCreationSerializer(serializers.ModelSerializer):
+
+class UserCreationSerializer(MeasuredDataMixin, serializers.ModelSerializer):
 
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
     password2 = serializers.CharField(write_only=True, required=True)
@@ -157,6 +350,174 @@ class UserCreationSerializer(serializers.ModelSerializer):
             first_name=validated_data["first_name"],
             last_name=validated_data["last_name"],
         )
-        user.set_password(validated_data["password"])
+        hashing_pool.run(user.set_password, validated_data["password"])
         user.save()
         return user
+
+
+class ValuesEntry(NamedTuple):
+    """
+    How a serializer field is read from a `.values_list()` row: the column holding its value and the conversion
+    of a non-null value, or the fields of the nested serializer of a related object, of which the column then
+    holds the primary key.
+    """
+
+    column: str
+    convert: Callable[[Any], Any] | None = None
+    nested: "dict[str, ValuesEntry] | None" = None
+
+
+# Fields of which the representation is the value read from the database
+PLAIN_VALUE_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.ChoiceField)
+
+
+def get_values_entry(name: str, field: serializers.Field, prefix: str = "") -> ValuesEntry | None:
+    """
+    Return how a serializer field is read from a row, or None when it is not rendered from a single column,
+    e.g. a field of source `*` or a list of related objects.
+    """
+    source = field.source or name
+    if source == "*" or "." in source:
+        return None
+    column = f"{prefix}{source}"
+    if isinstance(field, FullPrimaryKeyRelatedField):
+        field = field.serializer()
+    if isinstance(field, serializers.BaseSerializer):
+        if not isinstance(field, serializers.ModelSerializer):
+            return None
+        nested = get_values_entries(field.fields, f"{column}__")
+        if None in nested.values():
+            return None
+        return ValuesEntry(f"{column}__{field.Meta.model._meta.pk.name}", nested=nested)  # type: ignore[arg-type]
+    if isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField)):
+        return None
+    if type(field) in PLAIN_VALUE_FIELDS:
+        return ValuesEntry(column)
+    return ValuesEntry(column, field.to_representation)
+
+
+def get_values_entries(fields: dict[str, serializers.Field], prefix: str = "") -> dict[str, ValuesEntry | None]:
+    return {name: get_values_entry(name, field, prefix) for name, field in fields.items() if not field.write_only}
+
+
+def render_row(fields: tuple[tuple[str, int, Callable | None, Any], ...], row: tuple[Any, ...]) -> dict[str, Any]:
+    data = {}
+    for name, index, convert, nested in fields:
+        value = row[index]
+        if value is None:
+            data[name] = None
+        elif nested is not None:
+            data[name] = render_row(nested, row)
+        elif convert is None:
+            data[name] = value
+        else:
+            data[name] = convert(value)
+    return data
+
+
+class ValuesPlan:
+    """
+    Columns to read with `.values_list()` for a set of fields, and the rendering of the rows into dicts.
+    """
+
+    def __init__(self, entries: dict[str, ValuesEntry]) -> None:
+        self.columns: list[str] = []
+        self.fields = self.compile(entries)
+
+    def compile(self, entries: dict[str, ValuesEntry]) -> tuple[tuple[str, int, Callable | None, Any], ...]:
+        fields = []
+        for name, entry in entries.items():
+            if entry.column not in self.columns:
+                self.columns.append(entry.column)
+            nested = self.compile(entry.nested) if entry.nested is not None else None
+            fields.append((name, self.columns.index(entry.column), entry.convert, nested))
+        return tuple(fields)
+
+    def render(self, row: tuple[Any, ...]) -> dict[str, Any]:
+        with measure("serializer"):
+            return render_row(self.fields, row)
+
+    def render_many(self, rows) -> list[dict[str, Any]]:
+        fields = self.fields
+        with measure("serializer"):
+            return [render_row(fields, row) for row in rows]
+
+
+class ValuesSerializer:
+    """
+    Read-only counterpart of a ModelSerializer, rendering the rows of `.values_list()` into the same
+    representation without creating any model instance nor serializer field.
+    The fields of `serializer_class` are introspected once, when the subclass is defined. The plan of each set
+    of requested fields is then kept, None standing for a set of which a field is not read from a column and
+    must be rendered by the ModelSerializer.
+    """
+
+    serializer_class: ClassVar[type[serializers.ModelSerializer]]
+    field_names: ClassVar[tuple[str, ...]]
+    entries: ClassVar[dict[str, ValuesEntry | None]]
+    plans: ClassVar[dict[tuple[str, ...], ValuesPlan | None]]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        fields = cls.serializer_class().fields
+        cls.field_names = tuple(name for name, field in fields.items() if not field.write_only)
+        cls.entries = get_values_entries({**fields, **cls.get_extra_fields()})
+        cls.plans = {}
+        cls.get_fields_plan(cls.field_names)
+
+    @classmethod
+    def get_extra_fields(cls) -> dict[str, serializers.Field]:
+        """
+        Fields the serializer only renders on demand.
+        """
+        return {}
+
+    @classmethod
+    def get_field_names(cls, request) -> tuple[str, ...]:
+        return cls.field_names
+
+    @classmethod
+    def get_plan(cls, request) -> ValuesPlan | None:
+        return cls.get_fields_plan(cls.get_field_names(request))
+
+    @classmethod
+    def get_fields_plan(cls, names: tuple[str, ...]) -> ValuesPlan | None:
+        try:
+            return cls.plans[names]
+        except KeyError:
+            pass
+        entries = {name: cls.entries[name] for name in names}
+        plan = None if None in entries.values() else ValuesPlan(entries)  # type: ignore[arg-type]
+        cls.plans[names] = plan
+        return plan
+
+
+class ProjectValuesSerializer(ValuesSerializer):
+    serializer_class = ProjectSerializer
+
+    @classmethod
+    def get_extra_fields(cls):
+        return {name: ProjectSerializer.make_embedded_field(name) for name in ("role", "statistics")}
+
+    @classmethod
+    def get_field_names(cls, request):
+        return cls.field_names + tuple(ProjectSerializer.get_embeds(request))
+
+
+class ContributorValuesSerializer(ValuesSerializer):
+    serializer_class = ContributorSerializer
+
+
+class IssueValuesSerializer(ValuesSerializer):
+    serializer_class = IssueSerializer
+
+    @classmethod
+    def get_field_names(cls, request):
+        sparse_fields = IssueSerializer.get_sparse_fields(request)
+        if sparse_fields is None:
+            return cls.field_names
+        return tuple(name for name in cls.field_names if name in sparse_fields)
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    serializer_class = CommentSerializer
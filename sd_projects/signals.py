@@ -0,0 +1,121 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from .authentication import token_user_cache
+from .membership import membership_cache
+from .models import Comment, Contributor, Issue, Project, ProjectVersion, UserTokenVersion
+from .versions import (
+    bump_contributed_project_versions,
+    bump_project_version,
+    get_remembered_issue_project,
+    remember_issue_project,
+)
+from . import statistics
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def invalidate_contributor_membership(sender, instance: Contributor, **kwargs) -> None:
+    # Dropped again on commit, a concurrent request may have cached the previous row meanwhile
+    membership_cache.invalidate(instance.user_id, instance.project_id)
+    transaction.on_commit(lambda: membership_cache.invalidate(instance.user_id, instance.project_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_token_user(sender, instance: User, **kwargs) -> None:
+    token_user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def bump_user_projects(sender, instance: User, created: bool, update_fields=None, **kwargs) -> None:
+    # The names of the users are rendered with the issues and comments they wrote
+    if not created and (update_fields is None or {"first_name", "last_name"} & set(update_fields)):
+        bump_contributed_project_versions(instance.pk)
+
+
+@receiver(post_save, sender=UserTokenVersion)
+@receiver(post_delete, sender=UserTokenVersion)
+def invalidate_token_version(sender, instance: UserTokenVersion, **kwargs) -> None:
+    token_user_cache.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Project)
+@receiver(pre_delete, sender=Project)
+def invalidate_project_memberships(sender, instance: Project, created: bool = False, **kwargs) -> None:
+    if created:
+        return
+    # pre_delete: the contributors are still there to know which shared cache entries to drop
+    user_ids = list(Contributor.objects.filter(project_id=instance.pk).values_list("user_id", flat=True))
+    project_id = instance.pk
+    membership_cache.invalidate_project(project_id, user_ids)
+    transaction.on_commit(lambda: membership_cache.invalidate_project(project_id, user_ids))
+
+
+@receiver(post_save, sender=Project)
+def bump_project(sender, instance: Project, created: bool, **kwargs) -> None:
+    if created:
+        ProjectVersion.objects.create(project=instance)
+    else:
+        bump_project_version(instance.pk)
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def bump_project_resource(sender, instance: Contributor | Issue, **kwargs) -> None:
+    bump_project_version(instance.project_id)
+
+
+@receiver(pre_delete, sender=Issue)
+def remember_deleted_issue(sender, instance: Issue, **kwargs) -> None:
+    remember_issue_project(instance.pk, instance.project_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_project(sender, instance: Comment, **kwargs) -> None:
+    project_id = get_remembered_issue_project(instance.issue_id)
+    if project_id is None:
+        try:
+            project_id = instance.issue.project_id
+        except Issue.DoesNotExist:
+            return
+    bump_project_version(project_id)
+
+
+@receiver(pre_save, sender=Issue)
+def load_saved_issue_bucket(sender, instance: Issue, **kwargs) -> None:
+    if instance.pk is not None:
+        statistics.load_bucket(instance)
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance: Issue, created: bool, **kwargs) -> None:
+    if created:
+        statistics.record_created_issues(instance.project_id, [instance])
+    else:
+        statistics.record_updated_issue(instance)
+
+
+@receiver(pre_delete, sender=Issue)
+def count_deleting_issue(sender, instance: Issue, **kwargs) -> None:
+    statistics.record_deleting_issue(instance)
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance: Issue, **kwargs) -> None:
+    statistics.forget_deleted_issue(instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance: Comment, created: bool, **kwargs) -> None:
+    if created:
+        statistics.record_comments(instance.issue_id, 1, instance._state.fields_cache.get("issue"))
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance: Comment, **kwargs) -> None:
+    statistics.record_comments(instance.issue_id, -1, instance._state.fields_cache.get("issue"))
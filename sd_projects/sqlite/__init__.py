@@ -0,0 +1,3 @@
+"""
+SQLite backend tuned for concurrent requests, selected with the ENGINE `sd_projects.sqlite`.
+"""
@@ -0,0 +1,135 @@
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+# Statements taking the write lock of the database when run outside of a transaction
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_write_locks: dict[str, threading.RLock] = {}
+_write_locks_lock = threading.Lock()
+
+
+def get_write_lock(name: str) -> threading.RLock:
+    """
+    Return the lock serializing the writes of the threads of this process to a database file.
+    """
+    with _write_locks_lock:
+        return _write_locks.setdefault(name, threading.RLock())
+
+
+class SerializedCursorWrapper(base.SQLiteCursorWrapper):
+    """
+    Cursor running the writes made outside of a transaction under the write lock of the database.
+    """
+
+    def __init__(self, connection: Any, wrapper: "DatabaseWrapper") -> None:
+        super().__init__(connection)
+        self.wrapper = wrapper
+
+    def is_write(self, query: str) -> bool:
+        return not self.connection.in_transaction and query.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+
+    def execute(self, query, params=None):
+        if not self.is_write(query):
+            return super().execute(query, params)
+        with self.wrapper.write_lock_held():
+            return super().execute(query, params)
+
+    def executemany(self, query, param_list):
+        if not self.is_write(query):
+            return super().executemany(query, param_list)
+        with self.wrapper.write_lock_held():
+            return super().executemany(query, param_list)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend running the `PRAGMAS` of its OPTIONS on each new connection, e.g. to turn on WAL.
+
+    With `SERIALIZE_WRITES`, the transactions start with BEGIN IMMEDIATE, taking the write lock of the database
+    upfront instead of failing with "database is locked" when a read transaction of a concurrent writer turns
+    into a write. The writers of this process queue on a lock held for the whole transaction, so that they do not
+    poll the busy handler of SQLite, which sleeps up to 100 ms between attempts. A writer waits at most
+    `busy_timeout` milliseconds for the lock, the writers of other processes still go through the busy handler.
+    """
+
+    # Write lock held by the current transaction
+    write_lock: "threading.RLock | None" = None
+
+    def get_connection_params(self) -> dict[str, Any]:
+        params = super().get_connection_params()
+        params.pop("PRAGMAS", None)
+        params.pop("SERIALIZE_WRITES", None)
+        return params
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> Any:
+        connection = super().get_new_connection(conn_params)
+        for pragma, value in self.settings_dict["OPTIONS"].get("PRAGMAS", {}).items():
+            connection.execute(f"PRAGMA {pragma} = {value}").fetchall()
+        return connection
+
+    @property
+    def serialize_writes(self) -> bool:
+        return self.settings_dict["OPTIONS"].get("SERIALIZE_WRITES", False)
+
+    @property
+    def write_lock_timeout(self) -> float:
+        return self.settings_dict["OPTIONS"].get("PRAGMAS", {}).get("busy_timeout", 5000) / 1000
+
+    def acquire_write_lock(self) -> threading.RLock:
+        lock = get_write_lock(str(self.settings_dict["NAME"]))
+        if not lock.acquire(timeout=self.write_lock_timeout):
+            raise OperationalError("database is locked")
+        return lock
+
+    @contextmanager
+    def write_lock_held(self) -> Iterator[None]:
+        lock = self.acquire_write_lock()
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def create_cursor(self, name=None):
+        if not self.serialize_writes:
+            return super().create_cursor(name)
+        return self.connection.cursor(factory=functools.partial(SerializedCursorWrapper, wrapper=self))
+
+    def _start_transaction_under_autocommit(self) -> None:
+        if not self.serialize_writes:
+            return super()._start_transaction_under_autocommit()
+        lock = self.acquire_write_lock()
+        try:
+            self.cursor().execute("BEGIN IMMEDIATE")
+        except BaseException:
+            lock.release()
+            raise
+        self.write_lock = lock
+
+    def end_write_transaction(self) -> None:
+        # Released even if the NAME changed meanwhile, as the test runner does
+        lock, self.write_lock = self.write_lock, None
+        if lock is not None:
+            lock.release()
+
+    def _commit(self) -> None:
+        try:
+            return super()._commit()
+        finally:
+            if not (self.connection is not None and self.connection.in_transaction):
+                self.end_write_transaction()
+
+    def _rollback(self) -> None:
+        try:
+            return super()._rollback()
+        finally:
+            self.end_write_transaction()
+
+    def close(self) -> None:
+        super().close()
+        # A connection closed in a transaction is not committed nor rolled back by Django
+        if self.connection is None or self.closed_in_transaction:
+            self.end_write_transaction()
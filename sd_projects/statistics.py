@@ -0,0 +1,162 @@
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Iterable
+from django.db import transaction
+from django.db.models import Count, F
+from .models import Comment, Issue, ProjectStatistics
+
+# (status, tag, priority) of an issue
+Bucket = tuple[int, int, int]
+
+_deleting = threading.local()
+
+
+def get_bucket(values: Any) -> Bucket | None:
+    """
+    Return the bucket of an issue instance or of a mapping of its values, None if one of them is unknown.
+    """
+    if isinstance(values, Issue):
+        values = values.__dict__
+    bucket = (values.get("status"), values.get("tag"), values.get("priority"))
+    return None if None in bucket else bucket  # type: ignore
+
+
+def remember_bucket(issue: Issue) -> None:
+    """
+    Record the current bucket of a saved issue, as if it had just been loaded from the database.
+    """
+    bucket = get_bucket(issue)
+    if bucket is not None:
+        issue.__dict__.setdefault("_loaded_values", {}).update(zip(("status", "tag", "priority"), bucket))
+
+
+def apply_deltas(project_id: int, deltas: dict[Bucket, tuple[int, int]]) -> None:
+    """
+    Add (issue count, comment count) deltas to the buckets of a project, creating the missing buckets.
+    """
+    for (status, tag, priority), (issue_delta, comment_delta) in deltas.items():
+        if not issue_delta and not comment_delta:
+            continue
+        bucket = ProjectStatistics.objects.filter(project_id=project_id, status=status, tag=tag, priority=priority)
+        changes = {"issue_count": F("issue_count") + issue_delta, "comment_count": F("comment_count") + comment_delta}
+        if not bucket.update(**changes):
+            # First issue of the bucket, the unique constraint settles concurrent creations
+            ProjectStatistics.objects.bulk_create(
+                [ProjectStatistics(project_id=project_id, status=status, tag=tag, priority=priority)],
+                ignore_conflicts=True,
+            )
+            bucket.update(**changes)
+
+
+def record_created_issues(project_id: int, issues: Iterable[Issue]) -> None:
+    issues = list(issues)
+    counter = Counter(get_bucket(issue) for issue in issues)
+    apply_deltas(project_id, {bucket: (count, 0) for bucket, count in counter.items() if bucket is not None})
+    for issue in issues:
+        remember_bucket(issue)
+
+
+def load_bucket(issue: Issue) -> None:
+    """
+    Load the stored bucket of an issue about to be saved, when the instance was not loaded with its bucket values.
+    """
+    if get_bucket(issue.__dict__.get("_loaded_values", {})) is not None:
+        return
+    row = Issue.objects.filter(pk=issue.pk).values("status", "tag", "priority").first()
+    if row is not None:
+        issue.__dict__.setdefault("_loaded_values", {}).update(row)
+
+
+def record_updated_issue(issue: Issue, previous: Bucket | None = None) -> None:
+    """
+    Move an updated issue, and its comments, to its new bucket.
+    """
+    if previous is None:
+        previous = get_bucket(getattr(issue, "_loaded_values", {}))
+    if previous is None:
+        raise ValueError(f"The previous bucket of the issue {issue.pk} is unknown, load it with `load_bucket` before saving")
+    current = get_bucket(issue)
+    if current is None or current == previous:
+        return
+    comment_count = Comment.objects.filter(issue_id=issue.pk).count()
+    apply_deltas(issue.project_id, {previous: (-1, -comment_count), current: (1, comment_count)})
+    remember_bucket(issue)
+
+
+def record_deleting_issue(issue: Issue) -> None:
+    """
+    Remove an issue being deleted and its comments from the statistics.
+    The comments deleted in cascade are then ignored by `record_comments`.
+    """
+    deleting = getattr(_deleting, "issues", None)
+    if deleting is None:
+        deleting = _deleting.issues = set()
+    deleting.add(issue.pk)
+    bucket = get_bucket(issue) or get_bucket(getattr(issue, "_loaded_values", {}))
+    if bucket is None:
+        bucket = Issue.objects.filter(pk=issue.pk).values_list("status", "tag", "priority").get()
+    comment_count = Comment.objects.filter(issue_id=issue.pk).count()
+    apply_deltas(issue.project_id, {bucket: (-1, -comment_count)})
+
+
+def forget_deleted_issue(issue: Issue) -> None:
+    getattr(_deleting, "issues", set()).discard(issue.pk)
+
+
+def record_comments(issue_id: int, delta: int, issue: Issue | None = None) -> None:
+    if issue_id in getattr(_deleting, "issues", ()):
+        return
+    bucket = get_bucket(issue) if issue is not None else None
+    if bucket is None:
+        row = Issue.objects.filter(pk=issue_id).values_list("project_id", "status", "tag", "priority").first()
+        if row is None:
+            return
+        project_id, bucket = row[0], row[1:]
+    else:
+        project_id = issue.project_id  # type: ignore
+    apply_deltas(project_id, {bucket: (0, delta)})
+
+
+def rebuild_statistics(project_ids: Iterable[int] | None = None) -> int:
+    """
+    Recompute the statistics of the given projects, of every project by default. Return the number of buckets.
+    """
+    issues = Issue.objects.all()
+    statistics = ProjectStatistics.objects.all()
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        issues = issues.filter(project_id__in=project_ids)
+        statistics = statistics.filter(project_id__in=project_ids)
+    rows = issues \
+        .order_by() \
+        .values("project_id", "status", "tag", "priority") \
+        .annotate(issue_count=Count("id", distinct=True), comment_count=Count("comments"))
+    with transaction.atomic():
+        statistics.delete()
+        created = ProjectStatistics.objects.bulk_create(ProjectStatistics(**row) for row in rows.iterator())
+    return len(created)
+
+
+def summarize(buckets: Iterable[ProjectStatistics]) -> dict[str, Any]:
+    """
+    Aggregate the buckets of a project into the totals by status, tag and priority.
+    """
+    statuses = OrderedDict((str(label), 0) for label in Issue.IssueStatus.labels)
+    summary: dict[str, Any] = {
+        "issues": 0,
+        "comments": 0,
+        "status": statuses,
+        "tag": OrderedDict((str(label), 0) for label in Issue.IssueTag.labels),
+        "priority": OrderedDict((str(label), 0) for label in Issue.IssuePriority.labels),
+        "status_by_priority": OrderedDict((str(label), statuses.copy()) for label in Issue.IssuePriority.labels),
+    }
+    for bucket in buckets:
+        status = str(Issue.IssueStatus(bucket.status).label)
+        priority = str(Issue.IssuePriority(bucket.priority).label)
+        summary["issues"] += bucket.issue_count
+        summary["comments"] += bucket.comment_count
+        summary["status"][status] += bucket.issue_count
+        summary["tag"][str(Issue.IssueTag(bucket.tag).label)] += bucket.issue_count
+        summary["priority"][priority] += bucket.issue_count
+        summary["status_by_priority"][priority][status] += bucket.issue_count
+    return summary
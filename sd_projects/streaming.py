@@ -0,0 +1,116 @@
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Iterable, Iterator
+from django.core.handlers import asgi
+from django.db import connections
+from django.http import HttpRequest, StreamingHttpResponse
+
+_END = object()
+
+
+class ThreadedIterator:
+    """
+    Iterate a generator reading the database in a thread of its own, handing its items over through a bounded queue.
+
+    Django 4.1 iterates the content of streaming responses from the event loop under ASGI, where the database
+    cannot be used. Iterated asynchronously, by the `ASGIHandler` of this module, the items are awaited without
+    blocking the event loop. The thread starts on the first item, and stops when the response is closed, e.g.
+    when the client disconnected.
+    """
+
+    def __init__(self, iterable: Iterable[Any], max_size: int = 4) -> None:
+        self.iterable = iterable
+        self.queue: queue.Queue[tuple[Any, BaseException | None]] = queue.Queue(max_size)
+        self.closed = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def put(self, item: Any, error: BaseException | None = None) -> bool:
+        while not self.closed.is_set():
+            try:
+                self.queue.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(self) -> None:
+        try:
+            for item in self.iterable:
+                if not self.put(item):
+                    return
+            self.put(_END)
+        except BaseException as error:
+            self.put(_END, error)
+        finally:
+            getattr(self.iterable, "close", lambda: None)()
+            connections.close_all()
+
+    def start(self) -> None:
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.produce, daemon=True)
+            self.thread.start()
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        self.start()
+        item, error = self.queue.get()
+        if item is _END:
+            if error is not None:
+                raise error
+            raise StopIteration
+        return item
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        self.start()
+        item, error = await asyncio.to_thread(self.queue.get)
+        if item is _END:
+            if error is not None:
+                raise error
+            raise StopAsyncIteration
+        return item
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def stream_from(request: HttpRequest, iterable: Iterable[Any], **kwargs) -> StreamingHttpResponse:
+    """
+    Return a streaming response of bytes read from the database, moved to a thread when served by ASGI and then
+    sent asynchronously by `ASGIHandler`.
+    """
+    http_request = getattr(request, "_request", request)
+    if not isinstance(http_request, asgi.ASGIRequest):
+        return StreamingHttpResponse(iterable, **kwargs)
+    content = ThreadedIterator(iterable)
+    response = StreamingHttpResponse(content, **kwargs)
+    response.async_streaming_content = content  # type: ignore[attr-defined]
+    return response
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """
+    ASGI handler awaiting each chunk of the streaming responses made by `stream_from`, as Django 4.2 does with
+    the asynchronous iterators, instead of iterating them from the event loop.
+    """
+
+    async def send_response(self, response, send):
+        content = getattr(response, "async_streaming_content", None)
+        if content is None:
+            return await super().send_response(response, send)
+        # The handler of Django sends the headers and the closing message, the chunks are sent in between
+        response.streaming_content = ()
+
+        async def send_with_content(message):
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                async for part in content:
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send(message)
+
+        await super().send_response(response, send_with_content)
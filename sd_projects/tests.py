@@ -1,3 +1,1401 @@
-from django.test import TestCase
+import asyncio
+import base64
+import copy
+import datetime
+import decimal
+import io
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import tempfile
+import time
+import uuid
+from typing import Any
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIRequest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections, models, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import BasePermission
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+from . import async_views
+from .authentication import token_user_cache
+from .instrumentation import request_metrics
+from .membership import MembershipCache, membership_cache
+from .passwords import hashing_pool
+from .responses import response_cache
+from .routers import recent_writes
+from .parsers import ORJSONParser
+from .pooling import ConnectionPool, PoolTimeout, close_pool, get_pool
+from .renderers import ORJSONRenderer
+from .search import term_frequency_cache
+from .serializers import IssueSerializer
+from .sqlite.base import get_write_lock
+from .streaming import ASGIHandler, stream_from
+from .models import Comment, Contributor, ImportCheckpoint, ImportedIssue, Issue, Project, ProjectStatistics, ProjectVersion, User
+from .urls import get_urls
 
-# Create your tests here.
+
+class SoftDeskTestCase(APITestCase):
+    """
+    Empties the cross-request caches of the process before each test, and creates the users, projects, contributors
+    and issues of the tests.
+    """
+
+    def setUp(self) -> None:
+        self.reset_caches()
+
+    def reset_caches(self, *caches) -> None:
+        """
+        Empty the given caches, every cache by default.
+        """
+        for cache in caches or (membership_cache, response_cache, token_user_cache, term_frequency_cache, recent_writes, request_metrics):
+            cache.configure()
+
+    def create_fixture(self) -> None:
+        """
+        Create `owner`, with the password "owner-password", and `project`, of which it is the owner.
+        """
+        self.owner = User.objects.create_user("owner", password="owner-password", first_name="Owner", last_name="Project")
+        self.project = self.create_project()
+
+    def create_project(self, title: str = "Project", author: User | None = None, **fields) -> Project:
+        author = author or self.owner
+        project = Project.objects.create(
+            title=title, author=author, **{"description": "", "type": Project.ProjectType.BACKEND, **fields},
+        )
+        self.add_contributor(author, project, role=Contributor.ContributorRole.OWNER)
+        return project
+
+    def add_contributor(
+        self,
+        user: User,
+        project: Project | None = None,
+        role: int = Contributor.ContributorRole.CONTRIBUTOR,
+        permission: int = Contributor.ContributorPermission.DELETE,
+    ) -> Contributor:
+        return Contributor.objects.create(user=user, project=project or self.project, role=role, permission=permission)
+
+    def create_issue(self, project: Project | None = None, author: User | None = None, **fields) -> Issue:
+        return Issue.objects.create(
+            project=project or self.project,
+            author=author or self.owner,
+            **{
+                "title": "Issue",
+                "description": "Description",
+                "status": Issue.IssueStatus.TODO,
+                "tag": Issue.IssueTag.BUG,
+                "priority": Issue.IssuePriority.LOW,
+                **fields,
+            },
+        )
+
+
+class QueryBudgetTestCase(SoftDeskTestCase):
+    """
+    Every endpoint must run a fixed maximum number of SQL queries, whatever the number of rows it renders.
+    Each budget is checked against a small and a large dataset, with a cold membership cache.
+    The budgets count the project version lookup of the reads, and the project version bump and the statistics
+    updates of the writes.
+    """
+
+    ROW_COUNTS = (1, 30)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.issue = self.create_issue()
+        self.comment = Comment.objects.create(description="Comment", author=self.owner, issue=self.issue)
+        self.client.force_authenticate(self.owner)
+
+    def seed(self, count: int) -> None:
+        first = User.objects.count()
+        for index in range(first, first + count):
+            user = User.objects.create_user(f"user-{index}", first_name="User", last_name=str(index))
+            self.add_contributor(user, permission=Contributor.ContributorPermission.WRITE)
+            project = Project.objects.create(title=f"Project {index}", type=Project.ProjectType.IOS, author=user)
+            self.add_contributor(self.owner, project, permission=Contributor.ContributorPermission.READ)
+            issue = self.create_issue(assigned=user)
+            Comment.objects.create(description="Comment", author=user, issue=self.issue)
+            Comment.objects.create(description="Comment", author=user, issue=issue)
+
+    def request(self, method: str, url: str, data: dict | None = None, **headers) -> tuple[int, int]:
+        self.reset_caches()
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format="json", **headers)
+        return response.status_code, len(context)
+
+    def assertQueryBudget(self, budget: int, url: str, expected_status: int = status.HTTP_200_OK) -> None:
+        seeded = 0
+        for count in self.ROW_COUNTS:
+            self.seed(count - seeded)
+            seeded = count
+            with self.subTest(url=url, rows=count):
+                status_code, queries = self.request("get", url)
+                self.assertEqual(status_code, expected_status)
+                self.assertLessEqual(queries, budget, f"{url} ran {queries} queries for {count} rows, budget is {budget}")
+
+    def test_projects(self) -> None:
+        self.assertQueryBudget(2, "/projects/")
+
+    def test_project(self) -> None:
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/")
+
+    def test_contributors(self) -> None:
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/users/")
+
+    def test_contributor(self) -> None:
+        contributor = Contributor.objects.get(user=self.owner, project=self.project)
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/users/{contributor.pk}/")
+
+    def test_issues(self) -> None:
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/issues/")
+
+    def test_issue(self) -> None:
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/issues/{self.issue.pk}/")
+
+    def test_comments(self) -> None:
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/")
+
+    def test_comment(self) -> None:
+        self.assertQueryBudget(3, f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/{self.comment.pk}/")
+
+    def test_statistics(self) -> None:
+        url = f"/projects/{self.project.pk}/stats/"
+        self.assertQueryBudget(3, url)
+        statistics = self.client.get(url).json()
+        self.assertEqual(statistics["issues"], Issue.objects.filter(project=self.project).count())
+        self.assertEqual(statistics["comments"], Comment.objects.filter(issue__project=self.project).count())
+
+    def test_issue_writes(self) -> None:
+        data = {"title": "Title", "description": "Description", "status": 1, "tag": 0, "priority": 0, "assigned": self.owner.pk}
+        status_code, queries = self.request("post", f"/projects/{self.project.pk}/issues/", data)
+        self.assertEqual(status_code, status.HTTP_201_CREATED)
+        # The created issue is the first of its statistics bucket
+        self.assertLessEqual(queries, 7)
+        status_code, queries = self.request("put", f"/projects/{self.project.pk}/issues/{self.issue.pk}/", data)
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertLessEqual(queries, 8)
+
+    def test_comment_writes(self) -> None:
+        data = {"description": "Updated"}
+        status_code, queries = self.request("post", f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/", data)
+        self.assertEqual(status_code, status.HTTP_201_CREATED)
+        self.assertLessEqual(queries, 5)
+        status_code, queries = self.request("put", f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/{self.comment.pk}/", data)
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertLessEqual(queries, 4)
+
+    def test_related_users(self) -> None:
+        users = [User.objects.create_user(f"user-{index}") for index in range(5)]
+        for user in users:
+            self.add_contributor(user)
+            self.create_issue(author=user, assigned=users[0])
+        issues = Issue.objects.filter(project=self.project).order_by("id")
+        with CaptureQueriesContext(connection) as context:
+            data = IssueSerializer(issues, many=True).data
+        # The distinct authors, then the assigned users, are each loaded by one query
+        self.assertEqual([query["sql"].count('"auth_user"') > 0 for query in context.captured_queries], [False, True, True])
+        self.assertEqual([issue["author"]["id"] for issue in data], [self.owner.pk, *(user.pk for user in users)])
+        self.assertEqual({issue["assigned"] and issue["assigned"]["id"] for issue in data}, {None, users[0].pk})
+        # The users loaded by select_related are reused
+        with CaptureQueriesContext(connection) as context:
+            IssueSerializer(issues.select_related("author", "assigned"), many=True).data
+        self.assertEqual(len(context), 1)
+
+    def test_not_modified(self) -> None:
+        url = f"/projects/{self.project.pk}/issues/"
+        etag = self.client.get(url)["ETag"]
+        status_code, queries = self.request("get", url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertLessEqual(queries, 2)
+        self.client.patch(f"{url}{self.issue.pk}/", {"status": Issue.IssueStatus.FINISHED}, format="json")
+        status_code, _ = self.request("get", url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status_code, status.HTTP_200_OK)
+
+
+class PaginationTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.issues = [self.create_issue(title=f"Issue {index}", priority=index % 3) for index in range(5)]
+        self.url = f"/projects/{self.project.pk}/issues/"
+        self.client.force_authenticate(self.owner)
+
+    def get_ids(self, url: str, **params) -> tuple[list[int], dict]:
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        return [issue["id"] for issue in data["results"]], data
+
+    def make_cursor(self, position: list, ordering: list[str]) -> str:
+        payload = json.dumps({"p": position, "o": ordering, "r": False}).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def test_traversal(self) -> None:
+        expected = [issue.pk for issue in self.issues]
+        ids, data = self.get_ids(self.url, page_size=2)
+        while data["next"]:
+            page, data = self.get_ids(data["next"])
+            ids += page
+        self.assertEqual(ids, expected)
+        # Back from the last page
+        ids = [issue["id"] for issue in data["results"]]
+        while data["previous"]:
+            page, data = self.get_ids(data["previous"])
+            ids = page + ids
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self) -> None:
+        ordering = ["created_time", "id"]
+        cursors = [
+            "not-a-cursor",
+            self.make_cursor([], ordering),
+            self.make_cursor([self.issues[0].created_time.isoformat()], ordering),
+            self.make_cursor(["x", "y"], ordering),
+            self.make_cursor([None, 1], ordering),
+            self.make_cursor([self.issues[0].created_time.isoformat(), {"id": 1}], ordering),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {"cursor": cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f"/projects/{self.project.pk}/users/", {"cursor": self.make_cursor(["x"], ["id"])})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_ordering(self) -> None:
+        _, data = self.get_ids(self.url, page_size=1, ordering="-priority")
+        cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+        self.assertEqual(self.client.get(self.url, {"cursor": cursor}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get(self.url, {"cursor": cursor, "ordering": "-priority"}).status_code, status.HTTP_200_OK,
+        )
+
+
+class PermissionsTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.author = User.objects.create_user("author")
+        self.add_contributor(self.author, permission=Contributor.ContributorPermission.WRITE)
+        self.other = User.objects.create_user("other")
+        self.add_contributor(self.other, permission=Contributor.ContributorPermission.WRITE)
+        self.issue = self.create_issue(author=self.author)
+        self.comment = Comment.objects.create(description="Comment", author=self.author, issue=self.issue)
+        self.issue_url = f"/projects/{self.project.pk}/issues/{self.issue.pk}/"
+        self.comment_url = f"{self.issue_url}comments/{self.comment.pk}/"
+
+    def request(self, user: User, method: str, url: str, data: dict | None = None) -> tuple[int, int]:
+        """
+        Send a request with a cold membership cache, return its status and its number of membership lookups.
+        """
+        self.reset_caches(membership_cache, response_cache)
+        self.client.force_authenticate(user)
+        with mock.patch.object(MembershipCache, "load", autospec=True, side_effect=MembershipCache.load) as load:
+            response = getattr(self.client, method)(url, data, format="json")
+        return response.status_code, load.call_count
+
+    def test_not_author(self) -> None:
+        for method, url, data in (
+            ("patch", self.issue_url, {"title": "Edited"}),
+            ("patch", self.comment_url, {"description": "Edited"}),
+            ("delete", self.comment_url, None),
+            ("delete", self.issue_url, None),
+        ):
+            with self.subTest(method=method, url=url):
+                self.assertEqual(self.request(self.other, method, url, data), (status.HTTP_403_FORBIDDEN, 1))
+        self.assertEqual(Issue.objects.get(pk=self.issue.pk).title, "Issue")
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+        # Reading stays allowed to every contributor
+        self.assertEqual(self.request(self.other, "get", self.issue_url), (status.HTTP_200_OK, 1))
+
+    def test_author_and_owner(self) -> None:
+        for user in (self.author, self.owner):
+            with self.subTest(user=user.username):
+                self.assertEqual(self.request(user, "patch", self.issue_url, {"title": user.username}), (status.HTTP_200_OK, 1))
+                self.assertEqual(self.request(user, "patch", self.comment_url, {"description": user.username}), (status.HTTP_200_OK, 1))
+        self.assertEqual(self.request(self.owner, "delete", self.comment_url), (status.HTTP_204_NO_CONTENT, 1))
+        self.assertEqual(self.request(self.author, "delete", self.issue_url), (status.HTTP_204_NO_CONTENT, 1))
+
+
+class MembershipCacheTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.user = User.objects.create_user("contributor")
+        self.contributor = self.add_contributor(self.user, permission=Contributor.ContributorPermission.READ)
+        self.key = (self.user.pk, self.project.pk)
+
+    def lookup(self, cache: MembershipCache | None = None) -> tuple[Any, int]:
+        with CaptureQueriesContext(connection) as context:
+            entry = (cache or membership_cache).get(*self.key)
+        return entry, len(context)
+
+    def test_counters(self) -> None:
+        entry = (self.contributor.pk, Contributor.ContributorRole.CONTRIBUTOR, Contributor.ContributorPermission.READ)
+        self.assertEqual(self.lookup(), (entry, 1))
+        self.assertEqual(self.lookup(), (entry, 0))
+        # Negative lookups are cached as well
+        self.assertIsNone(membership_cache.get(self.user.pk, 0))
+        self.assertIsNone(membership_cache.get(self.user.pk, 0))
+        self.assertEqual(membership_cache.stats(), {"size": 2, "hits": 2, "shared_hits": 0, "misses": 2, "hit_ratio": 0.5})
+
+    def test_ttl(self) -> None:
+        with self.settings(SOFTDESK_MEMBERSHIP_CACHE={"TTL": 10}), mock.patch("sd_projects.caching.time") as clock:
+            clock.monotonic.return_value = 100.0
+            self.assertEqual(self.lookup()[1], 1)
+            clock.monotonic.return_value = 109.0
+            self.assertEqual(self.lookup()[1], 0)
+            clock.monotonic.return_value = 110.0
+            self.assertEqual(self.lookup()[1], 1)
+            self.assertEqual(membership_cache.stats()["misses"], 2)
+
+    def test_max_size(self) -> None:
+        with self.settings(SOFTDESK_MEMBERSHIP_CACHE={"MAX_SIZE": 1}):
+            self.lookup()
+            membership_cache.get(self.owner.pk, self.project.pk)
+            self.assertEqual(membership_cache.local_keys(), [(self.owner.pk, self.project.pk)])
+
+    def test_invalidation(self) -> None:
+        self.lookup()
+        self.contributor.role = Contributor.ContributorRole.OWNER
+        self.contributor.save()
+        entry, queries = self.lookup()
+        self.assertEqual((entry[1], queries), (Contributor.ContributorRole.OWNER, 1))
+        # A save of the project drops the entries of its contributors
+        self.lookup()
+        self.project.save()
+        self.assertEqual(self.lookup()[1], 1)
+        self.contributor.delete()
+        self.assertEqual(self.lookup(), (None, 1))
+
+    def test_invalidation_on_commit(self) -> None:
+        entry, _ = self.lookup()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.contributor.delete()
+                # A concurrent request reads the committed row before the commit
+                membership_cache.set(self.key, entry)
+            self.assertEqual(self.lookup(), (entry, 0))
+        self.assertEqual(self.lookup(), (None, 1))
+        key = (self.owner.pk, self.project.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.project.delete()
+                membership_cache.set(key, entry)
+            self.assertEqual(membership_cache.get(*key), entry)
+        self.assertIsNone(membership_cache.get(*key))
+
+    def test_shared_tier(self) -> None:
+        caches["default"].clear()
+        self.addCleanup(caches["default"].clear)
+        with self.settings(SOFTDESK_MEMBERSHIP_CACHE={"BACKEND": "default"}):
+            entry, queries = self.lookup()
+            self.assertEqual(queries, 1)
+            # Another process finds the entry in the shared cache
+            other = MembershipCache()
+            self.assertEqual(self.lookup(other), (entry, 0))
+            self.assertEqual((other.stats()["shared_hits"], other.stats()["misses"]), (1, 0))
+            # The invalidations of this process reach the shared cache
+            self.contributor.permission = Contributor.ContributorPermission.WRITE
+            self.contributor.save()
+            entry, queries = self.lookup(MembershipCache())
+            self.assertEqual((entry[2], queries), (Contributor.ContributorPermission.WRITE, 1))
+
+
+class IssueFiltersTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.user = User.objects.create_user("contributor")
+        self.add_contributor(self.user)
+        self.issues = [
+            self.create_issue(status=Issue.IssueStatus.TODO, priority=Issue.IssuePriority.HIGH, assigned=self.user),
+            self.create_issue(status=Issue.IssueStatus.PENDING, priority=Issue.IssuePriority.LOW, author=self.user),
+            self.create_issue(status=Issue.IssueStatus.FINISHED, priority=Issue.IssuePriority.AVERAGE, assigned=self.owner),
+        ]
+        for day, issue in enumerate(self.issues, start=1):
+            Issue.objects.filter(pk=issue.pk).update(created_time=datetime.datetime(2024, 1, day, 12))
+        self.client.force_authenticate(self.owner)
+
+    def get(self, expected_status: int = status.HTTP_200_OK, **params) -> Any:
+        response = self.client.get(f"/projects/{self.project.pk}/issues/", params)
+        self.assertEqual(response.status_code, expected_status, response.data)
+        return [result["id"] for result in response.data["results"]] if expected_status == status.HTTP_200_OK else response.data
+
+    def test_choices(self) -> None:
+        self.assertEqual(self.get(status="0,2"), [self.issues[0].pk, self.issues[2].pk])
+        self.assertEqual(self.get(status="1", priority="0"), [self.issues[1].pk])
+        for params in ({"status": "7"}, {"priority": "0,3"}, {"tag": "bug"}):
+            with self.subTest(**params):
+                self.assertIn(next(iter(params)), self.get(status.HTTP_400_BAD_REQUEST, **params))
+
+    def test_users(self) -> None:
+        self.assertEqual(self.get(assigned="null"), [self.issues[1].pk])
+        self.assertEqual(self.get(assigned=f"{self.user.pk},{self.owner.pk}"), [self.issues[0].pk, self.issues[2].pk])
+        self.assertEqual(self.get(author=self.user.pk, assigned="null"), [self.issues[1].pk])
+        self.assertIn("author", self.get(status.HTTP_400_BAD_REQUEST, author="me"))
+
+    def test_created_range(self) -> None:
+        self.assertEqual(self.get(created_after="2024-01-02"), [self.issues[1].pk, self.issues[2].pk])
+        self.assertEqual(self.get(created_before="2024-01-02T12:00:00"), [self.issues[0].pk])
+        self.assertEqual(self.get(created_after="2024-01-01T13:00", created_before="2024-01-03"), [self.issues[1].pk])
+        self.assertIn("created_after", self.get(status.HTTP_400_BAD_REQUEST, created_after="2024-13-01"))
+
+    def test_ordering(self) -> None:
+        self.assertEqual(self.get(ordering="-priority"), [self.issues[0].pk, self.issues[2].pk, self.issues[1].pk])
+        self.assertEqual(self.get(ordering="-created_time", page_size=1), [self.issues[2].pk])
+        for ordering in ("title", "-author__password", "status,"):
+            with self.subTest(ordering=ordering):
+                self.assertIn("ordering", self.get(status.HTTP_400_BAD_REQUEST, ordering=ordering))
+
+
+class BulkEndpointsTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.contributor = User.objects.create_user("contributor", first_name="Other", last_name="Contributor")
+        self.add_contributor(self.contributor, permission=Contributor.ContributorPermission.WRITE)
+        self.outsider = User.objects.create_user("outsider")
+        self.issues = [self.create_issue(title=f"Issue {index}") for index in range(2)]
+        self.url = f"/projects/{self.project.pk}/issues/bulk/"
+        self.client.force_authenticate(self.owner)
+
+    def make_item(self, **fields) -> dict:
+        return {"title": "Bulk", "description": "Description", "status": 0, "tag": 0, "priority": 0, **fields}
+
+    def test_create(self) -> None:
+        response = self.client.post(self.url, [self.make_item(), self.make_item(assigned=self.contributor.pk)], format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Issue.objects.filter(title="Bulk", author=self.owner).count(), 2)
+        url = f"/projects/{self.project.pk}/issues/{self.issues[0].pk}/comments/bulk/"
+        response = self.client.post(url, [{"description": "First"}, {"description": "Second"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Comment.objects.filter(issue=self.issues[0]).count(), 2)
+
+    def test_max_items(self) -> None:
+        with self.settings(SOFTDESK_BULK_MAX_ITEMS=2):
+            response = self.client.post(self.url, [self.make_item()] * 3, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Issue.objects.filter(title="Bulk").exists())
+
+    def test_atomic(self) -> None:
+        response = self.client.post(self.url, [self.make_item(), self.make_item(title="")], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("title", response.data[1])
+        self.assertFalse(Issue.objects.filter(title="Bulk").exists())
+        response = self.client.patch(self.url, [{"id": self.issues[0].pk, "title": "Updated"}, {"id": 0, "title": "Updated"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[1], {"id": ["Not found."]})
+        self.assertFalse(Issue.objects.filter(title="Updated").exists())
+
+    def test_assigned_collaborator(self) -> None:
+        response = self.client.post(self.url, [self.make_item(assigned=self.outsider.pk)], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data[0])
+        response = self.client.patch(self.url, [{"id": self.issues[0].pk, "assigned": self.outsider.pk}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNone(Issue.objects.get(pk=self.issues[0].pk).assigned_id)
+
+    def test_not_author(self) -> None:
+        self.client.force_authenticate(self.contributor)
+        response = self.client.patch(self.url, [{"id": self.issues[0].pk, "title": "Updated"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data[0])
+        response = self.client.delete(self.url, [self.issues[0].pk], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Issue.objects.filter(pk=self.issues[0].pk, title="Issue 0").count(), 1)
+
+    def test_delete(self) -> None:
+        response = self.client.delete(self.url, [self.issues[0].pk, 0, "x"], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, [{}, {"id": ["Not found."]}, {"id": ["Not found."]}])
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 2)
+        response = self.client.delete(self.url, [issue.pk for issue in self.issues], format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Issue.objects.filter(project=self.project).exists())
+
+    def test_update(self) -> None:
+        updated_time = self.issues[0].updated_time
+        url = f"/projects/{self.project.pk}/issues/{self.issues[0].pk}/comments/bulk/"
+        comment = Comment.objects.create(description="Comment", author=self.owner, issue=self.issues[0])
+        response = self.client.patch(self.url, [{"id": self.issues[0].pk, "title": "Updated"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        issue = Issue.objects.get(pk=self.issues[0].pk)
+        self.assertEqual(issue.title, "Updated")
+        self.assertGreater(issue.updated_time, updated_time)
+        self.assertEqual(response.data[0]["updated_time"], IssueSerializer(issue).data["updated_time"])
+        response = self.client.put(url, [{"id": comment.pk, "description": "Updated"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(Comment.objects.get(pk=comment.pk).updated_time, comment.updated_time)
+
+    def test_repeated_id(self) -> None:
+        pk = self.issues[0].pk
+        response = self.client.patch(self.url, [{"id": pk, "title": "First"}, {"id": pk, "title": "Second"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, [{}, {"id": ["Given more than once."]}])
+        self.assertEqual(Issue.objects.get(pk=pk).title, "Issue 0")
+        response = self.client.delete(self.url, [pk, pk], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Issue.objects.filter(pk=pk).exists())
+
+
+class StatisticsTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.issue = self.create_issue()
+        Comment.objects.create(description="Comment", author=self.owner, issue=self.issue)
+
+    def get_buckets(self) -> dict[tuple[int, int, int], tuple[int, int]]:
+        return {
+            (bucket.status, bucket.tag, bucket.priority): (bucket.issue_count, bucket.comment_count)
+            for bucket in ProjectStatistics.objects.filter(project=self.project)
+            if bucket.issue_count or bucket.comment_count
+        }
+
+    def test_update(self) -> None:
+        self.issue.status = Issue.IssueStatus.FINISHED
+        self.issue.save()
+        self.assertEqual(self.get_buckets(), {(Issue.IssueStatus.FINISHED, Issue.IssueTag.BUG, Issue.IssuePriority.LOW): (1, 1)})
+
+    def test_endpoint(self) -> None:
+        url = f"/projects/{self.project.pk}/stats/"
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["issues"], response.data["comments"]), (1, 1))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.force_authenticate(User.objects.create_user("other"))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_update_without_loaded_bucket(self) -> None:
+        issues = (
+            Issue.objects.only("id", "project_id").get(pk=self.issue.pk),
+            Issue(pk=self.issue.pk, **{
+                field: getattr(self.issue, field)
+                for field in ("title", "description", "tag", "priority", "project_id", "author_id", "created_time")
+            }),
+        )
+        for status_value, issue in zip((Issue.IssueStatus.PENDING, Issue.IssueStatus.FINISHED), issues):
+            with self.subTest(issue=issue):
+                issue.status = status_value
+                issue.tag = Issue.IssueTag.BUG
+                issue.priority = Issue.IssuePriority.LOW
+                # The bucket left is loaded with one query, the statistics are not rebuilt
+                with CaptureQueriesContext(connection) as context:
+                    issue.save()
+                self.assertFalse([query for query in context.captured_queries if "DELETE" in query["sql"]])
+                self.assertEqual(self.get_buckets(), {(status_value, Issue.IssueTag.BUG, Issue.IssuePriority.LOW): (1, 1)})
+
+
+class ProjectScopeTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.other = User.objects.create_user("other")
+        self.other_project = self.create_project("Other project", self.other)
+        self.shared_project = self.create_project("Shared project")
+        self.add_contributor(self.other, self.shared_project, permission=Contributor.ContributorPermission.READ)
+        self.client.force_authenticate(self.other)
+
+    def test_list(self) -> None:
+        response = self.client.get("/projects/", {"embed": "role"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        roles = {project["id"]: project["role"] for project in response.json()["results"]}
+        self.assertEqual(roles, {
+            self.other_project.pk: Contributor.ContributorRole.OWNER,
+            self.shared_project.pk: Contributor.ContributorRole.CONTRIBUTOR,
+        })
+
+    def test_etag(self) -> None:
+        # {1, 4} and {2, 3} share the number of projects, the sum of their ids and of their versions
+        projects = [self.other_project, self.shared_project, *(self.create_project(f"Project {index}") for index in range(2))]
+        Contributor.objects.filter(user=self.other).delete()
+        for project in (projects[0], projects[3]):
+            self.add_contributor(self.other, project)
+        ProjectVersion.objects.filter(project__in=projects).update(version=1)
+        etag = self.client.get("/projects/")["ETag"]
+        Contributor.objects.filter(user=self.other).delete()
+        for project in (projects[1], projects[2]):
+            self.add_contributor(self.other, project)
+        ProjectVersion.objects.filter(project__in=projects).update(version=1)
+        response = self.client.get("/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([project["id"] for project in response.json()["results"]], [projects[1].pk, projects[2].pk])
+
+    def test_not_member(self) -> None:
+        for url in (f"/projects/{self.project.pk}/", f"/projects/{self.project.pk}/issues/"):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn(response.status_code, (status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND))
+                self.assertNotIn(self.project.title, response.content.decode())
+
+
+class TokenAuthenticationTestCase(SoftDeskTestCase):
+    """
+    The user of an access token is built from its claims, the database is only read to check the revocation
+    list on a miss of the token user cache.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user("member", password="member-password", first_name="Member", last_name="User")
+        self.tokens = self.login()
+
+    def login(self) -> dict[str, str]:
+        response = self.client.post("/login/", {"username": "member", "password": "member-password"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_claims_user(self) -> None:
+        self.assertEqual(self.client.get("/projects/").status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post("/projects/", {"title": "Project", "description": "", "type": 0}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(
+            [query for query in context.captured_queries if query["sql"].startswith('SELECT') and '"auth_user"' in query["sql"]],
+            "The user must be built from the claims",
+        )
+        self.assertEqual(response.data["author"], {"id": self.user.pk, "first_name": "Member", "last_name": "User"})
+
+    def test_revocation(self) -> None:
+        self.assertEqual(self.client.post("/login/revoke/").status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get("/projects/").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post("/login/refresh/", {"refresh": self.tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        self.login()
+        self.assertEqual(self.client.get("/projects/").status_code, status.HTTP_200_OK)
+
+    def test_inactive_user(self) -> None:
+        self.assertEqual(self.client.get("/projects/").status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/projects/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RegistrationTestCase(APITestCase):
+
+    data = {
+        "username": "new-user",
+        "password": "Uncommon-Password-42",
+        "password2": "Uncommon-Password-42",
+        "first_name": "New",
+        "last_name": "User",
+    }
+
+    def test_register(self) -> None:
+        response = self.client.post("/register/", self.data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username="new-user")
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertTrue(user.check_password(self.data["password"]))
+
+    def test_common_password(self) -> None:
+        response = self.client.post("/register/", {**self.data, "password": "password", "password2": "password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", response.data)
+
+    def test_hashing_pool(self) -> None:
+        with self.settings(SOFTDESK_PASSWORD_HASHING={"POOL_SIZE": 1, "POOL_QUEUE": 0, "POOL_TIMEOUT": 0}):
+            response = self.client.post("/register/", self.data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            hashing_pool._slots.acquire()  # type: ignore[union-attr]
+            try:
+                response = self.client.post("/register/", {**self.data, "username": "other-user"})
+            finally:
+                hashing_pool._slots.release()  # type: ignore[union-attr]
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class AsyncViewsTestCase(SoftDeskTestCase):
+    """
+    The async views render the same responses as the synchronous ones, with the same query budgets.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.issue = self.create_issue()
+        self.comment = Comment.objects.create(description="Comment", author=self.owner, issue=self.issue)
+        response = self.client.post("/login/", {"username": "owner", "password": "owner-password"})
+        self.authorization = f"Bearer {response.data['access']}"
+
+    def assertSameResponse(self, url: str, async_view_class, budget: int, **kwargs) -> None:
+        expected = self.client.get(url, HTTP_AUTHORIZATION=self.authorization)
+        request = APIRequestFactory().get(url, HTTP_AUTHORIZATION=self.authorization)
+        # The token user stays cached, as for the synchronous request
+        self.reset_caches(membership_cache, response_cache)
+        with CaptureQueriesContext(connection) as context:
+            response = async_to_sync(async_view_class.as_view())(request, **kwargs)
+        response.render()
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.get("ETag"), expected.get("ETag"))
+        self.assertLessEqual(len(context), budget)
+
+    def test_projects(self) -> None:
+        self.assertSameResponse("/projects/?embed=role,statistics", async_views.AsyncProjectsAPIView, 3)
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/", async_views.AsyncProjectIndexedAPIView, 3, project_id=self.project.pk,
+        )
+
+    def test_issues(self) -> None:
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/issues/?status=0&ordering=-priority",
+            async_views.AsyncProjectIssueAPIView, 3, project_id=self.project.pk,
+        )
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/",
+            async_views.AsyncProjectIssueIndexedAPIView, 3, project_id=self.project.pk, issue_id=self.issue.pk,
+        )
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/issues/0/",
+            async_views.AsyncProjectIssueIndexedAPIView, 3, project_id=self.project.pk, issue_id=0,
+        )
+
+    def test_comments(self) -> None:
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/",
+            async_views.AsyncProjectCommentsAPIView, 3, project_id=self.project.pk, issue_id=self.issue.pk,
+        )
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/{self.comment.pk}/",
+            async_views.AsyncProjectCommentsIndexedAPIView, 3,
+            project_id=self.project.pk, issue_id=self.issue.pk, comment_id=self.comment.pk,
+        )
+
+    def test_not_member(self) -> None:
+        User.objects.create_user("other", password="other-password")
+        response = self.client.post("/login/", {"username": "other", "password": "other-password"})
+        self.authorization = f"Bearer {response.data['access']}"
+        self.assertSameResponse(
+            f"/projects/{self.project.pk}/issues/", async_views.AsyncProjectIssueAPIView, 1, project_id=self.project.pk,
+        )
+
+
+class ProjectExportTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        for index in range(3):
+            issue = self.create_issue(title=f"Issue {index}")
+            for _ in range(index):
+                Comment.objects.create(description="Comment", author=self.owner, issue=issue)
+        self.client.force_authenticate(self.owner)
+
+    def test_export(self) -> None:
+        with self.settings(SOFTDESK_EXPORT_CHUNK_SIZE=2):
+            response = self.client.get(f"/projects/{self.project.pk}/export/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([line["type"] for line in lines], [
+            "project", "issue", "issue", "comment", "issue", "comment", "comment",
+        ])
+        self.assertEqual(lines[0]["data"]["id"], self.project.pk)
+        self.assertEqual(lines[3]["issue"], lines[2]["data"]["id"])
+        self.assertIn("ETag", response)
+
+    def test_not_member(self) -> None:
+        self.client.force_authenticate(User.objects.create_user("other"))
+        response = self.client.get(f"/projects/{self.project.pk}/export/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_asgi_stream(self) -> None:
+        def slow_chunks():
+            for index in range(3):
+                time.sleep(0.05)
+                yield f"{index}\n".encode()
+
+        request = ASGIRequest({"type": "http", "method": "GET", "path": "/", "headers": []}, io.BytesIO())
+        export = stream_from(request, slow_chunks(), content_type="application/x-ndjson")
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async def serve() -> int:
+            ticks = 0
+            task = asyncio.ensure_future(ASGIHandler().send_response(export, send))
+            # The event loop keeps running while the chunks are produced
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            await task
+            return ticks
+
+        self.assertGreater(async_to_sync(serve)(), 5)
+        self.assertEqual(messages[0]["type"], "http.response.start")
+        self.assertEqual(b"".join(message.get("body", b"") for message in messages[1:]), b"0\n1\n2\n")
+        self.assertEqual(messages[-1], {"type": "http.response.body"})
+
+
+class ImportProjectTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.owner = User.objects.create_user("owner", first_name="Owner", last_name="Project")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as output:
+            output.write(content)
+        return path
+
+    def test_export_round_trip(self) -> None:
+        project = Project.objects.create(title="Project", description="", type=Project.ProjectType.BACKEND, author=self.owner)
+        Contributor.objects.create(
+            user=self.owner,
+            project=project,
+            permission=Contributor.ContributorPermission.DELETE,
+            role=Contributor.ContributorRole.OWNER,
+        )
+        for index in range(5):
+            issue = Issue.objects.create(
+                title=f"Issue {index}",
+                description="Description",
+                status=index % 3,
+                tag=Issue.IssueTag.BUG,
+                priority=Issue.IssuePriority.HIGH,
+                project=project,
+                author=self.owner,
+                assigned=self.owner,
+            )
+            for _ in range(index):
+                Comment.objects.create(description="Comment", author=self.owner, issue=issue)
+        self.client.force_authenticate(self.owner)
+        export = b"".join(self.client.get(f"/projects/{project.pk}/export/").streaming_content)
+        path = self.write("project.ndjson", export)
+
+        call_command("import_project", path, title="Copy", default_user="owner", chunk_size=4, stdout=io.StringIO())
+        copy = Project.objects.get(title="Copy")
+        self.assertEqual(copy.author, self.owner)
+        self.assertEqual(
+            list(Issue.objects.filter(project=copy).order_by("id").values_list("title", "status", "assigned", "created_time")),
+            list(Issue.objects.filter(project=project).order_by("id").values_list("title", "status", "assigned", "created_time")),
+        )
+        self.assertEqual(Comment.objects.filter(issue__project=copy).count(), 10)
+        response = self.client.get(f"/projects/{copy.pk}/stats/")
+        self.assertEqual(response.data, self.client.get(f"/projects/{project.pk}/stats/").data)
+        self.assertFalse(ImportedIssue.objects.exists())
+        with self.assertRaises(CommandError):
+            call_command("import_project", path, title="Copy", default_user="owner", stdout=io.StringIO())
+
+    def test_resume(self) -> None:
+        User.objects.create_user("member")
+        header = b"record,id,issue,title,description,type,status,tag,priority,author,user,permission\n"
+        rows = [
+            b"project,,,CSV,,0,,,,owner,,\n",
+            b"contributor,,,,,,,,,,member,2\n",
+            b"issue,a,,First,\"Multi\nline\",,0,0,0,member,,\n",
+            b"comment,,a,,Comment,,,,,owner,,\n",
+        ]
+        invalid = b"issue,b,,Second,Description,,9,0,0,owner,,\n"
+        valid = b"issue,b,,Second,Description,,1,0,0,owner,,\n"
+        comment = b"comment,,b,,Comment,,,,,member,,\n"
+        path = self.write("project.csv", header + b"".join(rows) + invalid + comment)
+
+        with self.assertRaisesMessage(CommandError, "Line 7: status"):
+            call_command("import_project", path, chunk_size=2, stdout=io.StringIO())
+        checkpoint = ImportCheckpoint.objects.get()
+        self.assertEqual(checkpoint.line, 5)
+        self.assertEqual(Issue.objects.filter(project__title="CSV").count(), 1)
+
+        self.write("project.csv", header + b"".join(rows) + valid + comment)
+        call_command("import_project", path, chunk_size=2, stdout=io.StringIO())
+        project = Project.objects.get(title="CSV")
+        self.assertEqual(list(Issue.objects.filter(project=project).order_by("id").values_list("title", flat=True)), ["First", "Second"])
+        self.assertEqual(Comment.objects.filter(issue__project=project).count(), 2)
+        self.assertEqual(Contributor.objects.filter(project=project).count(), 2)
+        self.assertEqual(Issue.objects.get(title="First").description, "Multi\nline")
+        self.assertIsNotNone(ImportCheckpoint.objects.get().finished_time)
+
+
+class SearchTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.title_issue = self.create_issue(title="Crash on login", description="The form never answers")
+        self.description_issue = self.create_issue(title="Login form", description="The application crashes after a login")
+        self.comment = Comment.objects.create(description="It crashed again today", author=self.owner, issue=self.title_issue)
+        self.create_issue(self.create_project("Other"), title="Crash on startup", description="Crashing")
+        self.client.force_authenticate(self.owner)
+
+    def search(self, query: str, **params) -> list[tuple[str, int]]:
+        response = self.client.get(f"/projects/{self.project.pk}/search/", {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(result["type"], result["id"]) for result in response.data["results"]]
+
+    def test_ranking(self) -> None:
+        results = self.search("crash")
+        # A match in the title ranks first
+        self.assertEqual(results[0], ("issue", self.title_issue.pk))
+        self.assertCountEqual(results[1:], [("issue", self.description_issue.pk), ("comment", self.comment.pk)])
+        self.assertEqual(self.search("LOGIN crashes"), [("issue", self.title_issue.pk), ("issue", self.description_issue.pk)])
+        self.assertEqual(self.search("applic*"), [("issue", self.description_issue.pk)])
+        self.assertEqual(self.search("startup"), [])
+
+    def test_index_follows_writes(self) -> None:
+        self.title_issue.title = "Freeze on login"
+        self.title_issue.save()
+        self.comment.delete()
+        Issue.objects.filter(pk=self.description_issue.pk).update(description="Works")
+        Comment.objects.bulk_create([Comment(description="Freezes too", author=self.owner, issue=self.description_issue)])
+        self.assertEqual(self.search("crash"), [])
+        self.assertEqual([kind for kind, _ in self.search("freeze")], ["issue", "comment"])
+
+    def test_pagination(self) -> None:
+        expected = self.search("crash")
+        response = self.client.get(f"/projects/{self.project.pk}/search/", {"q": "crash", "page_size": 1})
+        found = []
+        while True:
+            found += [(result["type"], result["id"]) for result in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(found, expected)
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual([(result["type"], result["id"]) for result in previous.data["results"]], expected[1:2])
+
+    def test_frequent_terms(self) -> None:
+        comments = Comment.objects.bulk_create(
+            Comment(description="Same as above", author=self.owner, issue=self.description_issue) for _ in range(1000)
+        )
+        self.description_issue.description = "The application crashes above a login"
+        self.description_issue.save()
+        comment = Comment.objects.create(description="Crashed as above", author=self.owner, issue=self.title_issue)
+        term_frequency_cache.configure()
+        # Only frequent terms: the most recent hits first
+        self.assertEqual(self.search("above", page_size=2), [("comment", comment.pk), ("comment", comments[-1].pk)])
+        # The frequent terms are left out of the ranking, but every hit contains them
+        hits = [("issue", self.description_issue.pk), ("comment", comment.pk)]
+        ranked = [hit for hit in self.search("crash") if hit in hits]
+        self.assertCountEqual(ranked, hits)
+        self.assertEqual(self.search("above crash"), ranked)
+        self.assertEqual(self.search("crash above", page_size=1), ranked[:1])
+
+    def test_like_backend(self) -> None:
+        with self.settings(SOFTDESK_SEARCH_BACKEND="sd_projects.search.LikeSearchBackend"):
+            self.assertEqual(self.search("login crash"), [("issue", self.title_issue.pk), ("issue", self.description_issue.pk)])
+            self.assertEqual(len(self.search("crash", page_size=2)), 2)
+
+    def test_invalid(self) -> None:
+        response = self.client.get(f"/projects/{self.project.pk}/search/", {"q": " ? "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(User.objects.create_user("other"))
+        response = self.client.get(f"/projects/{self.project.pk}/search/", {"q": "crash"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConnectionPoolTestCase(SoftDeskTestCase):
+
+    def make_pool(self, **options) -> ConnectionPool:
+        return ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), **options)
+
+    def test_reuse(self) -> None:
+        pool = self.make_pool(max_size=2)
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        pool.release(first)
+        pool.release(second)
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["idle"], stats["in_use"], stats["requests"], stats["opened"]), (2, 2, 0, 3, 2))
+
+    def test_exhausted(self) -> None:
+        pool = self.make_pool(max_size=1, timeout=0.01)
+        connection = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        pool.release(connection)
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual((pool.stats()["waits"], pool.stats()["timeouts"]), (1, 1))
+
+    def test_discarded(self) -> None:
+        pool = self.make_pool(max_size=1, max_lifetime=0)
+        expired = pool.acquire()
+        pool.release(expired)
+        self.assertIsNot(pool.acquire(), expired)
+
+        broken = self.make_pool(max_size=1, check_idle=0, check=lambda connection: False)
+        connection = broken.acquire()
+        broken.release(connection)
+        self.assertIsNot(broken.acquire(), connection)
+        self.assertEqual((broken.stats()["size"], broken.stats()["closed"]), (1, 1))
+
+    def test_stats_endpoint(self) -> None:
+        admin = User.objects.create_user("admin", is_staff=True)
+        self.client.force_authenticate(admin)
+        get_pool("bench", {"MAX_SIZE": 3}, lambda: sqlite3.connect(":memory:"))
+        self.addCleanup(close_pool, "bench")
+        response = self.client.get("/status/pools/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["bench"]["max_size"], 3)  # type: ignore[attr-defined]
+
+        self.client.force_authenticate(User.objects.create_user("user"))
+        self.assertEqual(self.client.get("/status/pools/").status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SQLiteBackendTestCase(APITestCase):
+
+    def test_pragmas(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -20000)
+
+    def test_write_lock(self) -> None:
+        # Each test runs in a transaction, which holds the write lock until its rollback
+        self.assertIsNotNone(connection.write_lock)  # type: ignore[attr-defined]
+        lock = get_write_lock(str(connection.settings_dict["NAME"]))
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(lock.acquire(timeout=0.01)))
+        thread.start()
+        thread.join()
+        self.assertEqual(acquired, [False])
+
+
+class ReplicaRoutingTestCase(SoftDeskTestCase):
+    """
+    A second SQLite file stands in for a replica, whose issue has another title than on the primary so that the
+    responses tell which database served them. The replica is added once the test databases are set up, and is
+    copied from a migrated template before each test.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.template = os.path.join(cls.directory.name, "template.sqlite3")
+        connections.settings["replica"] = {**copy.deepcopy(connections.settings["default"]), "NAME": cls.template}
+        with override_settings(SOFTDESK_DB_REPLICAS=["replica"]):
+            call_command("migrate", database="replica", verbosity=0)
+        connections["replica"].close()
+        connections.settings["replica"]["NAME"] = os.path.join(cls.directory.name, "replica.sqlite3")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        connections["replica"].close()
+        shutil.copyfile(self.template, connections.settings["replica"]["NAME"])
+        super().setUp()
+        self.create_fixture()
+        contributor = Contributor.objects.get(user=self.owner, project=self.project)
+        self.issue = self.create_issue(title="Primary", description="")
+        # Copied without the signals, which write to the primary
+        for instance in (self.owner, self.project, contributor, copy.copy(self.issue)):
+            if isinstance(instance, Issue):
+                instance.title = "Replica"
+            type(instance).objects.using("replica").bulk_create([instance])
+        self.client.force_authenticate(self.owner)
+
+    def get_titles(self) -> list[str]:
+        response = self.client.get(f"/projects/{self.project.pk}/issues/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [issue["title"] for issue in response.data["results"]]  # type: ignore[attr-defined]
+
+    def test_without_replicas(self) -> None:
+        self.assertEqual(self.get_titles(), ["Primary"])
+
+    @override_settings(SOFTDESK_DB_REPLICAS=["replica"])
+    def test_reads_replica(self) -> None:
+        self.assertEqual(self.get_titles(), ["Replica"])
+        response = self.client.get(f"/projects/{self.project.pk}/issues/{self.issue.pk}/")
+        self.assertEqual(response.data["title"], "Replica")  # type: ignore[attr-defined]
+        # The writes go to the primary
+        Issue.objects.filter(pk=self.issue.pk).update(description="Updated")
+        self.assertEqual(Issue.objects.using("replica").get(pk=self.issue.pk).description, "")
+
+    @override_settings(SOFTDESK_DB_REPLICAS=["replica"])
+    def test_read_your_writes(self) -> None:
+        response = self.client.patch(f"/projects/{self.project.pk}/issues/{self.issue.pk}/", {"title": "Written"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_titles(), ["Written"])
+        with override_settings(SOFTDESK_READ_YOUR_WRITES={"WINDOW": 0}):
+            self.client.patch(f"/projects/{self.project.pk}/issues/{self.issue.pk}/", {"title": "Lagging"})
+            self.assertEqual(self.get_titles(), ["Replica"])
+
+
+class ResponseCacheTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.contributor = User.objects.create_user("contributor", first_name="Other", last_name="Contributor")
+        self.add_contributor(self.contributor)
+        self.issue = self.create_issue(description="")
+        self.url = f"/projects/{self.project.pk}/issues/"
+
+    def get(self, user: User, url: str | None = None):
+        self.client.force_authenticate(user)
+        return self.client.get(url or self.url)
+
+    def test_shared_between_users(self) -> None:
+        expected = self.get(self.owner)
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(self.contributor)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+        # The membership and the project version only
+        self.assertEqual(len(context), 2)
+        stats = response_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bytes_saved"]), (1, 1, len(expected.content)))
+        # Another page is another entry
+        self.get(self.contributor, f"{self.url}?status=TODO")
+        self.assertEqual(response_cache.stats()["misses"], 2)
+
+    def test_permissions(self) -> None:
+        self.get(self.owner)
+        outsider = User.objects.create_user("outsider")
+        self.assertEqual(self.get(outsider).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalidation(self) -> None:
+        self.get(self.owner)
+        Comment.objects.create(description="Comment", author=self.owner, issue=self.issue)
+        self.get(self.owner)
+        self.assertEqual(response_cache.stats()["hits"], 0)
+        self.owner.first_name = "Renamed"
+        self.owner.save()
+        self.assertEqual(self.get(self.contributor).data["results"][0]["author"]["first_name"], "Renamed")  # type: ignore[attr-defined]
+
+
+class ValuesSerializerTestCase(SoftDeskTestCase):
+    """
+    The responses rendered from `.values_list()` rows are byte for byte the ones of the model serializers.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.owner = User.objects.create_user("owner", first_name="Owner", last_name="Project")
+        self.contributor = User.objects.create_user("contributor", first_name="Other", last_name="Contributor")
+        self.project = self.create_project(description="Values", type=Project.ProjectType.IOS)
+        self.add_contributor(self.contributor, permission=Contributor.ContributorPermission.WRITE)
+        self.issues = [
+            self.create_issue(
+                title=f"Issue {index}",
+                status=index % 3,
+                tag=Issue.IssueTag.TASK,
+                priority=index % 2,
+                assigned=self.contributor if index % 2 else None,
+            )
+            for index in range(4)
+        ]
+        self.comment = Comment.objects.create(description="Comment", author=self.contributor, issue=self.issues[0])
+        self.client.force_authenticate(self.owner)
+
+    def get(self, url: str, values: bool):
+        self.reset_caches()
+        with override_settings(SOFTDESK_VALUES_SERIALIZERS=values):
+            return self.client.get(url)
+
+    def assertSameContent(self, url: str) -> dict | None:
+        expected = self.get(url, values=False)
+        response = self.get(url, values=True)
+        self.assertEqual(response.status_code, expected.status_code, url)
+        self.assertEqual(response.content, expected.content, url)
+        return response.json() if response.status_code == status.HTTP_200_OK else None
+
+    def test_projects(self) -> None:
+        self.assertSameContent("/projects/")
+        self.assertSameContent("/projects/?embed=role")
+        self.assertSameContent("/projects/?embed=role,statistics")
+        self.assertSameContent(f"/projects/{self.project.pk}/")
+        self.assertSameContent(f"/projects/{self.project.pk}/users/")
+        self.assertSameContent(f"/projects/{self.project.pk}/users/{self.project.contributors.first().pk}/")  # type: ignore[union-attr]
+
+    def test_issues(self) -> None:
+        url = f"/projects/{self.project.pk}/issues/"
+        self.assertSameContent(f"{url}?fields=id,assigned,created_time,unknown")
+        self.assertSameContent(f"{url}?status=0,1&ordering=-priority")
+        self.assertSameContent(f"{url}{self.issues[1].pk}/")
+        self.assertSameContent(f"{url}0/")
+        # Every page and cursor link
+        next_url: str | None = f"{url}?page_size=1&ordering=-status"
+        pages = 0
+        while next_url:
+            data = self.assertSameContent(next_url)
+            next_url = data["next"]  # type: ignore[index]
+            pages += 1
+        self.assertEqual(pages, len(self.issues))
+
+    def test_comments(self) -> None:
+        url = f"/projects/{self.project.pk}/issues/{self.issues[0].pk}/comments/"
+        self.assertSameContent(url)
+        self.assertSameContent(f"{url}{self.comment.pk}/")
+
+
+class ORJSONTestCase(APITestCase):
+    """
+    The orjson renderer and parser read and write the JSON of DRF's own.
+    """
+
+    data = {
+        "id": 2 ** 70,
+        "text": "Caf\u00e9 \u2028 \"quoted\" \x1f",
+        "label": gettext_lazy("owner"),
+        "amount": decimal.Decimal("1.50"),
+        "created_time": datetime.datetime(2023, 3, 1, 12, 30, 15, 123456),
+        "date": datetime.date(2023, 3, 1),
+        "key": uuid.UUID(int=1),
+        "counts": {1: 2, 3: [0.5, None, True]},
+    }
+
+    def test_render(self) -> None:
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(ORJSONRenderer().render(self.data), expected)
+        without_big_int = {**self.data, "id": 1}
+        self.assertEqual(ORJSONRenderer().render(without_big_int), JSONRenderer().render(without_big_int))
+        indented = ORJSONRenderer().render(without_big_int, "application/json; indent=4")
+        self.assertEqual(indented, JSONRenderer().render(without_big_int, "application/json; indent=4"))
+        with mock.patch("sd_projects.renderers.orjson", None):
+            self.assertEqual(ORJSONRenderer().render(self.data), expected)
+
+    def test_parse(self) -> None:
+        content = '{"title": "Caf\u00e9", "values": [1, 2.5, null]}'.encode()
+        parsed = ORJSONParser().parse(io.BytesIO(content))
+        self.assertEqual(parsed, JSONParser().parse(io.BytesIO(content)))
+        latin = ORJSONParser().parse(io.BytesIO('"Caf\u00e9"'.encode("latin-1")), parser_context={"encoding": "latin-1"})
+        self.assertEqual(latin, "Caf\u00e9")
+        for invalid in (b'{"title": ', b'[NaN]'):
+            with self.subTest(content=invalid), self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(invalid))
+
+
+@override_settings(SOFTDESK_METRICS={"SAMPLE_RATE": 1.0, "SERVER_TIMING": True, "ALLOWED_IPS": []})
+class InstrumentationTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_fixture()
+        self.url = f"/projects/{self.project.pk}/issues/"
+        self.client.force_authenticate(self.owner)
+
+    def get_metrics(self) -> str:
+        self.client.force_authenticate(User.objects.create_user("staff", is_staff=True))
+        response = self.client.get("/status/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+        return response.content.decode()
+
+    def test_server_timing(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        queries = len(context)
+        timing = {entry.split(";")[0]: entry for entry in response["Server-Timing"].split(", ")}
+        self.assertEqual(set(timing), {"db", "serializer", "permissions", "total"})
+        self.assertIn(f'desc="{queries} queries"', timing["db"])
+        metrics = self.get_metrics()
+        labels = 'endpoint="ProjectIssueAPIView",method="GET"'
+        self.assertIn(f'softdesk_requests_total{{{labels},status="200"}} 1', metrics)
+        self.assertIn(f'softdesk_request_db_queries_bucket{{{labels},le="+Inf"}} 1', metrics)
+        self.assertIn(f"softdesk_request_db_queries_sum{{{labels}}} {float(queries)}", metrics)
+        self.assertIn(f"softdesk_request_serializer_duration_seconds_count{{{labels}}} 1", metrics)
+        # Not sent unless enabled
+        with override_settings(SOFTDESK_METRICS={"SAMPLE_RATE": 1.0}):
+            self.assertNotIn("Server-Timing", self.client.get(self.url))
+
+    def test_sampling(self) -> None:
+        with override_settings(SOFTDESK_METRICS={"SAMPLE_RATE": 0.0, "SERVER_TIMING": True, "ALLOWED_IPS": []}):
+            response = self.client.get(self.url)
+            self.assertNotIn("Server-Timing", response)
+            metrics = self.get_metrics()
+        self.assertIn('softdesk_requests_total{endpoint="ProjectIssueAPIView",method="GET",status="200"} 1', metrics)
+        self.assertIn('softdesk_request_duration_seconds_count{endpoint="ProjectIssueAPIView",method="GET"} 1', metrics)
+        self.assertNotIn('softdesk_request_db_queries_count{endpoint="ProjectIssueAPIView"', metrics)
+
+    def test_permissions_timing(self) -> None:
+        class SlowPermission(BasePermission):
+            def has_permission(self, request, view):
+                time.sleep(0.01)
+                return True
+
+        # Any API view, without a mixin of this application
+        view = APIView.as_view(permission_classes=[SlowPermission])
+        metrics, token = request_metrics.start()
+        try:
+            view(APIRequestFactory().get("/"))
+        finally:
+            request_metrics.stop(token)
+        self.assertGreaterEqual(metrics.durations["permissions"], 0.01)
+
+    def test_method_label(self) -> None:
+        for method in ("PROPFIND", "X" * 100):
+            self.client.generic(method, self.url)
+        metrics = self.get_metrics()
+        self.assertIn('softdesk_requests_total{endpoint="ProjectIssueAPIView",method="other",status="405"} 2', metrics)
+        self.assertNotIn("PROPFIND", metrics)
+
+    def test_metrics_access(self) -> None:
+        self.assertEqual(self.client.get("/status/metrics/").status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(SOFTDESK_METRICS={"ALLOWED_IPS": ["127.0.0.1"]}):
+            self.client.force_authenticate(None)
+            self.assertEqual(self.client.get("/status/metrics/").status_code, status.HTTP_200_OK)
+
+
+class SeedDataTestCase(SoftDeskTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        call_command("seed_data", users=20, projects=4, issues=300, comments=600, batch_size=100, stdout=io.StringIO())
+
+    def test_seed(self) -> None:
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Issue.objects.count(), 300)
+        self.assertEqual(Comment.objects.count(), 600)
+        self.assertEqual(ProjectVersion.objects.count(), 4)
+        self.assertEqual(sum(ProjectStatistics.objects.values_list("issue_count", flat=True)), 300)
+        self.assertFalse(Issue.objects.exclude(author__contributing_to__project=models.F("project")).exists())
+        # Skewed: the largest project holds more than an even share of the issues
+        largest = Issue.objects.values("project").annotate(count=models.Count("id")).order_by("-count")[0]["count"]
+        self.assertGreater(largest, 300 / 4)
+
+    def test_bench_routes(self) -> None:
+        output = io.StringIO()
+        call_command("bench_routes", concurrency="1", requests=2, stdout=output)
+        report = json.loads(output.getvalue())
+        results = report["results"]
+        self.assertEqual({result["route"] for result in results}, {str(url.pattern) for url in get_urls(False)})
+        for result in results:
+            self.assertEqual(result["errors"], 0, result["name"])
+            self.assertEqual(result["requests"], 2)
+            self.assertIsNotNone(result["queries"], result["name"])
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as baseline:
+            json.dump(report, baseline)
+            baseline.flush()
+            with self.assertRaisesMessage(CommandError, "Regressions against the baseline"):
+                call_command("bench_routes", concurrency="1", requests=2, routes="^issues$", baseline=baseline.name,
+                             tolerance=-1, stdout=io.StringIO())
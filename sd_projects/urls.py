@@ -1,25 +1,65 @@
+from django.conf import settings
 from django.urls import path
 
+from .async_views import (
+    read_async,
+    AsyncProjectsAPIView,
+    AsyncProjectIndexedAPIView,
+    AsyncProjectIssueAPIView,
+    AsyncProjectIssueIndexedAPIView,
+    AsyncProjectCommentsAPIView,
+    AsyncProjectCommentsIndexedAPIView,
+)
 from .views import (
+    CachesAPIView,
     CreateUserAPIView,
+    DatabasePoolsAPIView,
+    MetricsAPIView,
     ProjectsAPIView,
     ProjectIndexedAPIView,
+    ProjectStatisticsAPIView,
+    ProjectExportAPIView,
+    ProjectSearchAPIView,
     ProjectContributorAPIView,
     ProjectContributorIndexedAPIView,
     ProjectIssueAPIView,
     ProjectIssueIndexedAPIView,
+    ProjectIssueBulkAPIView,
     ProjectCommentsAPIView,
     ProjectCommentsIndexedAPIView,
+    ProjectCommentsBulkAPIView,
 )
 
-urls = [
-    path("register/", CreateUserAPIView.as_view()),
-    path("projects/", ProjectsAPIView.as_view()),
-    path("projects/<int:project_id>/", ProjectIndexedAPIView.as_view()),
-    path("projects/<int:project_id>/users/", ProjectContributorAPIView.as_view()),
-    path("projects/<int:project_id>/users/<int:user_id>/", ProjectContributorIndexedAPIView.as_view()),
-    path("projects/<int:project_id>/issues/", ProjectIssueAPIView.as_view()),
-    path("projects/<int:project_id>/issues/<int:issue_id>/", ProjectIssueIndexedAPIView.as_view()),
-    path("projects/<int:project_id>/issues/<int:issue_id>/comments/", ProjectCommentsAPIView.as_view()),
-    path("projects/<int:project_id>/issues/<int:issue_id>/comments/<int:comment_id>/", ProjectCommentsIndexedAPIView.as_view()),
-]
+
+def read_view(view_class, async_view_class, async_views: bool):
+    """
+    The view of an endpoint, of which the GET requests are served by the async view when `async_views` is set.
+    """
+    if not async_views:
+        return view_class.as_view()
+    return read_async(view_class.as_view(), async_view_class.as_view())
+
+
+def get_urls(async_views: bool) -> list:
+    return [
+        path("register/", CreateUserAPIView.as_view()),
+        path("status/pools/", DatabasePoolsAPIView.as_view()),
+        path("status/caches/", CachesAPIView.as_view()),
+        path("status/metrics/", MetricsAPIView.as_view()),
+        path("projects/", read_view(ProjectsAPIView, AsyncProjectsAPIView, async_views)),
+        path("projects/<int:project_id>/", read_view(ProjectIndexedAPIView, AsyncProjectIndexedAPIView, async_views)),
+        path("projects/<int:project_id>/stats/", ProjectStatisticsAPIView.as_view()),
+        path("projects/<int:project_id>/export/", ProjectExportAPIView.as_view()),
+        path("projects/<int:project_id>/search/", ProjectSearchAPIView.as_view()),
+        path("projects/<int:project_id>/users/", ProjectContributorAPIView.as_view()),
+        path("projects/<int:project_id>/users/<int:user_id>/", ProjectContributorIndexedAPIView.as_view()),
+        path("projects/<int:project_id>/issues/", read_view(ProjectIssueAPIView, AsyncProjectIssueAPIView, async_views)),
+        path("projects/<int:project_id>/issues/bulk/", ProjectIssueBulkAPIView.as_view()),
+        path("projects/<int:project_id>/issues/<int:issue_id>/", read_view(ProjectIssueIndexedAPIView, AsyncProjectIssueIndexedAPIView, async_views)),
+        path("projects/<int:project_id>/issues/<int:issue_id>/comments/", read_view(ProjectCommentsAPIView, AsyncProjectCommentsAPIView, async_views)),
+        path("projects/<int:project_id>/issues/<int:issue_id>/comments/bulk/", ProjectCommentsBulkAPIView.as_view()),
+        path("projects/<int:project_id>/issues/<int:issue_id>/comments/<int:comment_id>/", read_view(ProjectCommentsIndexedAPIView, AsyncProjectCommentsIndexedAPIView, async_views)),
+    ]
+
+
+urls = get_urls(settings.SOFTDESK_ASYNC_VIEWS)
@@ -1,6 +1,7 @@
 from rest_framework.generics import get_object_or_404
 from rest_framework import validators, fields, serializers
 from sd_projects.models import User, Project
+from sd_projects.membership import get_membership
 from django.db.models import Q
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -26,10 +27,24 @@ class UserIsCollaborator:
             user = get_object_or_404(User.objects.all(), field.context['view'].kwargs[self.user_slug])
         elif self.nullable_user:
             return
+        if user is None and self.nullable_user:
+            return
         if self.project_field is not None:
             project_id = value[self.project_field].pk
         else:
             project_id = field.context['view'].kwargs[self.project_slug]
+        collaborators = field.context.get('collaborators')
+        if collaborators is not None:
+            # Collaborators resolved beforehand for a whole batch of items, see BulkModelAPIView
+            if user.pk not in collaborators:
+                raise serializers.ValidationError(f"User {user.get_full_name()} is not a contributor of the project {project_id}")
+            return
+        request = field.context.get('request')
+        if request is not None and user is not None and user.pk == request.user.pk:
+            # The current user membership is already resolved by the permission checks
+            if get_membership(request, project_id) is None:
+                raise serializers.ValidationError(f"User {user.get_full_name()} is not a contributor of the project {project_id}")
+            return
         try:
             project = Project.objects.filter(
                 Q(pk=project_id)
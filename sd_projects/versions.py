@@ -0,0 +1,76 @@
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Iterator
+from django.db.models import F
+from django.utils import timezone
+from .models import Contributor, ProjectVersion
+
+_deferred = threading.local()
+
+
+def _bump(project_ids: set[int]) -> None:
+    ProjectVersion.objects \
+        .filter(project_id__in=project_ids) \
+        .update(version=F("version") + 1, updated_time=timezone.now())
+
+
+def bump_project_version(project_id: int) -> None:
+    """
+    Record a write to the project or to one of its resources.
+    Within `defer_project_version_bumps` the bumps are grouped and written once when leaving it.
+    """
+    pending = getattr(_deferred, "pending", None)
+    if pending is not None:
+        pending.add(project_id)
+    else:
+        _bump({project_id})
+
+
+def bump_contributed_project_versions(user_id: int) -> None:
+    """
+    Record a change of a user rendered by the resources of the projects the user contributes to, e.g. a new name.
+    """
+    ProjectVersion.objects \
+        .filter(project_id__in=Contributor.objects.filter(user_id=user_id).values("project_id")) \
+        .update(version=F("version") + 1, updated_time=timezone.now())
+
+
+def remember_issue_project(issue_id: int, project_id: int) -> None:
+    """
+    Remember the project of an issue, so that writing or deleting its comments needs no query to find it.
+    """
+    issue_projects = getattr(_deferred, "issue_projects", None)
+    if issue_projects is not None:
+        issue_projects[issue_id] = project_id
+
+
+def get_remembered_issue_project(issue_id: int) -> int | None:
+    return getattr(_deferred, "issue_projects", {}).get(issue_id)
+
+
+@contextmanager
+def defer_project_version_bumps() -> Iterator[None]:
+    if getattr(_deferred, "pending", None) is not None:
+        yield
+        return
+    _deferred.pending, _deferred.issue_projects = set(), {}
+    try:
+        yield
+    finally:
+        pending = _deferred.pending
+        del _deferred.pending, _deferred.issue_projects
+        if pending:
+            _bump(pending)
+
+
+def get_project_version(project_id: int) -> tuple[int, datetime] | None:
+    """
+    Return the version and the last write date time of a project, None if the project has no version row
+    (projects inserted without signals, e.g. with bulk_create).
+    """
+    return ProjectVersion.objects.filter(project_id=project_id).values_list("version", "updated_time").first()
+
+
+async def aget_project_version(project_id: int) -> tuple[int, datetime] | None:
+    return await ProjectVersion.objects.filter(project_id=project_id).values_list("version", "updated_time").afirst()
@@ -1,28 +1,70 @@
-from django.db import models
+import calendar
+import hashlib
+import io
+from datetime import datetime
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from typing import Generic, TypeVar
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from typing import Any, Callable, Generic, Iterator, TypeVar
 from rest_framework import mixins, generics
 from .serializers import (
+    FullPrimaryKeyRelatedField,
     UserCreationSerializer,
     ProjectSerializer,
     ContributorSerializer,
     IssueSerializer,
     CommentSerializer,
+    ProjectStatisticsSerializer,
+    SearchResultSerializer,
+    ValuesPlan,
+    ValuesSerializer,
+    ProjectValuesSerializer,
+    ContributorValuesSerializer,
+    IssueValuesSerializer,
+    CommentValuesSerializer,
 )
-from .models import Contributor, Project, Issue, Comment
+from .models import Contributor, Project, Issue, Comment, ProjectStatistics
 from rest_framework.generics import get_object_or_404
 from rest_framework import (
+    exceptions,
     response,
     status,
     permissions,
+    renderers,
     serializers,
 )
+from .authentication import revoke_user_tokens, token_user_cache
+from .filters import IssueFilterBackend, StrictOrderingFilter
+from .instrumentation import request_metrics
+from .membership import membership_cache
+from .pooling import pool_stats
+from .renderers import PrometheusRenderer, dumps
+from .responses import response_cache
+from .routers import get_replicas, recent_writes, start_replica_reads, stop_replica_reads
+from .search import get_search_backend, load_results, parse_query, term_frequency_cache
+from .streaming import stream_from
+from .pagination import (
+    IdCursorPagination,
+    CreatedTimeCursorPagination,
+    SearchCursorPagination,
+)
+from . import statistics
+from .versions import (
+    bump_project_version,
+    defer_project_version_bumps,
+    get_project_version,
+    remember_issue_project,
+)
 from .permissions import (
     IsContributor,
     IsProjectOwnerCreate,
     IsProjectOwnerEdit,
     IsProjectOwnerOrSelf,
     IsProjectOwnerOrAuthor,
+    IsMetricsScraper,
 )
 
 MT = TypeVar("MT", bound=models.base.Model)
@@ -56,15 +98,388 @@ class FullModelAPIView(
         return self.destroy(request, *args, **kwargs)
 
 
+class BulkModelAPIView(generics.GenericAPIView, Generic[MT]):
+    """
+    Create, update or delete up to `SOFTDESK_BULK_MAX_ITEMS` objects in a single request and a single transaction.
+
+    - POST: a list of objects to create
+    - PUT/PATCH: a list of objects to update, identified by their `id`
+    - DELETE: a list of ids to delete
+
+    Nothing is written when any item is invalid, the response then holds a list of errors aligned with the items.
+    An id given twice in a batch is invalid, so that each object is written once.
+    The objects referenced by FullPrimaryKeyRelatedField are resolved with one query per field for the whole batch.
+    """
+
+    def get_max_items(self) -> int:
+        return getattr(settings, "SOFTDESK_BULK_MAX_ITEMS", 500)
+
+    def get_items(self) -> list[Any]:
+        items = self.request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError({"non_field_errors": ["Expected a list of items"]})
+        if len(items) > self.get_max_items():
+            raise serializers.ValidationError({"non_field_errors": [f"At most {self.get_max_items()} items are accepted at once"]})
+        return items
+
+    def get_bulk_context(self, items: list[Any]) -> dict[str, Any]:
+        context = self.get_serializer_context()
+        related_objects = {}
+        for name, field in self.get_serializer_class()(context=context).fields.items():
+            if isinstance(field, FullPrimaryKeyRelatedField) and not field.read_only:
+                pks = {item[name] for item in items if isinstance(item, dict) and isinstance(item.get(name), int)}
+                related_objects[name] = field.get_queryset().in_bulk(pks)
+        context["related_objects"] = related_objects
+        return context
+
+    def get_bulk_create_kwargs(self) -> dict[str, Any]:
+        return {}
+
+    def perform_bulk_create(self, objects: list[MT]) -> None:
+        # bulk_create and bulk_update send no signal, the project version is bumped here
+        self.get_queryset().model.objects.bulk_create(objects)
+        bump_project_version(self.kwargs["project_id"])
+
+    def perform_bulk_update(self, objects: list[MT], fields: list[str]) -> None:
+        self.get_queryset().model.objects.bulk_update(objects, fields)
+        bump_project_version(self.kwargs["project_id"])
+
+    def get_object_errors(self, obj: MT) -> dict[str, Any] | None:
+        for permission in self.get_permissions():
+            if not permission.has_object_permission(self.request, self, obj):
+                return {"non_field_errors": [getattr(permission, "message", "You do not have permission to perform this action.")]}
+        return None
+
+    def get_instances(self, items: list[Any]) -> tuple[dict[int, MT], list[Any]]:
+        ids = [item.get("id") if isinstance(item, dict) else item for item in items]
+        instances = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int)])
+        return instances, ids
+
+    def get_id_errors(self, pk: Any, instances: dict[int, MT], seen: set[int]) -> dict[str, Any] | None:
+        if not isinstance(pk, int) or pk not in instances:
+            return {"id": ["Not found."]}
+        if pk in seen:
+            return {"id": ["Given more than once."]}
+        seen.add(pk)
+        return None
+
+    def validate_items(self, items: list[Any], instances: dict[int, MT] | None = None, partial: bool = False):
+        context = self.get_bulk_context(items)
+        serializers_list, errors = [], []
+        seen: set[int] = set()
+        for item in items:
+            instance = None
+            if instances is not None:
+                pk = item.get("id") if isinstance(item, dict) else None
+                id_errors = self.get_id_errors(pk, instances, seen)
+                if id_errors:
+                    serializers_list.append(None)
+                    errors.append(id_errors)
+                    continue
+                instance = instances[pk]
+                object_errors = self.get_object_errors(instance)
+                if object_errors:
+                    serializers_list.append(None)
+                    errors.append(object_errors)
+                    continue
+            serializer = self.get_serializer_class()(instance, data=item, partial=partial, context=context)
+            serializer.is_valid()
+            serializers_list.append(serializer)
+            errors.append(serializer.errors)
+        return serializers_list, errors
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_items()
+        serializers_list, errors = self.validate_items(items)
+        if any(errors):
+            return response.Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        model = self.get_queryset().model
+        create_kwargs = self.get_bulk_create_kwargs()
+        objects = [model(**serializer.validated_data, **create_kwargs) for serializer in serializers_list]
+        with transaction.atomic():
+            self.perform_bulk_create(objects)
+        data = self.get_serializer_class()(objects, many=True, context=self.get_serializer_context()).data
+        return response.Response(data, status=status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(partial=True)
+
+    def bulk_update(self, partial: bool):
+        items = self.get_items()
+        instances, _ = self.get_instances(items)
+        serializers_list, errors = self.validate_items(items, instances, partial=partial)
+        if any(errors):
+            return response.Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        updated, fields = [], set()
+        for serializer in serializers_list:
+            for name, value in serializer.validated_data.items():
+                setattr(serializer.instance, name, value)
+                fields.add(name)
+            updated.append(serializer.instance)
+        if fields:
+            # bulk_update does not apply auto_now, the modification times are set here
+            for field in self.get_queryset().model._meta.concrete_fields:
+                if getattr(field, "auto_now", False):
+                    for instance in updated:
+                        field.pre_save(instance, add=False)
+                    fields.add(field.name)
+            with transaction.atomic():
+                self.perform_bulk_update(updated, list(fields))
+        data = self.get_serializer_class()(updated, many=True, context=self.get_serializer_context()).data
+        return response.Response(data)
+
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items()
+        instances, ids = self.get_instances(items)
+        errors = []
+        seen: set[int] = set()
+        for pk in ids:
+            errors.append(self.get_id_errors(pk, instances, seen) or self.get_object_errors(instances[pk]) or {})
+        if any(errors):
+            return response.Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            self.get_queryset().model.objects.filter(pk__in=instances.keys()).delete()
+        return response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ReplicaReadMixin:
+    """
+    Serve the safe requests from a replica of `SOFTDESK_DB_REPLICAS`, once the permissions were checked against
+    the primary. The requests of a user who sent a write within the last `SOFTDESK_READ_YOUR_WRITES['WINDOW']`
+    seconds are served from the primary, so that the user reads their own writes.
+    """
+
+    replica_reads_token = None
+
+    def reads_replicas(self, request) -> bool:
+        return (request.method or "").upper() in permissions.SAFE_METHODS and bool(get_replicas())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)  # type: ignore
+        if self.reads_replicas(request) and not recent_writes.is_recent(request.user.pk):
+            self.replica_reads_token = start_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self.replica_reads_token is not None:
+            stop_replica_reads(self.replica_reads_token)
+            self.replica_reads_token = None
+        return super().finalize_response(request, response, *args, **kwargs)  # type: ignore
+
+
+class ConditionalGetMixin:
+    """
+    Send ETag and Last-Modified validators derived from the project version on list and retrieve,
+    and answer 304 Not Modified before any queryset is evaluated when the copy of the client is still fresh.
+    The writes of a request bump the version of each project they touch only once.
+    With `cache_responses`, the rendered responses are shared between the users through the ResponseCache,
+    for the views of which the responses do not depend on the user.
+    """
+
+    cache_responses = False
+    response_cache_key: tuple[Any, ...] | None = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method or "").upper() in permissions.SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)  # type: ignore
+        with defer_project_version_bumps():
+            if "issue_id" in kwargs and "project_id" in kwargs:
+                # The querysets only reach the issues of the project given in the URL
+                remember_issue_project(kwargs["issue_id"], kwargs["project_id"])
+            return super().dispatch(request, *args, **kwargs)  # type: ignore
+
+    def get_version_key(self) -> tuple[str, datetime] | None:
+        """
+        Return a string changing with any write to the rendered resources, and the date time of the last write.
+        """
+        row = get_project_version(self.kwargs["project_id"])  # type: ignore
+        if row is None:
+            return None
+        version, updated_time = row
+        return str(version), updated_time
+
+    def make_validators(self, version_key: tuple[str, datetime] | None) -> tuple[str, int] | None:
+        if version_key is None:
+            return None
+        key, updated_time = version_key
+        request = self.request  # type: ignore
+        digest = hashlib.sha1(
+            f"{key}:{request.get_full_path()}:{request.accepted_media_type}".encode()
+        ).hexdigest()
+        return f'W/"{digest}"', calendar.timegm(updated_time.utctimetuple())
+
+    def get_response_cache_key(self, version_key: tuple[str, datetime] | None) -> tuple[Any, ...] | None:
+        request = self.request  # type: ignore
+        if not self.cache_responses or version_key is None \
+                or isinstance(request.accepted_renderer, renderers.BrowsableAPIRenderer):
+            # The browsable API renders the name of the user
+            return None
+        digest = hashlib.sha1(
+            f"{version_key[0]}:{request.get_host()}:{request.get_full_path()}:{request.accepted_media_type}".encode()
+        ).hexdigest()
+        return self.kwargs["project_id"], digest  # type: ignore
+
+    def make_cached_response(self, entry: tuple[str, bytes] | None) -> HttpResponse | None:
+        if entry is None:
+            return None
+        response_cache.record_hit(entry)
+        content_type, content = entry
+        return HttpResponse(content, content_type=content_type)
+
+    def get_not_modified_response(self, request, validators: tuple[str, int] | None):
+        if validators is None:
+            return None
+        etag, last_modified = validators
+        return get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+
+    def add_validators(self, response, validators: tuple[str, int] | None):
+        if validators is None or response.status_code not in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            return response
+        etag, last_modified = validators
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
+    def conditional(self, handler: Callable, request, *args, **kwargs):
+        version_key = self.get_version_key()
+        validators = self.make_validators(version_key)
+        response = self.get_not_modified_response(request, validators)
+        if response is None:
+            self.response_cache_key = self.get_response_cache_key(version_key)
+            if self.response_cache_key is not None:
+                response = self.make_cached_response(response_cache.get(self.response_cache_key))
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.add_validators(response, validators)
+
+    def finalize_response(self, request, result, *args, **kwargs):
+        result = super().finalize_response(request, result, *args, **kwargs)  # type: ignore
+        key, self.response_cache_key = self.response_cache_key, None
+        if key is not None and isinstance(result, response.Response) and result.status_code == status.HTTP_200_OK:
+            result.render()
+            response_cache.set(key, (result["Content-Type"], result.content))
+        return result
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)  # type: ignore
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)  # type: ignore
+
+
+class ValuesReadMixin:
+    """
+    Render the list and retrieve of the GET requests from `.values_list()` rows through
+    `values_serializer_class`, producing the JSON of the serializer without creating model instances.
+    The requests asking for a field which is not read from a column, and all of them when
+    `SOFTDESK_VALUES_SERIALIZERS` is False, are rendered by the serializer.
+    The object permissions are then given the row, they only look at the object of the unsafe methods.
+    """
+
+    values_serializer_class: type[ValuesSerializer] | None = None
+
+    def get_values_plan(self) -> ValuesPlan | None:
+        request = self.request  # type: ignore
+        if self.values_serializer_class is None or (request.method or "").upper() not in ("GET", "HEAD") \
+                or not getattr(settings, "SOFTDESK_VALUES_SERIALIZERS", True):
+            return None
+        return self.values_serializer_class.get_plan(request)
+
+    def get_cursor_columns(self) -> list[str]:
+        """
+        Return the columns the pagination cursor may be built from, as the named rows carry them.
+        """
+        ordering = [*getattr(self.pagination_class, "ordering", ()), "id"]  # type: ignore
+        ordering_fields = getattr(self, "ordering_fields", None)
+        if isinstance(ordering_fields, (list, tuple)):
+            ordering += ordering_fields
+        return [field.lstrip("-") for field in ordering]
+
+    def get_values_queryset(self, plan: ValuesPlan, many: bool) -> models.QuerySet:
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+        if not many:
+            return queryset.values_list(*plan.columns)
+        columns = [*plan.columns, *(column for column in self.get_cursor_columns() if column not in plan.columns)]
+        return queryset.values_list(*dict.fromkeys(columns), named=True)
+
+    def get_values_lookup(self) -> dict[str, Any]:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field  # type: ignore
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}  # type: ignore
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)  # type: ignore
+        queryset = self.get_values_queryset(plan, many=True)
+        page = self.paginate_queryset(queryset)  # type: ignore
+        if page is not None:
+            return self.get_paginated_response(plan.render_many(page))  # type: ignore
+        return response.Response(plan.render_many(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().retrieve(request, *args, **kwargs)  # type: ignore
+        row = get_object_or_404(self.get_values_queryset(plan, many=False), **self.get_values_lookup())
+        self.check_object_permissions(request, row)  # type: ignore
+        return response.Response(plan.render(row))
+
+
 class CreateUserAPIView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserCreationSerializer
     description = "Register a new user"
 
 
-class ProjectsAPIMixin:
-    queryset = Project.objects.prefetch_related("contributors", "author")
+class RevokeTokensAPIView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    description = "Revoke every access and refresh token of the current user, logging it out of every client"
+
+    def post(self, request, *args, **kwargs):
+        revoke_user_tokens(request.user.pk)
+        return response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class DatabasePoolsAPIView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAdminUser]
+    description = "Get the utilization of the database connection pools of the worker process serving the request"
+
+    def get(self, request, *args, **kwargs):
+        return response.Response(pool_stats())
+
+
+class CachesAPIView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAdminUser]
+    description = "Get the hit ratio of the cross-request caches of the worker process serving the request"
+
+    def get(self, request, *args, **kwargs):
+        return response.Response({
+            "membership": membership_cache.stats(),
+            "token_user": token_user_cache.stats(),
+            "search_term": term_frequency_cache.stats(),
+            "response": response_cache.stats(),
+        })
+
+
+class MetricsAPIView(generics.GenericAPIView):
+    permission_classes = [IsMetricsScraper]
+    renderer_classes = [PrometheusRenderer]
+    description = "Get the request metrics of the worker process serving the request, in the Prometheus text format"
+
+    def get(self, request, *args, **kwargs):
+        return response.Response(request_metrics.export())
+
+
+class ProjectsAPIMixin(ReplicaReadMixin, ConditionalGetMixin, ValuesReadMixin):
+    queryset = Project.objects \
+        .select_related("author") \
+        .only("id", "title", "description", "type", "author__id", "author__first_name", "author__last_name")
     serializer_class = ProjectSerializer
+    values_serializer_class = ProjectValuesSerializer
     lookup_url_kwarg = "project_id"
 
     METHOD_DESCRIPTION = {
@@ -85,8 +500,12 @@ class ProjectsAPIMixin:
         return self.METHOD_DESCRIPTION.get(method, "No description available")
 
     def get_queryset(self):
+        # (user, project) is unique among the contributors, the JOIN yields a single row per project
+        # and carries the role of the current user without any additional query
         queryset = super().get_queryset()
-        queryset.filter(models.Q(contributors__user=self.request.user))
+        queryset = queryset \
+            .filter(contributors__user=self.request.user) \
+            .annotate(role=models.F("contributors__role"))
         return queryset
 
 
@@ -94,6 +513,7 @@ class ProjectsAPIView(  # type: ignore
     ProjectsAPIMixin,
     generics.ListCreateAPIView,
 ):
+    pagination_class = IdCursorPagination
     permission_classes = [
         permissions.IsAuthenticated,
     ]
@@ -101,6 +521,22 @@ class ProjectsAPIView(  # type: ignore
     def get_view_name(self) -> str:
         return "Projects"
 
+    def get_version_rows(self) -> models.QuerySet:
+        """
+        Return the (id, version, updated time) of the projects of the current user, in id order.
+        """
+        return self.get_queryset().order_by("pk").values_list("pk", "version__version", "version__updated_time")
+
+    def get_version_key(self):
+        return self.make_version_key(list(self.get_version_rows()))
+
+    def make_version_key(self, rows: list[tuple[int, int | None, datetime | None]]) -> tuple[str, datetime] | None:
+        if not rows or any(version is None for _, version, _ in rows):
+            return None
+        # Every (id, version) pair is digested, so that no other list of projects gets the same key
+        digest = hashlib.sha1(";".join(f"{pk}:{version}" for pk, version, _ in rows).encode()).hexdigest()
+        return f"{self.request.user.pk}:{digest}", max(updated_time for _, _, updated_time in rows)
+
     def perform_create(self, serializer: serializers.BaseSerializer[Project]) -> None:
         project = serializer.save(
             author=self.request.user,
@@ -113,11 +549,6 @@ class ProjectsAPIView(  # type: ignore
         )
         contributor.save()
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        queryset.filter(models.Q(contributors__user=self.request.user))
-        return queryset
-
 
 class ProjectIndexedAPIView(  # type: ignore
     ProjectsAPIMixin,
@@ -132,15 +563,41 @@ class ProjectIndexedAPIView(  # type: ignore
     def get_view_name(self) -> str:
         return "Project"
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        queryset.filter(models.Q(contributors__user=self.request.user))
-        return queryset
 
+class ProjectStatisticsAPIView(  # type: ignore
+    ConditionalGetMixin,
+    generics.GenericAPIView,
+):
+    queryset = ProjectStatistics.objects.all()
+    serializer_class = ProjectStatisticsSerializer
+    description = "Get the number of issues of the project by status, tag and priority, and the number of comments, this requires the user to be a contributor of the project"
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsContributor,
+    ]
+
+    def get_view_name(self) -> str:
+        return "Project statistics"
+
+    def get_buckets(self) -> models.QuerySet:
+        """
+        Return the statistics buckets of the project, IsContributor already ensured that it exists.
+        """
+        return self.get_queryset().filter(project_id=self.kwargs["project_id"])
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional(self.retrieve_statistics, request, *args, **kwargs)
+
+    def retrieve_statistics(self, request, *args, **kwargs):
+        return response.Response(self.get_serializer(self.get_buckets()).data)
 
-class ProjectContributorAPIMixin:
-    queryset = Contributor.objects.prefetch_related("project", "user")
+
+class ProjectContributorAPIMixin(ConditionalGetMixin, ValuesReadMixin):
+    queryset = Contributor.objects \
+        .select_related("user") \
+        .only("id", "permission", "role", "project_id", "user__id", "user__first_name", "user__last_name")
     serializer_class = ContributorSerializer
+    values_serializer_class = ContributorValuesSerializer
     lookup_url_kwarg = "user_id"
 
     METHOD_DESCRIPTION = {
@@ -170,6 +627,7 @@ class ProjectContributorAPIView(  # type: ignore
     ProjectContributorAPIMixin,
     generics.ListCreateAPIView,
 ):
+    pagination_class = IdCursorPagination
     permission_classes = [
         permissions.IsAuthenticated,
         IsContributor,
@@ -203,9 +661,17 @@ class ProjectContributorIndexedAPIView(  # type: ignore
         return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ProjectIssueAPIMixin:
-    queryset = Issue.objects.prefetch_related("project")
+class ProjectIssueAPIMixin(ReplicaReadMixin, ConditionalGetMixin, ValuesReadMixin):
+    cache_responses = True
+    queryset = Issue.objects \
+        .select_related("author", "assigned") \
+        .only(
+            "id", "title", "description", "created_time", "updated_time", "status", "tag", "priority", "project_id",
+            "author__id", "author__first_name", "author__last_name",
+            "assigned__id", "assigned__first_name", "assigned__last_name",
+        )
     serializer_class = IssueSerializer
+    values_serializer_class = IssueValuesSerializer
     lookup_url_kwarg = "issue_id"
 
     METHOD_DESCRIPTION = {
@@ -228,6 +694,13 @@ class ProjectIssueAPIMixin:
     def get_queryset(self):
         queryset = super().get_queryset()
         queryset = queryset.filter(project_id=self.kwargs["project_id"])
+        sparse_fields = IssueSerializer.get_sparse_fields(self.request)
+        if sparse_fields is not None:
+            # Only JOIN the users which are rendered
+            relations = [relation for relation in ("author", "assigned") if relation in sparse_fields]
+            queryset = queryset.select_related(None)
+            if relations:
+                queryset = queryset.select_related(*relations)
         return queryset
 
 
@@ -235,6 +708,10 @@ class ProjectIssueAPIView(  # type: ignore
     ProjectIssueAPIMixin,
     generics.ListCreateAPIView,
 ):
+    filter_backends = [IssueFilterBackend, StrictOrderingFilter]
+    ordering_fields = ["created_time", "status", "tag", "priority"]
+    ordering = ["created_time"]
+    pagination_class = CreatedTimeCursorPagination
     permission_classes = [
         permissions.IsAuthenticated,
         IsContributor,
@@ -244,8 +721,8 @@ class ProjectIssueAPIView(  # type: ignore
         return "Issues"
 
     def perform_create(self, serializer):
-        project = get_object_or_404(Project.objects, pk=self.kwargs["project_id"])
-        serializer.save(project=project, author=self.request.user)
+        # IsContributor already ensured that the project exists
+        serializer.save(project_id=self.kwargs["project_id"], author=self.request.user)
 
 
 class ProjectIssueIndexedAPIView(  # type: ignore
@@ -262,9 +739,58 @@ class ProjectIssueIndexedAPIView(  # type: ignore
         return "Issue"
 
 
-class ProjectCommentsAPIMixin:
-    queryset = Comment.objects.prefetch_related("issue")
+class ProjectIssueBulkAPIView(  # type: ignore
+    ProjectIssueAPIMixin,
+    BulkModelAPIView[Issue],
+):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsContributor,
+        IsProjectOwnerOrAuthor,
+    ]
+
+    METHOD_DESCRIPTION = {
+        "POST": "Create many issues for the current project with the user as their author, this requires the user to be a contributor of the current project",
+        "PUT": "Update many issues from the current project, this requires the user to be the author of the issues or the owner of the project",
+        "DELETE": "Remove many issues from the current project, this requires the user to be the author of the issues or the owner of the project",
+    }
+
+    def get_view_name(self):
+        return "Issues bulk"
+
+    def get_bulk_context(self, items):
+        context = super().get_bulk_context(items)
+        # A single query checks that every assigned user is a collaborator of the project
+        context["collaborators"] = set(
+            Contributor.objects
+            .filter(project_id=self.kwargs["project_id"], user_id__in=context["related_objects"]["assigned"].keys())
+            .values_list("user_id", flat=True)
+        )
+        return context
+
+    def get_bulk_create_kwargs(self):
+        return {"project_id": self.kwargs["project_id"], "author": self.request.user}
+
+    def perform_bulk_create(self, objects):
+        super().perform_bulk_create(objects)
+        statistics.record_created_issues(self.kwargs["project_id"], objects)
+
+    def perform_bulk_update(self, objects, fields):
+        super().perform_bulk_update(objects, fields)
+        for issue in objects:
+            statistics.record_updated_issue(issue)
+
+
+class ProjectCommentsAPIMixin(ReplicaReadMixin, ConditionalGetMixin, ValuesReadMixin):
+    cache_responses = True
+    queryset = Comment.objects \
+        .select_related("author") \
+        .only(
+            "id", "description", "created_time", "updated_time", "issue_id",
+            "author__id", "author__first_name", "author__last_name",
+        )
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     lookup_url_kwarg = "comment_id"
 
     METHOD_DESCRIPTION = {
@@ -300,6 +826,7 @@ class ProjectCommentsAPIView(  # type: ignore
     ProjectCommentsAPIMixin,
     generics.ListCreateAPIView,
 ):
+    pagination_class = CreatedTimeCursorPagination
     permission_classes = [
         permissions.IsAuthenticated,
         IsContributor,
@@ -309,7 +836,7 @@ class ProjectCommentsAPIView(  # type: ignore
         return "Comments"
 
     def perform_create(self, serializer):
-        issue = get_object_or_404(Issue.objects, pk=self.kwargs["issue_id"])
+        issue = get_object_or_404(Issue.objects, pk=self.kwargs["issue_id"], project_id=self.kwargs["project_id"])
         serializer.save(issue=issue, author=self.request.user)
 
 
@@ -325,3 +852,132 @@ class ProjectCommentsIndexedAPIView(  # type: ignore
 
     def get_view_name(self) -> str:
         return "Comment"
+
+
+class ProjectCommentsBulkAPIView(  # type: ignore
+    ProjectCommentsAPIMixin,
+    BulkModelAPIView[Comment],
+):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsContributor,
+        IsProjectOwnerOrAuthor,
+    ]
+
+    METHOD_DESCRIPTION = {
+        "POST": "Create many commentaries for the current issue with the user as their author, this requires the user to be a contributor of the current project",
+        "PUT": "Update many commentaries of the current issue, this requires the user to be the author of the commentaries or the owner of the project",
+        "DELETE": "Remove many commentaries from the current issue, this requires the user to be the author of the commentaries or the owner of the project",
+    }
+
+    def get_view_name(self) -> str:
+        return "Comments bulk"
+
+    def get_bulk_create_kwargs(self):
+        issue = get_object_or_404(Issue.objects.only("id"), pk=self.kwargs["issue_id"], project_id=self.kwargs["project_id"])
+        return {"issue": issue, "author": self.request.user}
+
+    def perform_bulk_create(self, objects):
+        super().perform_bulk_create(objects)
+        statistics.record_comments(self.kwargs["issue_id"], len(objects))
+
+
+class ProjectExportAPIView(  # type: ignore
+    ConditionalGetMixin,
+    generics.GenericAPIView,
+):
+    """
+    Stream the project, then each issue followed by its comments, as newline delimited JSON.
+    The issues are read by chunks of SOFTDESK_EXPORT_CHUNK_SIZE, with the comments of each chunk prefetched
+    in one query, so that the memory used does not depend on the size of the project.
+    """
+
+    queryset = ProjectsAPIMixin.queryset
+    serializer_class = ProjectSerializer
+    description = "Export the project with all its issues and comments as newline delimited JSON, this requires the user to be a contributor of the project"
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsContributor,
+    ]
+    buffer_size = 64 * 1024
+
+    def get_view_name(self) -> str:
+        return "Project export"
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional(self.export, request, *args, **kwargs)
+
+    def export(self, request, *args, **kwargs):
+        project = get_object_or_404(self.get_queryset(), pk=self.kwargs["project_id"])
+        export = stream_from(request, self.buffer(self.get_lines(project)), content_type="application/x-ndjson")
+        export["Content-Disposition"] = f'attachment; filename="project-{project.pk}.ndjson"'
+        return export
+
+    def get_lines(self, project: Project) -> Iterator[dict[str, Any]]:
+        comments = ProjectCommentsAPIMixin.queryset.order_by("created_time", "id")
+        issues = ProjectIssueAPIMixin.queryset \
+            .filter(project_id=project.pk) \
+            .order_by("id") \
+            .prefetch_related(models.Prefetch("comments", queryset=comments)) \
+            .iterator(chunk_size=getattr(settings, "SOFTDESK_EXPORT_CHUNK_SIZE", 500))
+        issue_serializer = IssueSerializer()
+        comment_serializer = CommentSerializer()
+
+        yield {"type": "project", "data": self.get_serializer(project).data}
+        for issue in issues:
+            yield {"type": "issue", "data": issue_serializer.to_representation(issue)}
+            for comment in issue.comments.all():
+                yield {"type": "comment", "issue": issue.pk, "data": comment_serializer.to_representation(comment)}
+
+    def buffer(self, lines: Iterator[dict[str, Any]]) -> Iterator[bytes]:
+        """
+        Encode the lines and group them in chunks of about `buffer_size` bytes.
+        """
+        buffer = io.BytesIO()
+        for line in lines:
+            buffer.write(dumps(line))
+            buffer.write(b"\n")
+            if buffer.tell() >= self.buffer_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+class ProjectSearchAPIView(  # type: ignore
+    ConditionalGetMixin,
+    generics.GenericAPIView,
+):
+    """
+    Search the issues and comments of the project by keywords, through the backend of `get_search_backend`.
+    """
+
+    serializer_class = SearchResultSerializer
+    pagination_class = SearchCursorPagination
+    description = "Search the issues and comments of the project containing every keyword of the `q` query parameter, the most relevant first, this requires the user to be a contributor of the project"
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsContributor,
+    ]
+    search_query_param = "q"
+
+    def get_view_name(self) -> str:
+        return "Project search"
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional(self.search, request, *args, **kwargs)
+
+    def search(self, request, *args, **kwargs):
+        terms = parse_query(request.query_params.get(self.search_query_param, ""))
+        if not terms:
+            raise exceptions.ValidationError({self.search_query_param: ["Give at least one keyword to search for."]})
+        backend = get_search_backend()
+        project_id = self.kwargs["project_id"]
+        hits = self.paginator.paginate_search(  # type: ignore[union-attr]
+            lambda position, reverse, limit: backend.search(project_id, terms, position, reverse, limit),
+            request,
+            view=self,
+        )
+        serializer = self.get_serializer(load_results(hits), many=True)
+        return self.get_paginated_response(serializer.data)
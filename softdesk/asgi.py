@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk.settings')
+# Read endpoints are served by native async views, see SOFTDESK_ASYNC_VIEWS
+os.environ.setdefault('SOFTDESK_ASYNC_VIEWS', '1')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# The handler of Django with the streaming responses sent without blocking the event loop, see stream_from
+from sd_projects.streaming import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
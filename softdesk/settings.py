@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'sd_projects.middleware.instrumentation_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -51,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'sd_projects.middleware.read_your_writes_middleware',
 ]
 
 ROOT_URLCONF = 'softdesk.urls'
@@ -78,11 +81,36 @@ WSGI_APPLICATION = 'softdesk.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'sd_projects.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Run on each new connection. In WAL mode the readers do not block the writer nor the other way around,
+            # and synchronous NORMAL only syncs at checkpoints, a power loss may lose the last transactions.
+            'PRAGMAS': {
+                'journal_mode': 'wal',
+                'synchronous': 'normal',
+                'cache_size': -20000,
+                'mmap_size': 268435456,
+                'busy_timeout': 5000,
+            },
+            # Queue the writers of the process on a lock instead of failing with "database is locked"
+            'SERIALIZE_WRITES': True,
+        },
     }
 }
 
+# Aliases of DATABASES holding read-only copies of the default database, from which the list and retrieve
+# endpoints read. The reads of a user stay on the primary for SOFTDESK_READ_YOUR_WRITES['WINDOW'] seconds after
+# each of their writes, BACKEND optionally names an entry of CACHES shared between the worker processes.
+SOFTDESK_DB_REPLICAS = []
+
+SOFTDESK_READ_YOUR_WRITES = {
+    'WINDOW': 5,
+    'BACKEND': None,
+}
+
+DATABASE_ROUTERS = ['sd_projects.routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -95,13 +123,32 @@ AUTH_PASSWORD_VALIDATORS = [
         'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+        'NAME': 'sd_projects.passwords.CachedCommonPasswordValidator',
     },
     {
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
 ]
 
+# The first hasher hashes the new passwords, the others verify the older hashes, upgraded on the next login.
+# Move TunedArgon2PasswordHasher first to use argon2id, this requires argon2-cffi.
+PASSWORD_HASHERS = [
+    'sd_projects.passwords.TunedScryptPasswordHasher',
+    'sd_projects.passwords.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Cost parameters of the password hashers, and the bounded pool of threads hashing the passwords of the new users.
+# A POOL_SIZE of 0 hashes in the request thread.
+SOFTDESK_PASSWORD_HASHING = {
+    'SCRYPT': {'WORK_FACTOR': 2 ** 14, 'BLOCK_SIZE': 8, 'PARALLELISM': 1},
+    'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 19456, 'PARALLELISM': 1},
+    'POOL_SIZE': 0,
+    'POOL_QUEUE': 0,
+    'POOL_TIMEOUT': 5,
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
@@ -127,11 +174,88 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'sd_projects.authentication.ClaimsJWTAuthentication',
+    ),
+    # JSON encoded and decoded with orjson when installed, with the standard library otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'sd_projects.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'sd_projects.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
 }
 
+# Keyset pagination of the issues, comments and contributors lists
+SOFTDESK_PAGE_SIZE = 50
+SOFTDESK_MAX_PAGE_SIZE = 500
+
+# Maximum number of items of the issues and comments bulk endpoints
+SOFTDESK_BULK_MAX_ITEMS = 500
+
+# Render the GET lists and details straight from `.values_list()` rows instead of the model serializers
+SOFTDESK_VALUES_SERIALIZERS = True
+
+# Serve the GET requests of the projects, issues and comments with async views, enabled by softdesk/asgi.py
+SOFTDESK_ASYNC_VIEWS = os.environ.get('SOFTDESK_ASYNC_VIEWS', '0') == '1'
+
+# Number of issues read at once, with their comments, by the project export
+SOFTDESK_EXPORT_CHUNK_SIZE = 500
+
+# Cross-request cache of the contributors role and permission.
+# BACKEND optionally names an entry of CACHES shared between the worker processes.
+SOFTDESK_MEMBERSHIP_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 300,
+    'BACKEND': None,
+}
+
+# Cross-request cache of the active flag and token version checked by the JWT authentication.
+# BACKEND optionally names an entry of CACHES shared between the worker processes.
+SOFTDESK_TOKEN_USER_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+    'BACKEND': None,
+}
+
+# Cross-request cache of the rendered issue and comment lists and details, shared between the contributors.
+# BACKEND optionally names an entry of CACHES shared between the worker processes.
+SOFTDESK_RESPONSE_CACHE = {
+    'MAX_SIZE': 1000,
+    'TTL': 300,
+    'BACKEND': None,
+}
+
+# Request metrics of /status/metrics/: latency of every request, SQL queries and time spent in the serializers
+# and permissions of a SAMPLE_RATE share of them, sent back in a Server-Timing header with SERVER_TIMING, which
+# discloses them to every client: enable it in development with SOFTDESK_SERVER_TIMING=1.
+# The metrics are served to the staff users and to the ALLOWED_IPS, e.g. of the Prometheus server. The address
+# of a reverse proxy must never be listed: every request it forwards would come from it.
+SOFTDESK_METRICS = {
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': os.environ.get('SOFTDESK_SERVER_TIMING', '0') == '1',
+    'ALLOWED_IPS': [],
+}
+
+# Search backend of /projects/<id>/search/, by default the FTS5 one on SQLite and the LIKE one otherwise
+SOFTDESK_SEARCH_BACKEND = None
+
+# Terms found in more than this ratio of the documents filter the searches without being ranked
+SOFTDESK_SEARCH_STOP_RATIO = 0.2
+
+# Cross-request cache of the number of documents containing each searched term.
+# BACKEND optionally names an entry of CACHES shared between the worker processes.
+SOFTDESK_SEARCH_TERM_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 3600,
+    'BACKEND': None,
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'TOKEN_OBTAIN_SERIALIZER': 'sd_projects.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'sd_projects.authentication.ClaimsTokenRefreshSerializer',
 }
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Production settings for softdesk project, on PostgreSQL.
+
+Select them with DJANGO_SETTINGS_MODULE=softdesk.settings_production, they are configured by the environment
+variables SOFTDESK_SECRET_KEY, SOFTDESK_ALLOWED_HOSTS and SOFTDESK_DB_*.
+"""
+
+import copy
+import os
+
+from .settings import *  # noqa: F401,F403
+
+SECRET_KEY = os.environ['SOFTDESK_SECRET_KEY']
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('SOFTDESK_ALLOWED_HOSTS', 'localhost').split(',')
+
+# Pool of the connections of each worker process, SOFTDESK_DB_POOL=0 falls back to persistent connections.
+# With the pool, Django gives its connection back at the end of each request (CONN_MAX_AGE 0), while the pool
+# keeps it open for the next request of any thread. CLASS optionally names another pool implementation.
+SOFTDESK_DB_POOL = os.environ.get('SOFTDESK_DB_POOL', '1') == '1'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'sd_projects.pooling.postgresql' if SOFTDESK_DB_POOL else 'django.db.backends.postgresql',
+        'NAME': os.environ.get('SOFTDESK_DB_NAME', 'softdesk'),
+        'USER': os.environ.get('SOFTDESK_DB_USER', 'softdesk'),
+        'PASSWORD': os.environ.get('SOFTDESK_DB_PASSWORD', ''),
+        'HOST': os.environ.get('SOFTDESK_DB_HOST', 'localhost'),
+        'PORT': os.environ.get('SOFTDESK_DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if SOFTDESK_DB_POOL else int(os.environ.get('SOFTDESK_DB_CONN_MAX_AGE', '600')),
+        # Check a reused connection before the first query of a request, instead of failing the request
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': 5,
+            **({'POOL': {
+                'MIN_SIZE': int(os.environ.get('SOFTDESK_DB_POOL_MIN_SIZE', '2')),
+                'MAX_SIZE': int(os.environ.get('SOFTDESK_DB_POOL_MAX_SIZE', '20')),
+                # Seconds a request waits for a connection before failing
+                'TIMEOUT': 5,
+                'MAX_IDLE': 300,
+                'MAX_LIFETIME': 3600,
+                # Idle connections older than this are checked before being reused
+                'CHECK_IDLE': 30,
+            }} if SOFTDESK_DB_POOL else {}),
+        },
+    }
+}
+
+# Read replicas of the default database, one per host of SOFTDESK_DB_REPLICA_HOSTS with the same credentials
+SOFTDESK_DB_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get('SOFTDESK_DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{index}'] = {**copy.deepcopy(DATABASES['default']), 'HOST': host}
+    SOFTDESK_DB_REPLICAS.append(f'replica_{index}')
+
+# A sample of the requests is measured in depth, and their measures are not sent to the clients
+SOFTDESK_METRICS = {
+    'SAMPLE_RATE': float(os.environ.get('SOFTDESK_METRICS_SAMPLE_RATE', '0.05')),
+    'SERVER_TIMING': os.environ.get('SOFTDESK_SERVER_TIMING', '0') == '1',
+    # Addresses of the Prometheus servers, never the one of the reverse proxy
+    'ALLOWED_IPS': list(filter(None, os.environ.get('SOFTDESK_METRICS_ALLOWED_IPS', '').split(','))),
+}
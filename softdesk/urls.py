@@ -16,6 +16,7 @@ Including another URLconf
 # from django.contrib import admin
 from django.urls import include, path
 from sd_projects.urls import urls
+from sd_projects.views import RevokeTokensAPIView
 from rest_framework.exceptions import NotFound, bad_request, server_error, PermissionDenied
 from rest_framework.schemas import get_schema_view
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
@@ -25,6 +26,7 @@ urlpatterns = [
     # path('admin/', admin.site.urls),
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('login/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('login/revoke/', RevokeTokensAPIView.as_view(), name='token_revoke'),
     path('', include(urls)),
     path('openapi', get_schema_view(
         title='SoftDesk',